@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+자동 완성 색인 (Prefix Index)
+===========================
+자료사전 품명 자동 완성을 입력마다 전체 순회하지 않고 정렬 색인 + 이진 탐색으로 처리
+
+기능:
+- 대문자 키 정렬 배열 + bisect → 접두 일치 상위 N개 (O(log n + k))
+- 대소문자 무시 정확 일치 (dict)
+- 한글 초성 검색 ("ㅈㅅ" → "전선", "접속함" ...)
+- 자료사전 DB별 공용 색인 (DB 수정 시각이 바뀌면 다시 생성)
+"""
+
+import os
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.db_service import db_service
+
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_CHOSUNG_SET = frozenset(CHOSUNG)
+_HANGUL_FIRST = 0xAC00
+_HANGUL_LAST = 0xD7A3
+_JUNG_JONG = 21 * 28
+
+
+def to_chosung(text: str) -> str:
+    """한글 음절 → 초성 (그 외 문자는 대문자로 유지)"""
+    chars = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_FIRST <= code <= _HANGUL_LAST:
+            chars.append(CHOSUNG[(code - _HANGUL_FIRST) // _JUNG_JONG])
+        else:
+            chars.append(ch.upper())
+    return "".join(chars)
+
+
+def has_chosung(text: str) -> bool:
+    """초성 자모(ㄱ~ㅎ)가 포함된 검색어인지"""
+    return any(ch in _CHOSUNG_SET for ch in text)
+
+
+def _prefix_range(keys: List[str], prefix: str, limit: int) -> range:
+    """정렬된 keys에서 prefix로 시작하는 구간 (최대 limit개)"""
+    start = bisect_left(keys, prefix)
+    end = start
+    while end < len(keys) and end - start < limit and keys[end].startswith(prefix):
+        end += 1
+    return range(start, end)
+
+
+class PrefixIndex:
+    """
+    문자열 키 → 값 자동 완성 색인
+
+    키 순서: 대문자 기준 정렬 (같은 접두의 후보는 짧은/사전순 키가 먼저)
+    """
+
+    def __init__(self, items: Iterable[Tuple[str, object]]):
+        self.values: Dict[str, object] = {}
+        self._exact: Dict[str, str] = {}
+        for key, value in items:
+            self.values[key] = value
+            # 대소문자만 다른 키가 여러 개면 먼저 나온 키 우선
+            self._exact.setdefault(key.upper(), key)
+
+        ordered = sorted(self.values, key=lambda k: (k.upper(), k))
+        self._upper = [k.upper() for k in ordered]
+        self._keys = ordered
+
+        by_chosung = sorted((to_chosung(k), k.upper(), k) for k in self.values)
+        self._cho = [c for c, _, _ in by_chosung]
+        self._cho_keys = [k for _, _, k in by_chosung]
+
+    def __len__(self):
+        return len(self.values)
+
+    def exact(self, text: str) -> Optional[str]:
+        """대소문자 무시 정확 일치 키 (없으면 None)"""
+        return self._exact.get(text.strip().upper())
+
+    def complete(self, text: str, limit: int = 10) -> List[str]:
+        """
+        접두 일치 키 상위 limit개
+
+        검색어에 초성 자모가 있으면 초성 색인으로 검색 (음절은 초성으로 바꿔 비교).
+        """
+        query = text.strip().upper()
+        if not query or limit <= 0:
+            return []
+        if has_chosung(query):
+            return [self._cho_keys[i] for i in _prefix_range(self._cho, to_chosung(query), limit)]
+        return [self._keys[i] for i in _prefix_range(self._upper, query, limit)]
+
+    def best_match(self, text: str) -> Optional[str]:
+        """정확 일치 키, 없으면 첫 번째 접두 일치 키"""
+        key = self.exact(text)
+        if key is not None:
+            return key
+        matches = self.complete(text, 1)
+        return matches[0] if matches else None
+
+
+# ============== 자료사전 공용 색인 ==============
+
+_reference_indexes: Dict[str, Tuple[float, PrefixIndex]] = {}
+_reference_lock = threading.Lock()
+
+
+def reference_product_index(db_path: str) -> PrefixIndex:
+    """
+    자료사전 품명 색인 (값: (규격, CODE)) — 같은 DB는 프로세스에서 공유
+
+    DB가 없으면 빈 색인, 조회 오류는 sqlite3.Error로 전달
+    """
+    if not os.path.exists(db_path):
+        return PrefixIndex(())
+    mtime = os.path.getmtime(db_path)
+    with _reference_lock:
+        cached = _reference_indexes.get(db_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        rows = db_service.query(db_path, "SELECT 품명, 규격, CODE FROM [자료사전]")
+        index = PrefixIndex(
+            (str(product).strip(), (str(spec) if spec else "", str(code) if code else ""))
+            for product, spec, code in rows
+            if product
+        )
+        _reference_indexes[db_path] = (mtime, index)
+        return index
+
+
+# ============== 테스트 ==============
+if __name__ == "__main__":
+    index = PrefixIndex([
+        ("전선관", ("16C", "P01")),
+        ("전선", ("2.5sq", "W01")),
+        ("HFIX", ("2.5sq", "W02")),
+        ("hfix", ("4sq", "W03")),
+        ("접속함", ("", "B01")),
+        ("조명기구", ("", "L01")),
+        ("전선", ("4sq", "W04")),  # 같은 키 → 마지막 값
+    ])
+
+    cases = [
+        (len(index), 6, "중복 키 제거"),
+        (index.values["전선"], ("4sq", "W04"), "같은 키는 마지막 값"),
+        (index.exact("hfix"), "HFIX", "대소문자 무시 정확 일치 (먼저 나온 키)"),
+        (index.complete("전"), ["전선", "전선관"], "접두 일치 (정렬순)"),
+        (index.complete("hf"), ["HFIX", "hfix"], "대소문자 무시 접두 일치"),
+        (index.complete("전", 1), ["전선"], "개수 제한"),
+        (index.complete("ㅈㅅ"), ["전선", "전선관", "접속함"], "초성 검색"),
+        (index.complete("전ㅅ"), ["전선", "전선관", "접속함"], "음절 + 초성 혼합"),
+        (index.complete("ㅈㅁ"), ["조명기구"], "초성 검색 2"),
+        (index.complete("없음"), [], "일치 없음"),
+        (index.complete("  "), [], "빈 검색어"),
+        (index.best_match("전선"), "전선", "정확 일치 우선"),
+        (index.best_match("접"), "접속함", "정확 일치 없으면 첫 접두 일치"),
+        (to_chosung("LED 전등"), "LED ㅈㄷ", "초성 변환"),
+    ]
+
+    print("=" * 60)
+    print("자동 완성 색인 테스트")
+    print("=" * 60)
+    for i, (result, expected, desc) in enumerate(cases, 1):
+        status = "✅" if result == expected else "❌"
+        print(f"{i:2d}. {status} {desc}: {result} (기대: {expected})")
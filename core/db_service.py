@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+읽기 전용 DB 연결 서비스 (Read-only DB Service)
+============================================
+자료사전/조명기구/분전반 DB를 팝업을 열 때마다 새로 연결하지 않고 프로세스 전체에서 공유
+
+기능:
+- DB 경로별 장수명 읽기 전용 연결 (URI mode=ro, query_only, mmap)
+- 문장 캐시 (같은 SQL 재사용 시 준비된 문장 사용)
+- 스레드 안전 (경로별 잠금, 결과는 fetchall로 반환)
+- 커밋(WAL 포함)은 연결이 직접 반영, 파일이 교체되면(수정 시각/크기 변경) 다시 연결
+"""
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+MMAP_SIZE = 256 * 1024 * 1024
+CACHED_STATEMENTS = 256
+
+
+def _readonly_uri(path: str) -> str:
+    """파일 경로 → 읽기 전용 SQLite URI (한글 경로는 퍼센트 인코딩)"""
+    return Path(os.path.abspath(path)).as_uri() + "?mode=ro"
+
+
+class _Entry:
+    """경로 하나의 연결 + 잠금 + 파일 상태"""
+
+    __slots__ = ("conn", "lock", "stamp")
+
+    def __init__(self):
+        self.conn = None
+        self.lock = threading.RLock()
+        self.stamp = None
+
+
+class ReadOnlyDBService:
+    """
+    읽기 전용 DB 연결 풀
+
+    다른 연결의 커밋은 SQLite가 -wal 파일까지 확인해 반영하므로 immutable은 쓰지 않는다
+    (immutable 연결은 -wal을 무시하고, WAL 커밋은 본 파일 수정 시각/크기를 바꾸지 않음).
+    파일 자체가 복사/덮어쓰기로 교체된 경우만 수정 시각/크기로 감지하여 다시 연결한다.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, path: str) -> _Entry:
+        key = os.path.normcase(os.path.abspath(path))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+            return entry
+
+    @staticmethod
+    def _open(path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            _readonly_uri(path), uri=True, check_same_thread=False,
+            cached_statements=CACHED_STATEMENTS,
+        )
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        conn.execute("PRAGMA query_only=1")
+        return conn
+
+    def _connection(self, path: str, entry: _Entry) -> sqlite3.Connection:
+        """entry.lock을 잡은 상태에서 호출"""
+        stat = os.stat(path)
+        stamp = (stat.st_mtime, stat.st_size)
+        if entry.conn is None or entry.stamp != stamp:
+            if entry.conn is not None:
+                entry.conn.close()
+                entry.conn = None
+            entry.conn = self._open(path)
+            entry.stamp = stamp
+        return entry.conn
+
+    # ---------- 조회 ----------
+
+    def query(self, path: str, sql: str, params: Tuple = ()) -> List[Tuple]:
+        """SQL 실행 결과 전체 (파일이 없으면 FileNotFoundError, SQL 오류는 sqlite3.Error)"""
+        entry = self._entry(path)
+        with entry.lock:
+            return self._connection(path, entry).execute(sql, params).fetchall()
+
+    def query_one(self, path: str, sql: str, params: Tuple = ()) -> Optional[Tuple]:
+        """SQL 실행 결과 첫 행 (없으면 None)"""
+        entry = self._entry(path)
+        with entry.lock:
+            return self._connection(path, entry).execute(sql, params).fetchone()
+
+    def table_exists(self, path: str, table: str) -> bool:
+        return self.query_one(
+            path, "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)
+        ) is not None
+
+    # ---------- 관리 ----------
+
+    def invalidate(self, path: str = None):
+        """연결 닫기 (path 없으면 전체) — 다음 조회 때 다시 연결"""
+        with self._lock:
+            if path is None:
+                entries = list(self._entries.values())
+            else:
+                entry = self._entries.get(os.path.normcase(os.path.abspath(path)))
+                entries = [entry] if entry is not None else []
+        for entry in entries:
+            with entry.lock:
+                if entry.conn is not None:
+                    entry.conn.close()
+                    entry.conn = None
+                entry.stamp = None
+
+    close_all = invalidate
+
+
+# 프로세스 공용 인스턴스
+db_service = ReadOnlyDBService()
+
+
+# ============== 테스트 ==============
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    path = os.path.join(tempfile.mkdtemp(), "조명기구타입.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE [조명기구목록] (ID INTEGER PRIMARY KEY, 명칭 TEXT)")
+    conn.executemany("INSERT INTO [조명기구목록] (명칭) VALUES (?)", [("LED 15W",), ("LED 40W",)])
+    conn.commit()
+    conn.close()
+
+    service = ReadOnlyDBService()
+    cases = [
+        (service.query(path, "SELECT 명칭 FROM [조명기구목록] ORDER BY ID"), [("LED 15W",), ("LED 40W",)], "한글 경로 조회"),
+        (service.table_exists(path, "조명기구목록"), True, "테이블 확인"),
+        (service.table_exists(path, "없는표"), False, "없는 테이블"),
+    ]
+    first = service._entry(path).conn
+    service.query_one(path, "SELECT 1")
+    cases.append((service._entry(path).conn is first, True, "연결 재사용"))
+    try:
+        first.execute("CREATE TABLE x (a)")
+        written = True
+    except sqlite3.Error:
+        written = False
+    cases.append((written, False, "쓰기 차단 (읽기 전용)"))
+
+    # 파일 변경 → 재연결하여 새 내용 반영
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO [조명기구목록] (명칭) VALUES ('LED 60W')")
+    conn.commit()
+    conn.close()
+    os.utime(path, (time.time() + 5, time.time() + 5))
+    cases.append((service.query_one(path, "SELECT count(*) FROM [조명기구목록]"), (3,), "파일 변경 후 재연결"))
+
+    # WAL 커밋 (본 파일 시각/크기 그대로, -wal에만 기록) → 같은 연결에서 바로 반영
+    writer = sqlite3.connect(path)
+    writer.execute("PRAGMA journal_mode=WAL")
+    writer.commit()
+    service.invalidate(path)
+    service.query_one(path, "SELECT 1")
+    stamp_before = service._entry(path).stamp
+    writer.execute("INSERT INTO [조명기구목록] (명칭) VALUES ('LED 100W')")
+    writer.commit()
+    wal_seen = service.query_one(path, "SELECT 명칭 FROM [조명기구목록] ORDER BY ID DESC LIMIT 1")
+    cases.append(((wal_seen, service._entry(path).stamp == stamp_before), (("LED 100W",), True), "WAL 커밋 반영 (재연결 없이)"))
+    writer.execute("DELETE FROM [조명기구목록] WHERE 명칭 = 'LED 100W'")
+    writer.commit()
+    writer.close()
+
+    results = []
+    workers = [
+        threading.Thread(target=lambda: results.append(service.query(path, "SELECT count(*) FROM [조명기구목록]")))
+        for _ in range(8)
+    ]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    cases.append((results, [[(3,)]] * 8, "다중 스레드 조회"))
+
+    service.close_all()
+    cases.append((service._entry(path).conn, None, "연결 닫기"))
+    try:
+        service.query(os.path.join(os.path.dirname(path), "없음.db"), "SELECT 1")
+        missing = "no error"
+    except FileNotFoundError:
+        missing = "FileNotFoundError"
+    cases.append((missing, "FileNotFoundError", "없는 파일"))
+
+    print("=" * 60)
+    print("읽기 전용 DB 서비스 테스트")
+    print("=" * 60)
+    for i, (result, expected, desc) in enumerate(cases, 1):
+        status = "✅" if result == expected else "❌"
+        print(f"{i:2d}. {status} {desc}: {result} (기대: {expected})")
@@ -0,0 +1,399 @@
+# -*- coding: utf-8 -*-
+"""
+자재 집계 (Estimate Aggregate)
+===========================
+을지 데이터의 (품명, 규격, 단위)별 수량 합계를 행 변경 때마다 증분으로 유지
+
+기능:
+- 행별 기여분 보관 → 행 수정/삽입/삭제 시 해당 행만 빼고 더함 (전체 재계산 없음)
+- 공종별 합계 + 자재별 합계 (소요자재 집계, 전체 목록 집계, 엑셀 총괄표)
+- 수량 합계(계가 없으면 산출수식 계산값)와 입력된 계 합계를 함께 유지
+- 공종은 처음 읽을 때 한 번 일괄 계산 (프로젝트 불러오기 중에는 비용 없음)
+
+EuljiStore가 공종마다 GongjongColumns.observer를 연결하므로
+저장본(eulji_data)에 반영되는 모든 변경(을지 저장, 일괄 변경, 갑지 변수 재계산)이 집계에 반영된다.
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+# 자재 키: (품명, 규격, 단위)
+MaterialKey = Tuple[str, str, str]
+
+# 합계 벡터 위치
+_QTY = 0  # 수량 합계 (계가 없으면 산출수식 계산값)
+_COUNT = 1  # 행 수
+_ENTERED = 2  # 입력된 계 합계
+_ENTERED_COUNT = 3  # 계가 입력된 행 수
+_VECTOR_SIZE = 4
+
+
+def _entered(value: float) -> float:
+    """행 계 값 → 입력된 계 (비어 있으면 0)"""
+    return 0.0 if math.isnan(value) else float(value)
+
+
+def _contribution(qty: float, entered: float, item: str, unit: str):
+    """
+    행 기여분 (수량, 입력된 계, 자재 키, 합계 벡터) — 합계에 영향이 없으면 None
+
+    품명이 있고 수량이 0보다 큰 행만 자재 키를 가지며,
+    계가 입력된 행은 수량 = 계이므로 입력된 계 합계도 같은 자재 키에 더한다.
+    """
+    key = (item, "", unit) if item and qty > 0 else None
+    if key is None and not qty and not entered:
+        return None
+    vector = None
+    if key is not None:
+        counted = entered if entered > 0 else 0.0
+        vector = (qty, 1, counted, 1 if counted else 0)
+    return qty, entered, key, vector
+
+
+def _clean(value: float) -> float:
+    """더하고 뺀 합계의 부동소수 오차 정리"""
+    return round(value, 9)
+
+
+class _Watch:
+    """GongjongColumns.observer — 공종명을 붙여 집계로 전달"""
+
+    __slots__ = ("aggregate", "gongjong")
+
+    def __init__(self, aggregate: "EstimateAggregate", gongjong: str):
+        self.aggregate = aggregate
+        self.gongjong = gongjong
+
+    def row_changed(self, columns, row: int):
+        self.aggregate._row_changed(self.gongjong, columns, row)
+
+    def rows_inserted(self, columns, row: int, count: int):
+        self.aggregate._rows_inserted(self.gongjong, row, count)
+
+    def rows_removed(self, columns, row: int, count: int):
+        self.aggregate._rows_removed(self.gongjong, row, count)
+
+
+class EstimateAggregate:
+    """
+    공종/자재별 수량 합계 (EuljiStore.aggregate)
+
+    행 기여분: (수량, 입력된 계, 자재 키, 합계 벡터)
+    total_only 조회는 입력된 계만 합산 (엑셀 총괄표, 전체 목록 집계 — 계가 빈 행은 제외)
+    """
+
+    def __init__(self, store):
+        self._store = store
+        self._watched: Dict[str, object] = {}  # 공종 → 연결된 GongjongColumns
+        self._rows: Dict[str, Optional[list]] = {}  # 공종 → 행별 기여분 (None: 아직 계산 전)
+        self._sums: Dict[str, List[float]] = {}  # 공종 → [전체 행 수량 합계, 입력된 계 합계]
+        self._totals: Dict[str, Dict[MaterialKey, List[float]]] = {}  # 공종 → {자재: 벡터}
+        self._materials: Dict[MaterialKey, Dict[str, List[float]]] = {}  # 자재 → {공종: 벡터}
+
+    # ---------- 연결 ----------
+
+    def attach(self, gongjong: str, columns):
+        """공종 저장본 연결 (기존 집계는 버리고 다음 조회 때 다시 계산)"""
+        self.detach(gongjong)
+        columns.observer = _Watch(self, gongjong)
+        self._watched[gongjong] = columns
+        self._rows[gongjong] = None
+
+    def detach(self, gongjong: str):
+        """공종 연결 해제 + 집계 제거"""
+        columns = self._watched.pop(gongjong, None)
+        if columns is not None and isinstance(columns.observer, _Watch):
+            columns.observer = None
+        self._rows.pop(gongjong, None)
+        self._sums.pop(gongjong, None)
+        for key in self._totals.pop(gongjong, {}):
+            by_gongjong = self._materials.get(key)
+            if by_gongjong is not None:
+                by_gongjong.pop(gongjong, None)
+                if not by_gongjong:
+                    del self._materials[key]
+
+    # ---------- 행 변경 ----------
+
+    def _apply(self, gongjong: str, contribution, sign: int):
+        qty, entered, key, vector = contribution
+        sums = self._sums.setdefault(gongjong, [0.0, 0.0])
+        sums[0] += sign * qty
+        sums[1] += sign * entered
+        if key is None:
+            return
+
+        totals = self._totals.setdefault(gongjong, {})
+        total = totals.get(key)
+        if total is None:
+            total = totals[key] = [0.0] * _VECTOR_SIZE
+            self._materials.setdefault(key, {})[gongjong] = total
+        for i, value in enumerate(vector):
+            total[i] += sign * value
+
+        if total[_COUNT] <= 0:
+            del totals[key]
+            by_gongjong = self._materials[key]
+            del by_gongjong[gongjong]
+            if not by_gongjong:
+                del self._materials[key]
+
+    def _row_changed(self, gongjong: str, columns, row: int):
+        rows = self._rows.get(gongjong)
+        if rows is None:
+            return  # 아직 계산 전 (조회 시 일괄 계산)
+        old = rows[row]
+        new = _contribution(
+            columns.quantity(row),
+            _entered(columns.total(row)),
+            columns.get(row, "item").strip(),
+            columns.get(row, "unit").strip(),
+        )
+        if old == new:
+            return
+        if old is not None:
+            self._apply(gongjong, old, -1)
+        if new is not None:
+            self._apply(gongjong, new, 1)
+        rows[row] = new
+
+    def _rows_inserted(self, gongjong: str, row: int, count: int):
+        rows = self._rows.get(gongjong)
+        if rows is not None:
+            rows[row:row] = [None] * count
+
+    def _rows_removed(self, gongjong: str, row: int, count: int):
+        rows = self._rows.get(gongjong)
+        if rows is None:
+            return
+        for contribution in rows[row:row + count]:
+            if contribution is not None:
+                self._apply(gongjong, contribution, -1)
+        del rows[row:row + count]
+
+    # ---------- 일괄 계산 ----------
+
+    def _index(self, gongjong: str):
+        columns = self._watched[gongjong]
+        quantities = columns.quantities()
+        totals = columns.totals()
+        units = columns.column("unit")
+
+        rows = []
+        for row, item in enumerate(columns.column("item")):
+            contribution = _contribution(
+                float(quantities[row]), _entered(totals[row]), item.strip(), units[row].strip()
+            )
+            if contribution is not None:
+                self._apply(gongjong, contribution, 1)
+            rows.append(contribution)
+        self._rows[gongjong] = rows
+
+    def refresh(self):
+        """아직 계산하지 않은 공종 일괄 계산"""
+        for gongjong, rows in list(self._rows.items()):
+            if rows is None:
+                self._index(gongjong)
+
+    # ---------- 조회 ----------
+
+    def gongjong_total(self, gongjong: str, total_only: bool = False) -> float:
+        """
+        공종 전체 행 수량 합계 (계가 없으면 산출수식 계산값)
+
+        total_only: 입력된 계만 합산
+        """
+        if self._rows.get(gongjong, ()) is None:
+            self._index(gongjong)
+        sums = self._sums.get(gongjong)
+        if sums is None:
+            return 0.0
+        return _clean(sums[1] if total_only else sums[0])
+
+    def materials(self, total_only: bool = False) -> Dict[MaterialKey, dict]:
+        """
+        자재별 합계 {(품명, 규격, 단위): {"qty", "count", "gongjongs"}}
+
+        gongjongs: 사용 공종 (공종 순서)
+        total_only: 계가 입력된 행만 합산 (계가 빈 행은 산출수식이 있어도 제외)
+        """
+        self.refresh()
+        qty_index, count_index = (_ENTERED, _ENTERED_COUNT) if total_only else (_QTY, _COUNT)
+        order = {gongjong: i for i, gongjong in enumerate(self._store)}
+        result = {}
+        for key, by_gongjong in self._materials.items():
+            used = {g: total for g, total in by_gongjong.items() if total[count_index] > 0}
+            if not used:
+                continue
+            result[key] = {
+                "qty": _clean(sum(total[qty_index] for total in used.values())),
+                "count": int(sum(total[count_index] for total in used.values())),
+                "gongjongs": sorted(used, key=order.get),
+            }
+        return result
+
+
+def material_totals(eulji_data, total_only: bool = False) -> Dict[MaterialKey, dict]:
+    """
+    자재별 합계 (EuljiStore면 유지 중인 집계, 그 외 dict는 임시 저장소로 계산)
+
+    total_only: 계가 입력된 행만 합산 (전체 목록 집계)
+    """
+    aggregate = getattr(eulji_data, "aggregate", None)
+    if aggregate is None:
+        from core.eulji_store import EuljiStore
+
+        aggregate = EuljiStore(eulji_data).aggregate
+    return aggregate.materials(total_only)
+
+
+def gongjong_total(eulji_data, gongjong: str, total_only: bool = False) -> float:
+    """
+    공종 전체 행 수량 합계 (EuljiStore면 유지 중인 집계 사용)
+
+    total_only: 계가 입력된 행만 합산 (엑셀 총괄표)
+    """
+    aggregate = getattr(eulji_data, "aggregate", None)
+    if aggregate is not None and gongjong in eulji_data:
+        return aggregate.gongjong_total(gongjong, total_only)
+    from core.eulji_store import as_columns
+
+    columns = as_columns(eulji_data[gongjong])
+    if total_only:
+        return _clean(sum(_entered(value) for value in columns.totals()))
+    return float(sum(columns.quantities()))
+
+
+# ============== 테스트 ==============
+if __name__ == "__main__":
+    import random
+
+    from core.eulji_store import EuljiStore, RowJournal, as_columns
+
+    def scan_materials(store, total_only=False):
+        """전체 재계산 (비교용)"""
+        result = {}
+        for gongjong, columns in store.items():
+            quantities = columns.totals() if total_only else columns.quantities()
+            for row, (item, unit) in enumerate(zip(columns.column("item"), columns.column("unit"))):
+                qty = float(quantities[row])
+                if item.strip() and qty > 0:
+                    entry = result.setdefault((item.strip(), "", unit.strip()), {"qty": 0.0, "count": 0, "gongjongs": []})
+                    entry["qty"] += qty
+                    entry["count"] += 1
+                    if gongjong not in entry["gongjongs"]:
+                        entry["gongjongs"].append(gongjong)
+        for entry in result.values():
+            entry["qty"] = _clean(entry["qty"])
+        return result
+
+    store = EuljiStore({
+        "1. 전등공사": [
+            {"item": "조명기구", "formula": "10", "total": "10", "unit": "개"},
+            {"item": "전선 2.5sq", "formula": "100+50", "unit": "m"},
+            {"item": "배관;배선", "formula": "3", "unit": "식"},
+            {"item": "전등 일위대가", "formula": "2", "unit": "#"},
+            {"item": "접지봉", "formula": "0.4", "unit": "개"},
+        ],
+        "2. 전열공사": [
+            {"item": "콘센트", "total": "20", "unit": "개"},
+            {"item": "전선 2.5sq", "formula": "200", "unit": "m"},
+        ],
+    })
+    aggregate = store.aggregate
+    lazy = aggregate._rows["1. 전등공사"] is None
+    first = aggregate.materials()
+
+
+    # 행 단위 변경 → 증분 반영
+    lighting = store["1. 전등공사"]
+    lighting[1]["formula"] = "100+50+30"
+    after_edit = aggregate.materials()[("전선 2.5sq", "", "m")]["qty"]
+    lighting.remove_rows(0, 1)
+    after_remove = ("조명기구", "", "개") in aggregate.materials()
+    lighting.insert_rows(0, 1)
+    lighting.replace_row(0, {"item": "스위치", "total": "4", "unit": "개"})
+    after_insert = aggregate.materials()[("스위치", "", "개")]["count"]
+
+    # 을지 저장 경로 (RowJournal.flush → 같은 저장본에 변경 행만 반영)
+    working = lighting.copy()
+    journal = RowJournal()
+    journal.attach(working, lighting)
+    working.set(1, "item", "전선 4sq")
+    journal.mark(1)
+    store["1. 전등공사"] = journal.flush(working, lighting, store.pool)
+    flushed = (("전선 4sq", "", "m") in aggregate.materials(), aggregate._rows["1. 전등공사"] is not None)
+
+    # 무작위 편집 후 전체 재계산과 비교
+    random.seed(7)
+    names = ["전선", "케이블", "배관", "박스"]
+    for _ in range(2000):
+        columns = store[random.choice(list(store))]
+        action = random.random()
+        if action < 0.15 and len(columns):
+            columns.remove_rows(random.randrange(len(columns)), random.randint(1, 3))
+        elif action < 0.3:
+            columns.insert_rows(random.randint(0, len(columns)), random.randint(1, 2))
+        elif len(columns):
+            row = random.randrange(len(columns))
+            field = random.choice(["item", "formula", "total", "unit"])
+            value = {
+                "item": random.choice(names + [""]),
+                "formula": random.choice(["1+2", "0.5", "3*<2>", "", "1.25"]),
+                "total": random.choice(["", "7", "1.5", "-2"]),
+                "unit": random.choice(["m", "개", "#"]),
+            }[field]
+            columns.set(row, field, value)
+    fuzz_same = (aggregate.materials() == scan_materials(store)
+                 and aggregate.materials(total_only=True) == scan_materials(store, total_only=True))
+    totals_same = all(
+        abs(aggregate.gongjong_total(g) - float(sum(as_columns(c).quantities()))) < 1e-6
+        and abs(aggregate.gongjong_total(g, total_only=True)
+                - sum(float(v) for v in as_columns(c).totals() if not math.isnan(v))) < 1e-6
+        for g, c in store.items()
+    )
+
+    store["3. 신규"] = [{"item": "전선", "total": "5", "unit": "m"}]
+    del store["2. 전열공사"]
+    gongjongs_after_delete = aggregate.materials()[("전선", "", "m")]["gongjongs"][-1]
+
+    entered = EuljiStore({"공종": [
+        {"item": "A", "total": "2", "unit": "m"},
+        {"item": "A", "formula": "5", "unit": "m"},
+        {"item": "B", "total": "abc", "unit": "m"},
+    ]})
+    entered_first = (material_totals(entered, total_only=True), gongjong_total(entered, "공종", total_only=True))
+
+    # 계 입력/삭제 → 다시 계산하지 않고 증분 반영
+    indexed = []
+    original_index = EstimateAggregate._index
+    EstimateAggregate._index = lambda self, g: (indexed.append(g), original_index(self, g))[1]
+    entered["공종"].set(1, "total", "4")
+    entered["공종"].set(0, "total", "")
+    entered_edit = (material_totals(entered, total_only=True)[("A", "", "m")]["qty"],
+                    gongjong_total(entered, "공종", total_only=True), gongjong_total(entered, "공종"))
+    EstimateAggregate._index = original_index
+
+    cases = [
+        (lazy, True, "불러온 공종은 조회 전까지 계산하지 않음"),
+        (first[("전선 2.5sq", "", "m")], {"qty": 350.0, "count": 2, "gongjongs": ["1. 전등공사", "2. 전열공사"]}, "자재별 합계"),
+        (after_edit, 380.0, "산출수식 수정 반영"),
+        (after_remove, False, "행 삭제 반영"),
+        (after_insert, 1, "행 삽입 + 행 교체 반영"),
+        (flushed, (True, True), "을지 저장 (변경 행만 반영, 다시 계산 안 함)"),
+        (fuzz_same, True, "무작위 편집 2000회 후 전체 재계산과 동일 (수량/계 입력 행)"),
+        (totals_same, True, "공종 수량 합계 (수량/계 입력 행)"),
+        (gongjongs_after_delete, "3. 신규", "공종 추가/삭제"),
+        (material_totals({"공종": [{"item": "A", "total": "2", "unit": "m"}]}), {("A", "", "m"): {"qty": 2.0, "count": 1, "gongjongs": ["공종"]}}, "dict 데이터 집계"),
+        (entered_first, ({("A", "", "m"): {"qty": 2.0, "count": 1, "gongjongs": ["공종"]}}, 2.0),
+         "계 입력 행만 집계/공종 합계 (산출수식만 있는 행 제외)"),
+        ((entered_edit, indexed), ((4.0, 4.0, 4.0), []), "계 입력/삭제 증분 반영 (재계산 없음)"),
+        (gongjong_total({"공종": [{"total": "3"}, {"formula": "5"}]}, "공종", total_only=True), 3.0, "dict 데이터 계 합계"),
+    ]
+
+    print("=" * 60)
+    print("자재 집계 테스트")
+    print("=" * 60)
+    for i, (result, expected, desc) in enumerate(cases, 1):
+        status = "✅" if result == expected else "❌"
+        print(f"{i:2d}. {status} {desc}: {result} (기대: {expected})")
@@ -5,19 +5,323 @@
 산출 데이터 → 견적 내역서 변환
 
 기능:
-- 산출 데이터 순회 → 개별 자재 분해
-- 동일 자재 합산 (CODE 기준)
+- 단계별 변환: 행 읽기 → 수량 계산 → 동일 자재 합산
+  (단계마다 함수 교체 가능, 단계별 소요 시간 기록)
+- 공종별 병렬 수량 계산 (스레드 또는 프로세스, 작업자 수만큼의 공종 행만 동시에 보관)
+- 동일 자재 합산 (전체 공종, 품명+규격+단위 기준 해시 합산 → 공종마다 합산 목록 표시)
+- 단가 조회: 사용한 CODE만 색인 조회, 실행 간 캐시 (DB 수정 시 무효화)
 - 재료할증 적용
 - 수량 소수점 반올림
 - 일위대가 속성 자재 분리
 """
 
-import os
 import json
-import sqlite3
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.db_service import db_service
+from core.eulji_store import GongjongColumns, StringPool, as_columns
+from utils.debug_log import get_logger
+
+_log = get_logger("estimate")
+
+# 구분 (결과 순서: 일반 → 수작업 → 일위대가)
+KIND_REGULAR = "일반"
+KIND_MANUAL = "수작업"
+KIND_UNIT_PRICE = "일위대가"
+
+# 단계 이름 (timings 키)
+STAGES = ("rows", "evaluate", "aggregate")
+
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+_PRICE_QUERY_LIMIT = 500  # SQLite 변수 개수 제한 대비 IN 목록 크기
+
+# 수량 계산 결과 행: (구분, 품명, 규격, 단위, 수량)
+EstimateRow = Tuple[str, str, str, str, float]
+
+
+def qty_formatter(qty_decimal: str) -> Callable[[float], float]:
+    """수량 소수점 처리 함수 ("정수"/"1자리"/"2자리")"""
+    if qty_decimal == "정수":
+        return round
+    digits = 1 if qty_decimal == "1자리" else 2
+    return lambda value: round(value, digits)
+
+
+def _estimate_item(name, spec, unit, qty, decided, kind) -> dict:
+    return {
+        "품명": name,
+        "규격": spec,
+        "단위": unit,
+        "산출수량": qty,
+        "결정수량": decided,
+        "단가": 0,
+        "금액": 0,
+        "구분": kind,
+    }
+
+
+# ============== 단계 1: 행 읽기 ==============
+
+def iter_gongjong(eulji_data: dict) -> Iterator[Tuple[str, GongjongColumns]]:
+    """공종별 컬럼 데이터 (한 번에 공종 1개씩)"""
+    for gongjong, items in eulji_data.items():
+        yield gongjong, as_columns(items)
+
+
+# ============== 단계 2: 수량 계산 ==============
+
+def evaluate_rows(columns: GongjongColumns, options: dict) -> List[EstimateRow]:
+    """
+    공종 1개의 수량 계산 + 자재 유형 분류
+
+    계가 없는 행은 산출수식을 일괄 계산, "@" 단위(수량없음)와 0 이하 수량은 제외
+    """
+    format_qty = qty_formatter(options["qty_decimal"])
+    include_under_1 = options["include_under_1"]
+
+    item_names = columns.column("item")
+    units = columns.column("unit")
+    quantities = columns.quantities()
+
+    rows = []
+    for row_idx, item_name in enumerate(item_names):
+        item_name = item_name.strip()
+        if not item_name:
+            continue
+
+        qty = float(quantities[row_idx])
+        if qty <= 0 or (not include_under_1 and qty <= 1):
+            continue
+        qty = format_qty(qty)
+
+        unit = units[row_idx].strip()
+        if unit == "#":
+            rows.append((KIND_UNIT_PRICE, item_name, "", "식", qty))
+        elif unit == "@":
+            continue
+        elif ";" in item_name or "+" in item_name:
+            rows.append((KIND_MANUAL, item_name, "", unit, qty))
+        else:
+            rows.append((KIND_REGULAR, item_name, "", unit, qty))
+    return rows
+
+
+# ============== 단계 3: 합산 ==============
+
+def aggregate_rows(rows: Iterable[EstimateRow], options: dict) -> List[dict]:
+    """
+    (품명, 규격, 단위) 해시 합산 → 견적 항목 (일반 → 수작업 → 일위대가 순)
+
+    일위대가는 합산하지 않고 행 그대로, 재료할증은 일반/수작업 결정수량에 적용
+    """
+    format_qty = qty_formatter(options["qty_decimal"])
+    rate = 1 + options["surcharge_rate"] / 100.0 if options["material_surcharge"] else 1
+
+    totals = {KIND_REGULAR: {}, KIND_MANUAL: {}}
+    unit_price_items = []
+    for kind, name, spec, unit, qty in rows:
+        if kind == KIND_UNIT_PRICE:
+            unit_price_items.append(_estimate_item(name, spec, unit, qty, qty, kind))
+            continue
+        bucket = totals[kind]
+        key = (name, spec, unit)
+        bucket[key] = bucket.get(key, 0) + qty
+
+    items = []
+    for kind, bucket in totals.items():
+        for (name, spec, unit), total in bucket.items():
+            items.append(_estimate_item(name, spec, unit, total, format_qty(total * rate), kind))
+    items.extend(unit_price_items)
+    return items
+
+
+def evaluate_gongjong(gongjong: str, columns: GongjongColumns, options: dict, evaluate=evaluate_rows):
+    """
+    공종 1개 수량 계산 (작업자에서 실행) → (공종명, 수량 계산 결과 행, 소요 시간)
+
+    프로세스 작업자로 실행할 때는 evaluate가 모듈 수준 함수여야 함
+    """
+    started = time.perf_counter()
+    rows = evaluate(columns, options)
+    return gongjong, rows, time.perf_counter() - started
+
+
+# ============== 단가 조회 ==============
+
+def _to_price(value) -> float:
+    try:
+        return float(str(value).replace(",", "")) if value not in (None, "") else 0
+    except ValueError:
+        return 0
+
 
+class MaterialPriceCache:
+    """
+    자료사전 materials 단가 조회 캐시 (DB 경로별, 실행 간 공유)
+
+    필요한 CODE만 CODE 색인으로 나눠 조회 (WHERE CODE IN (...)),
+    조회한 CODE는 없는 것까지 기억하고 DB 수정 시각/크기가 바뀌면 비움
+    (산출 데이터에는 CODE 컬럼이 없어 견적 변환은 아직 단가를 결합하지 않음)
+    """
+
+    def __init__(self):
+        self._books: Dict[str, Tuple[Tuple[float, int], Dict[str, Optional[float]]]] = {}
+        self._lock = threading.Lock()
+        self.last_fetched = 0  # 마지막 lookup에서 DB로 조회한 CODE 수
+
+    def lookup(self, db_path: str, codes: Iterable[str]) -> Dict[str, float]:
+        """CODE 목록 → {CODE: 단가} (DB/테이블이 없으면 빈 dict)"""
+        self.last_fetched = 0
+        if not db_path or not os.path.exists(db_path):
+            return {}
+        stat = os.stat(db_path)
+        stamp = (stat.st_mtime, stat.st_size)
+        key = os.path.normcase(os.path.abspath(db_path))
+
+        with self._lock:
+            cached = self._books.get(key)
+            if cached is None or cached[0] != stamp:
+                cached = self._books[key] = (stamp, {})
+            book = cached[1]
+
+            codes = list(dict.fromkeys(str(code) for code in codes))
+            missing = [code for code in codes if code not in book]
+            try:
+                for start in range(0, len(missing), _PRICE_QUERY_LIMIT):
+                    batch = missing[start:start + _PRICE_QUERY_LIMIT]
+                    placeholders = ",".join("?" * len(batch))
+                    found = dict.fromkeys(batch)
+                    for code, price in db_service.query(
+                        db_path, f"SELECT CODE, 단가 FROM materials WHERE CODE IN ({placeholders})", batch
+                    ):
+                        found[str(code)] = _to_price(price)
+                    book.update(found)
+                    self.last_fetched += len(batch)
+            except Exception as e:
+                print(f"[WARN] 자료사전 단가 조회 실패: {e}")
+
+            return {code: book[code] for code in codes if book.get(code) is not None}
+
+    def invalidate(self, db_path: str = None):
+        """캐시 비우기 (db_path 없으면 전체)"""
+        with self._lock:
+            if db_path is None:
+                self._books.clear()
+            else:
+                self._books.pop(os.path.normcase(os.path.abspath(db_path)), None)
+
+
+# 프로세스 공용 단가 캐시
+price_cache = MaterialPriceCache()
+
+
+# ============== 파이프라인 ==============
+
+class EstimatePipeline:
+    """
+    산출 → 견적 단계별 변환
+
+    rows → (공종별 작업자: evaluate) → aggregate (전체 공종, 공종 순서대로 행 단위 합산)
+    각 단계 함수는 생성자 인자로 교체 가능. timings에 단계별 소요 시간(초) 기록
+    (evaluate는 작업자 시간 합계라 병렬 실행 시 total보다 클 수 있음)
 
-def convert_to_estimate(eulji_data: dict, options: dict, db_path: str = None) -> dict:
+    결과는 기존 변환과 같이 전체 공종 합산 목록을 공종마다 표시
+    (공종 목록은 같은 항목 dict를 공유), 단가/금액은 0
+    """
+
+    def __init__(self, options: dict, db_path: str = None, workers: int = DEFAULT_WORKERS,
+                 processes: bool = False, rows=iter_gongjong, evaluate=evaluate_rows,
+                 aggregate=aggregate_rows):
+        self.options = options
+        self.db_path = db_path
+        self.workers = max(1, workers or 1)
+        self.processes = processes
+        self.rows = rows
+        self.evaluate = evaluate
+        self.aggregate = aggregate
+        self.timings: Dict[str, float] = dict.fromkeys(STAGES, 0.0)
+
+    def run(self, eulji_data: dict) -> dict:
+        """변환 실행 → {공종명: [견적 항목]} (입력 공종 순서 유지)"""
+        self.timings = dict.fromkeys(STAGES, 0.0)
+        started = time.perf_counter()
+
+        gongjongs = []
+        waited = 0.0  # 합산 중 작업자 결과를 기다린 시간 (합산 시간에서 제외)
+
+        def evaluated_rows():
+            nonlocal waited
+            results = self._evaluate_all(eulji_data)
+            while True:
+                wait_started = time.perf_counter()
+                try:
+                    gongjong, rows, elapsed = next(results)
+                except StopIteration:
+                    return
+                waited += time.perf_counter() - wait_started
+                gongjongs.append(gongjong)
+                self.timings["evaluate"] += elapsed
+                yield from rows
+
+        aggregate_started = time.perf_counter()
+        items = self.aggregate(evaluated_rows(), self.options)
+        self.timings["aggregate"] = time.perf_counter() - aggregate_started - waited
+
+        estimate_data = {gongjong: list(items) for gongjong in gongjongs}
+        self.timings["total"] = time.perf_counter() - started
+
+        _log.info(
+            "estimate: %d 공종, %d 항목, %s",
+            len(estimate_data),
+            len(items),
+            ", ".join(f"{stage}={elapsed * 1000:.1f}ms" for stage, elapsed in self.timings.items()),
+        )
+        return estimate_data
+
+    def _source(self, eulji_data: dict):
+        """행 읽기 단계 (소요 시간 기록)"""
+        source = iter(self.rows(eulji_data))
+        while True:
+            started = time.perf_counter()
+            try:
+                gongjong, columns = next(source)
+            except StopIteration:
+                return
+            if self.processes:
+                # 공종 데이터만 보내도록 문자열 풀 분리
+                columns = columns.compacted(StringPool())
+            self.timings["rows"] += time.perf_counter() - started
+            yield gongjong, columns
+
+    def _evaluate_all(self, eulji_data: dict):
+        """공종별 수량 계산 결과 (입력 순서, 동시에 처리 중인 공종은 작업자 수 이하)"""
+        if self.workers == 1:
+            for gongjong, columns in self._source(eulji_data):
+                yield evaluate_gongjong(gongjong, columns, self.options, self.evaluate)
+            return
+
+        if self.processes:
+            executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="Estimate")
+        with executor:
+            pending = deque()
+            for gongjong, columns in self._source(eulji_data):
+                pending.append(executor.submit(
+                    evaluate_gongjong, gongjong, columns, self.options, self.evaluate
+                ))
+                if len(pending) >= self.workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+
+def convert_to_estimate(eulji_data: dict, options: dict, db_path: str = None, **pipeline_options) -> dict:
     """
     산출 → 견적 변환
 
@@ -33,6 +337,7 @@ def convert_to_estimate(eulji_data: dict, options: dict, db_path: str = None) ->
                 "reuse_unit_price": False,
             }
         db_path: 자료사전 DB 경로
+        pipeline_options: EstimatePipeline 인자 (workers, processes, 단계 함수 ...)
 
     Returns:
         dict: 견적 데이터
@@ -42,154 +347,7 @@ def convert_to_estimate(eulji_data: dict, options: dict, db_path: str = None) ->
             ]
         }
     """
-    # 결과 데이터
-    estimate_data = {}
-
-    # 자료사전 로드 (단가 정보)
-    db_prices = {}
-    if db_path and os.path.exists(db_path):
-        try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT CODE, 단가 FROM materials")
-            for row in cursor.fetchall():
-                db_prices[row[0]] = row[1]
-            conn.close()
-        except Exception as e:
-            print(f"[WARN] 자료사전 로드 실패: {e}")
-
-    # 자재 유형별 구분
-    manual_items = []  # 수작업 자재
-    unit_price_items = []  # 일위대가 자재
-    regular_items = []  # 일반 자재
-
-    # 수량 소수점 처리 함수
-    def format_qty(value: float) -> float:
-        if options["qty_decimal"] == "정수":
-            return round(value)
-        elif options["qty_decimal"] == "1자리":
-            return round(value, 1)
-        else:
-            return round(value, 2)
-
-    # 1이하 처리
-    def should_include(qty: float) -> bool:
-        if options["include_under_1"]:
-            return True
-        return qty > 1
-
-    # 모든 공종 순회
-    for gongjong, items in eulji_data.items():
-        if gongjong not in estimate_data:
-            estimate_data[gongjong] = []
-
-        for row in items:
-            item_name = row.get("item", "").strip()
-            if not item_name:
-                continue
-
-            unit = row.get("unit", "").strip()
-            formula = row.get("formula", "")
-            total = row.get("total", "").strip()
-
-            # 수량 계산
-            try:
-                from utils.formula_parser import parse_formula
-
-                if total:
-                    qty = float(total)
-                elif formula:
-                    qty = parse_formula(formula)
-                else:
-                    qty = 0.0
-            except:
-                qty = 0.0
-
-            if qty <= 0 or not should_include(qty):
-                continue
-
-            # 수량 소수점 처리
-            qty = format_qty(qty)
-
-            # 자재 유형 분류
-            # "#" 또는 "@" 단위: 일위대가 또는 수량없음
-            if unit in ["#", "@"]:
-                if unit == "#":
-                    unit_price_items.append(
-                        {
-                            "품명": item_name,
-                            "규격": "",
-                            "단위": "식",
-                            "산출수량": qty,
-                            "결정수량": qty,
-                            "단가": 0,
-                            "금액": 0,
-                            "구분": "일위대가",
-                        }
-                    )
-                continue
-
-            # 수작업 자재 (; 포함)
-            if ";" in item_name or "+" in item_name:
-                manual_items.append(
-                    {
-                        "품명": item_name,
-                        "규격": "",
-                        "단위": unit,
-                        "산출수량": qty,
-                        "결정수량": qty,
-                        "단가": 0,
-                        "금액": 0,
-                        "구분": "수작업",
-                    }
-                )
-                continue
-
-            # 일반 자재
-            regular_items.append(
-                {
-                    "품명": item_name,
-                    "규격": "",
-                    "단위": unit,
-                    "산출수량": qty,
-                    "결정수량": qty,
-                    "단가": 0,
-                    "금액": 0,
-                    "구분": "일반",
-                }
-            )
-
-    # 동일 자재 합산 (품명+규격+단위 기준)
-    def aggregate_items(items: list) -> list:
-        aggregated = {}
-        for item in items:
-            key = (item["품명"], item["규격"], item["단위"])
-            if key not in aggregated:
-                aggregated[key] = item.copy()
-                aggregated[key]["산출수량"] = 0
-                aggregated[key]["결정수량"] = 0
-            aggregated[key]["산출수량"] += item["산출수량"]
-            aggregated[key]["결정수량"] = format_qty(aggregated[key]["산출수량"])
-
-        return list(aggregated.values())
-
-    # 합산 적용
-    regular_items = aggregate_items(regular_items)
-    manual_items = aggregate_items(manual_items)
-
-    # 재료할증 적용
-    if options["material_surcharge"]:
-        rate = 1 + options["surcharge_rate"] / 100.0
-        for item in regular_items + manual_items:
-            item["결정수량"] = format_qty(item["산출수량"] * rate)
-
-    # 결과 통합 (일반 → 수작업 → 일위대가 순)
-    for gongjong, items in estimate_data.items():
-        items.extend(regular_items)
-        items.extend(manual_items)
-        items.extend(unit_price_items)
-
-    return estimate_data
+    return EstimatePipeline(options, db_path, **pipeline_options).run(eulji_data)
 
 
 def save_estimate_to_json(estimate_data: dict, output_path: str):
@@ -205,16 +363,23 @@ def save_estimate_to_json(estimate_data: dict, output_path: str):
 
 # ============== 테스트 ==============
 if __name__ == "__main__":
-    # 테스트 데이터
+    import sqlite3
+    import tempfile
+
     test_data = {
         "1. 전등공사": [
             {"item": "조명기구", "formula": "10", "total": "10", "unit": "개"},
             {"item": "전선 2.5sq", "formula": "100+50", "total": "150", "unit": "m"},
             {"item": "전선 3.5sq", "formula": "50", "total": "50", "unit": "m"},
+            {"item": "전선 2.5sq", "formula": "20+30", "unit": "m"},
+            {"item": "배관;배선", "formula": "3", "unit": "식"},
+            {"item": "전등 일위대가", "formula": "2", "unit": "#"},
+            {"item": "메모", "formula": "1", "unit": "@"},
         ],
         "2. 전열공사": [
             {"item": "콘센트", "formula": "20", "total": "20", "unit": "개"},
             {"item": "전선 2.5sq", "formula": "200", "total": "200", "unit": "m"},
+            {"item": "접지봉", "formula": "0.4", "unit": "개"},
         ],
     }
 
@@ -227,21 +392,105 @@ if __name__ == "__main__":
         "reuse_unit_price": False,
     }
 
-    # 변환 실행
-    result = convert_to_estimate(test_data, options)
+    tmp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(tmp_dir, "자료사전.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE materials (CODE TEXT PRIMARY KEY, 단가 TEXT)")
+    conn.executemany("INSERT INTO materials VALUES (?, ?)", [
+        ("W-25", "1,200"), ("W-35", "1500"), ("C-02", "3500"), ("콘센트", "3500"),
+    ])
+    conn.commit()
+    conn.close()
+
+    pipeline = EstimatePipeline(options, db_path)
+    result = pipeline.run(dict(test_data, **{"3. 빈공종": []}))
+    lighting = {item["품명"]: item for item in result["1. 전등공사"]}
+
+    serial = convert_to_estimate(test_data, options, db_path, workers=1)
+    in_processes = convert_to_estimate(test_data, options, db_path, workers=2, processes=True)
+
+    # 사용자 단계 함수 + 동시에 보관하는 공종 수 확인 (100개 공종)
+    state = {"produced": 0, "done": 0, "max_alive": 0, "aggregated": 0}
+    state_lock = threading.Lock()
+
+    def counting_rows(data):
+        for gongjong, columns in iter_gongjong(data):
+            with state_lock:
+                state["produced"] += 1
+                state["max_alive"] = max(state["max_alive"], state["produced"] - state["done"])
+            yield gongjong, columns
+
+    def counting_evaluate(columns, opts):
+        rows = evaluate_rows(columns, opts)
+        with state_lock:
+            state["done"] += 1
+        return rows
+
+    def counting_aggregate(rows, opts):
+        state["aggregated"] += 1
+        return aggregate_rows(rows, opts)
+
+    many = {f"{i}. 공종": test_data["1. 전등공사"] for i in range(100)}
+    many_result = convert_to_estimate(
+        many, options, workers=4, rows=counting_rows, evaluate=counting_evaluate, aggregate=counting_aggregate,
+    )
+
+    # 단가 캐시: 새 CODE만 조회, DB 변경 시 다시 조회
+    price_cache.invalidate()
+    first_prices = price_cache.lookup(db_path, ["W-25", "C-02", "없는CODE"])
+    fetched_first = price_cache.last_fetched
+    price_cache.lookup(db_path, ["W-25", "C-02", "없는CODE", "W-35"])
+    fetched_again = price_cache.last_fetched
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE materials SET 단가 = '4000' WHERE CODE = 'C-02'")
+    conn.commit()
+    conn.close()
+    os.utime(db_path, (time.time() + 5, time.time() + 5))
+    changed_prices = price_cache.lookup(db_path, ["C-02"])
+    price_cache.lookup(db_path, [f"C{i}" for i in range(1200)])
+    fetched_many = price_cache.last_fetched
+
+    under_1 = dict(options, include_under_1=False, material_surcharge=False, qty_decimal="1자리")
+    strict = convert_to_estimate({"공종": test_data["2. 전열공사"]}, under_1)["공종"]
+
+    # 기존 변환 결과 (전체 공종 합산 목록을 공종마다 표시, 단가 0)
+    combined = [
+        ("조명기구", 10, 11, "일반"), ("전선 2.5sq", 400, 440, "일반"), ("전선 3.5sq", 50, 55, "일반"),
+        ("콘센트", 20, 22, "일반"), ("접지봉", 0, 0, "일반"),
+        ("배관;배선", 3, 3, "수작업"), ("전등 일위대가", 2, 2, "일위대가"),
+    ]
+
+    def summary(items):
+        return [(item["품명"], item["산출수량"], item["결정수량"], item["구분"]) for item in items]
+
+    cases = [
+        (list(result), ["1. 전등공사", "2. 전열공사", "3. 빈공종"], "공종 순서 유지 (빈 공종 포함)"),
+        ([summary(items) for items in result.values()], [combined] * 3, "전체 공종 합산 목록을 공종마다 표시"),
+        (result["1. 전등공사"][0] is result["3. 빈공종"][0], True, "공종 목록은 같은 항목 공유"),
+        ((lighting["전등 일위대가"]["단위"], "메모" in lighting), ("식", False), "# 일위대가 / @ 제외"),
+        ({(item["단가"], item["금액"]) for item in result["1. 전등공사"]}, {(0, 0)}, "단가/금액 0 (기존과 동일)"),
+        (serial == {g: items for g, items in result.items() if g != "3. 빈공종"}, True, "직렬 결과와 동일"),
+        (in_processes == serial, True, "프로세스 작업자 결과와 동일"),
+        (len(many_result), 100, "100개 공종 변환"),
+        (many_result["99. 공종"][0]["결정수량"], 1100, "100개 공종 합산"),
+        (state["aggregated"], 1, "합산 단계는 전체 공종에 1번"),
+        (state["max_alive"] <= 4, True, f"동시 보관 공종 {state['max_alive']}개 (작업자 4)"),
+        (sorted(pipeline.timings), sorted(STAGES + ("total",)), "단계별 소요 시간"),
+        ([item["품명"] for item in strict], ["콘센트", "전선 2.5sq"], "1이하 제외"),
+        (qty_formatter("1자리")(1.25), 1.2, "소수 1자리"),
+        (first_prices, {"W-25": 1200.0, "C-02": 3500.0}, "CODE 색인 조회"),
+        ((fetched_first, fetched_again), (3, 1), "재실행 시 새 CODE만 조회 (없는 CODE도 기억)"),
+        (changed_prices, {"C-02": 4000.0}, "DB 수정 시 캐시 무효화"),
+        (fetched_many, 1200, "IN 목록 나눠 조회"),
+        (price_cache.lookup(os.path.join(tmp_dir, "없음.db"), ["콘센트"]), {}, "DB 없음"),
+    ]
 
-    # 결과 출력
     print("=" * 60)
-    print("견적 변환 결과")
+    print("견적 변환 테스트")
     print("=" * 60)
+    for i, (result_value, expected, desc) in enumerate(cases, 1):
+        status = "✅" if result_value == expected else "❌"
+        print(f"{i:2d}. {status} {desc}: {result_value} (기대: {expected})")
 
-    for gongjong, items in result.items():
-        print(f"\n[{gongjong}]")
-        for item in items:
-            print(
-                f"  - {item['품명']}: {item['산출수량']} {item['단위']} ({item['구분']})"
-            )
-
-    # JSON 저장
-    save_estimate_to_json(result, "estimate_output.json")
-    print("\n✅ JSON 저장 완료: estimate_output.json")
+    output_path = os.path.join(tmp_dir, "estimate_output.json")
+    print("\nJSON 저장:", "✅" if save_estimate_to_json(result, output_path) else "❌", output_path)
@@ -0,0 +1,663 @@
+# -*- coding: utf-8 -*-
+"""
+을지 데이터 저장소 (Eulji Store)
+=============================
+공종별 산출 데이터를 컬럼 단위 배열로 보관
+
+기능:
+- 컬럼별 배열 저장 (행 단위 dict 대신)
+- 품명/단위 문자열 풀 (같은 문자열은 1회만 보관, 정수 ID로 참조)
+- 계(total)는 float 배열 (비어 있으면 NaN)
+- 을지 테이블(컬럼 번호)과 집계/변환 모듈(필드명)이 같은 저장소 사용
+- 행 변경 알림 → 자재 집계 증분 갱신 (EuljiStore.aggregate)
+"""
+
+import math
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, List, Tuple
+
+from core.estimate_aggregate import EstimateAggregate
+from utils.formula_parser import evaluate_many
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+# 을지 컬럼 순서 (OutputDetailTab.EULJI_COLS와 동일)
+EULJI_FIELDS = (
+    "num",
+    "gubun",
+    "from",
+    "to",
+    "circuit",
+    "item",
+    "formula",
+    "total",
+    "unit",
+    "remark",
+)
+FIELD_INDEX = {name: idx for idx, name in enumerate(EULJI_FIELDS)}
+
+POOLED_FIELDS = ("item", "unit")  # 문자열 풀 사용 (반복이 많은 컬럼)
+QTY_FIELDS = frozenset(("item", "formula", "total", "unit"))  # 자재 집계에 영향을 주는 컬럼
+TEXT_FIELDS = tuple(
+    f for f in EULJI_FIELDS if f not in POOLED_FIELDS and f != "total"
+)
+
+_NAN = float("nan")
+
+
+def _field_name(key) -> str:
+    """컬럼 번호 또는 필드명 → 필드명"""
+    if isinstance(key, int):
+        return EULJI_FIELDS[key]
+    if key in FIELD_INDEX:
+        return key
+    raise KeyError(key)
+
+
+def format_total(value: float) -> str:
+    """계 표시 문자열 (불필요한 .0 제거)"""
+    if value == int(value):
+        return str(int(value))
+    return str(value)
+
+
+class StringPool:
+    """문자열 풀: 문자열 ↔ 정수 ID (ID 0은 빈 문자열)"""
+
+    def __init__(self):
+        self._strings: List[str] = [""]
+        self._ids: Dict[str, int] = {"": 0}
+
+    def intern(self, text: str) -> int:
+        """문자열 등록 후 ID 반환"""
+        sid = self._ids.get(text)
+        if sid is None:
+            sid = len(self._strings)
+            self._strings.append(text)
+            self._ids[text] = sid
+        return sid
+
+    def get(self, sid: int) -> str:
+        return self._strings[sid]
+
+    def lookup(self, text: str) -> int:
+        """등록된 문자열의 ID (없으면 -1)"""
+        return self._ids.get(text, -1)
+
+    def __len__(self):
+        return len(self._strings)
+
+
+class EuljiRow(MutableMapping):
+    """
+    공종 데이터 1행 보기 (기존 dict 행과 같은 방식으로 읽기/쓰기)
+
+    키는 필드명("item") 또는 컬럼 번호(5) 모두 허용하며,
+    빈 셀은 없는 키로 취급한다.
+    """
+
+    __slots__ = ("_columns", "_row")
+
+    def __init__(self, columns: "GongjongColumns", row: int):
+        self._columns = columns
+        self._row = row
+
+    def __getitem__(self, key):
+        value = self._columns.get(self._row, _field_name(key))
+        if not value:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._columns.set(self._row, _field_name(key), value)
+
+    def __delitem__(self, key):
+        self._columns.set(self._row, _field_name(key), "")
+
+    def __iter__(self):
+        for col, _text in self._columns.row_cells(self._row):
+            yield EULJI_FIELDS[col]
+
+    def __len__(self):
+        return len(self._columns.row_cells(self._row))
+
+    def __repr__(self):
+        return f"EuljiRow({dict(self)!r})"
+
+
+class GongjongColumns:
+    """
+    공종 1개의 을지 데이터 (컬럼 단위 배열)
+
+    - 일반 텍스트 컬럼: 문자열 리스트
+    - 품명/단위: 문자열 풀 ID 배열 (array('i'))
+    - 계: float 배열 (array('d'), 비어 있으면 NaN)
+      숫자로 바꿀 수 없거나 표시 형식이 다른 계 문자열은 _total_text에 원문 보관
+    """
+
+    def __init__(self, pool: StringPool = None):
+        self.pool = pool if pool is not None else StringPool()
+        self._text: Dict[str, List[str]] = {f: [] for f in TEXT_FIELDS}
+        self._pooled: Dict[str, array] = {f: array("i") for f in POOLED_FIELDS}
+        self._totals = array("d")
+        self._total_text: Dict[int, str] = {}
+        # 행 변경 알림 대상 (EuljiStore에 들어 있는 공종이면 자재 집계)
+        self.observer = None
+
+    @classmethod
+    def from_rows(cls, rows: Iterable, pool: StringPool = None) -> "GongjongColumns":
+        """행 dict 목록(필드명 또는 컬럼 번호 키) → 컬럼 저장소"""
+        columns = cls(pool)
+        for row in rows:
+            columns.append_row(row)
+        return columns
+
+    def __len__(self):
+        return len(self._totals)
+
+    def __bool__(self):
+        return len(self._totals) > 0
+
+    def __iter__(self):
+        for row in range(len(self._totals)):
+            yield EuljiRow(self, row)
+
+    def __getitem__(self, row: int) -> EuljiRow:
+        if not -len(self._totals) <= row < len(self._totals):
+            raise IndexError(row)
+        return EuljiRow(self, row % len(self._totals))
+
+    # ---------- 쓰기 ----------
+
+    def append_row(self, row=None):
+        """행 추가 (row: 필드명/컬럼 번호 → 텍스트 매핑)"""
+        for texts in self._text.values():
+            texts.append("")
+        for ids in self._pooled.values():
+            ids.append(0)
+        self._totals.append(_NAN)
+        if self.observer is not None:
+            self.observer.rows_inserted(self, len(self._totals) - 1, 1)
+
+        if row:
+            index = len(self._totals) - 1
+            for key, value in row.items():
+                # 을지 컬럼이 아닌 키(산출일위대 unit_price 등)는 건너뜀
+                if value and (isinstance(key, int) or key in FIELD_INDEX):
+                    self.set(index, _field_name(key), value)
+
+    def set(self, row: int, field: str, value):
+        """셀 값 설정 (value: 텍스트, 계는 숫자도 허용)"""
+        if field == "total":
+            self._set_total(row, value)
+        elif field in self._pooled:
+            self._pooled[field][row] = self.pool.intern(value or "")
+        else:
+            self._text[field][row] = value or ""
+        if self.observer is not None and field in QTY_FIELDS:
+            self.observer.row_changed(self, row)
+
+    def _set_total(self, row: int, value):
+        self._total_text.pop(row, None)
+        if value is None or (isinstance(value, str) and not value.strip()):
+            # 공백만 있는 계는 표시용 원문만 보관 (수량은 산출수식 기준)
+            self._totals[row] = _NAN
+            if value:
+                self._total_text[row] = value
+            return
+
+        if isinstance(value, (int, float)):
+            number = float(value)
+            text = None
+        else:
+            text = value
+            try:
+                number = float(text)
+            except ValueError:
+                number = _NAN
+
+        if math.isnan(number):
+            # 숫자가 아닌 계: 원문만 보관, 수량은 0
+            self._totals[row] = 0.0
+            self._total_text[row] = str(value)
+            return
+
+        self._totals[row] = number
+        if text is not None and (math.isinf(number) or format_total(number) != text):
+            self._total_text[row] = text
+
+    def insert_rows(self, row: int, count: int = 1):
+        """row 위치에 빈 행 count개 삽입"""
+        if count <= 0:
+            return
+        for texts in self._text.values():
+            texts[row:row] = [""] * count
+        for ids in self._pooled.values():
+            ids[row:row] = array("i", bytes(4 * count))
+        self._totals[row:row] = array("d", [_NAN] * count)
+        self._shift_total_text(row, count)
+        if self.observer is not None:
+            self.observer.rows_inserted(self, row, count)
+
+    def remove_rows(self, row: int, count: int = 1):
+        """row 위치부터 count개 행 삭제"""
+        count = min(count, len(self._totals) - row)
+        if count <= 0:
+            return
+        if self.observer is not None:
+            self.observer.rows_removed(self, row, count)
+        for texts in self._text.values():
+            del texts[row : row + count]
+        for ids in self._pooled.values():
+            del ids[row : row + count]
+        del self._totals[row : row + count]
+        for r in range(row, row + count):
+            self._total_text.pop(r, None)
+        self._shift_total_text(row + count, -count)
+
+    def ensure_rows(self, count: int):
+        """행 수가 count보다 적으면 끝에 빈 행 추가"""
+        if count > len(self._totals):
+            self.insert_rows(len(self._totals), count - len(self._totals))
+
+    def _shift_total_text(self, first: int, delta: int):
+        if self._total_text:
+            self._total_text = {
+                (r + delta if r >= first else r): text
+                for r, text in self._total_text.items()
+            }
+
+    def copy(self, pool: StringPool = None) -> "GongjongColumns":
+        """사본 (기본: 같은 문자열 풀 공유, pool을 주면 그 풀로 옮긴 사본)"""
+        other = GongjongColumns(self.pool if pool is None else pool)
+        other._text = {f: list(texts) for f, texts in self._text.items()}
+        if other.pool is self.pool:
+            other._pooled = {f: array("i", ids) for f, ids in self._pooled.items()}
+        else:
+            strings = self.pool._strings
+            other._pooled = {
+                f: array("i", (other.pool.intern(strings[sid]) for sid in ids))
+                for f, ids in self._pooled.items()
+            }
+        other._totals = array("d", self._totals)
+        other._total_text = dict(self._total_text)
+        return other
+
+    def replace_row(self, row: int, cells: dict):
+        """행 전체 교체 (cells: 필드명/컬럼 번호 → 텍스트, 없는 필드는 비움)"""
+        values = {_field_name(key): value for key, value in cells.items()}
+        observer, self.observer = self.observer, None
+        try:
+            for field in EULJI_FIELDS:
+                self.set(row, field, values.get(field, ""))
+        finally:
+            self.observer = observer
+        if observer is not None:
+            observer.row_changed(self, row)
+
+    def filled_rows(self) -> List[int]:
+        """공백이 아닌 셀이 하나라도 있는 행 번호 목록 (compacted 대상 행)"""
+        rows = len(self._totals)
+        keep = [False] * rows
+        for values in self._text.values():
+            for r, t in enumerate(values):
+                if t and not keep[r] and t.strip():
+                    keep[r] = True
+
+        strings = self.pool._strings
+        for ids in self._pooled.values():
+            for r, sid in enumerate(ids):
+                if sid and not keep[r] and strings[sid].strip():
+                    keep[r] = True
+
+        for r, value in enumerate(self._totals):
+            if not keep[r] and (not math.isnan(value) or self.get(r, "total").strip()):
+                keep[r] = True
+        return [r for r in range(rows) if keep[r]]
+
+    def stripped_cells(self, row: int) -> Dict[str, str]:
+        """행의 공백이 아닌 셀 {필드명: 텍스트} (compacted와 같은 기준)"""
+        cells = {}
+        for field in EULJI_FIELDS:
+            text = self.get(row, field)
+            if text.strip():
+                cells[field] = text
+        return cells
+
+    def compacted(self, pool: StringPool = None, rows: List[int] = None) -> "GongjongColumns":
+        """
+        빈 행/공백 셀을 제거한 사본 (을지 저장용)
+
+        Args:
+            pool: 결과에 사용할 문자열 풀 (기본: 현재 풀)
+            rows: 남길 행 번호 (기본: filled_rows())
+        """
+        pool = pool if pool is not None else self.pool
+        kept = self.filled_rows() if rows is None else rows
+
+        other = GongjongColumns(pool)
+        other._text = {
+            f: [t if t.strip() else "" for t in (values[r] for r in kept)]
+            for f, values in self._text.items()
+        }
+        strings = self.pool._strings
+        other._pooled = {}
+        for f, ids in self._pooled.items():
+            texts = (strings[ids[r]] for r in kept)
+            other._pooled[f] = array(
+                "i", (pool.intern(t) if t.strip() else 0 for t in texts)
+            )
+        other._totals = array("d", (self._totals[r] for r in kept))
+        for new_row, r in enumerate(kept):
+            text = self._total_text.get(r)
+            if text is not None and text.strip():
+                other._total_text[new_row] = text
+        return other
+
+    # ---------- 읽기 ----------
+
+    def get(self, row: int, field: str) -> str:
+        """셀 텍스트 (빈 셀은 "")"""
+        if field == "total":
+            text = self._total_text.get(row)
+            if text is not None:
+                return text
+            value = self._totals[row]
+            return "" if math.isnan(value) else format_total(value)
+        if field in self._pooled:
+            return self.pool.get(self._pooled[field][row])
+        return self._text[field][row]
+
+    def row_cells(self, row: int) -> List[Tuple[int, str]]:
+        """행의 비어 있지 않은 셀 [(컬럼 번호, 텍스트), ...]"""
+        cells = []
+        for col, field in enumerate(EULJI_FIELDS):
+            text = self.get(row, field)
+            if text:
+                cells.append((col, text))
+        return cells
+
+    def column(self, field: str) -> List[str]:
+        """컬럼 전체 텍스트 목록"""
+        if field == "total":
+            return [self.get(row, "total") for row in range(len(self._totals))]
+        if field in self._pooled:
+            strings = self.pool._strings
+            return [strings[sid] for sid in self._pooled[field]]
+        return list(self._text[field])
+
+    def pooled_ids(self, field: str) -> array:
+        """품명/단위 컬럼의 문자열 풀 ID 배열"""
+        return self._pooled[field]
+
+    def totals(self):
+        """계 float 배열 (비어 있으면 NaN)"""
+        if NUMPY_AVAILABLE:
+            return np.frombuffer(self._totals, dtype=np.float64).copy()
+        return list(self._totals)
+
+    def total(self, row: int) -> float:
+        """행 계 값 (비어 있으면 NaN, 숫자가 아니면 0)"""
+        return self._totals[row]
+
+    def quantity(self, row: int) -> float:
+        """행 수량: 계가 있으면 계, 없으면 산출수식 계산값"""
+        value = self._totals[row]
+        if math.isnan(value):
+            return float(evaluate_many([self._text["formula"][row]])[0])
+        return value
+
+    def quantities(self):
+        """
+        행별 수량: 계가 있으면 계, 없으면 산출수식 계산값 (일괄 계산)
+
+        Returns:
+            numpy.ndarray (NumPy 미설치 시 list)
+        """
+        formulas = self._text["formula"]
+        if NUMPY_AVAILABLE:
+            values = np.frombuffer(self._totals, dtype=np.float64).copy()
+            pending = np.flatnonzero(np.isnan(values))
+            if len(pending):
+                values[pending] = evaluate_many([formulas[i] for i in pending])
+            return values
+
+        values = list(self._totals)
+        pending = [i for i, v in enumerate(values) if math.isnan(v)]
+        if pending:
+            computed = evaluate_many([formulas[i] for i in pending])
+            for i, value in zip(pending, computed):
+                values[i] = value
+        return values
+
+
+class EuljiStore(MutableMapping):
+    """
+    전체 공종 을지 데이터 {공종명: GongjongColumns}
+
+    모든 공종이 하나의 문자열 풀을 공유한다.
+    행 dict 목록을 대입하면 컬럼 저장소로 변환하여 보관한다.
+    aggregate: 공종/자재별 수량 집계 (행 변경 시 해당 행만 반영)
+    """
+
+    def __init__(self, data: dict = None):
+        self.pool = StringPool()
+        self._gongjongs: Dict[str, GongjongColumns] = {}
+        self.aggregate = EstimateAggregate(self)
+        if data:
+            self.update(data)
+
+    def __getitem__(self, gongjong: str) -> GongjongColumns:
+        return self._gongjongs[gongjong]
+
+    def __setitem__(self, gongjong: str, rows):
+        if rows is self._gongjongs.get(gongjong):
+            return  # 같은 저장본 (변경 행은 이미 집계에 반영됨)
+        if isinstance(rows, GongjongColumns) and rows.pool is self.pool:
+            columns = rows
+        else:
+            columns = GongjongColumns.from_rows(rows, self.pool)
+        self._gongjongs[gongjong] = columns
+        self.aggregate.attach(gongjong, columns)
+
+    def __delitem__(self, gongjong: str):
+        del self._gongjongs[gongjong]
+        self.aggregate.detach(gongjong)
+
+    def __iter__(self):
+        return iter(self._gongjongs)
+
+    def __len__(self):
+        return len(self._gongjongs)
+
+    def columns(self, gongjong: str) -> GongjongColumns:
+        """공종 저장소 (없으면 생성)"""
+        columns = self._gongjongs.get(gongjong)
+        if columns is None:
+            columns = GongjongColumns(self.pool)
+            self._gongjongs[gongjong] = columns
+            self.aggregate.attach(gongjong, columns)
+        return columns
+
+    def new_columns(self) -> GongjongColumns:
+        """풀을 공유하는 빈 공종 저장소 (대입 전 채우기용)"""
+        return GongjongColumns(self.pool)
+
+
+class RowJournal:
+    """
+    작업 사본 → 저장본 변경 기록 (을지 지연 저장용)
+
+    작업 사본(을지 테이블)은 빈 행을 포함하고 저장본은 빈 행을 뺀 compacted 형태다.
+    마지막 동기화 이후 수정된 행만 기록했다가 저장본에 반영한다.
+    행 삭제처럼 저장본 행 위치를 알 수 없게 되면 다음 저장 시 전체 사본을 만든다.
+    """
+
+    def __init__(self):
+        self._target = None  # 동기화된 저장본
+        self._filled: List[int] = []  # 저장본 각 행에 대응하는 작업 사본 행 (오름차순)
+        self._dirty = set()
+
+    def mark(self, row: int):
+        """행 수정 기록"""
+        if self._target is not None:
+            self._dirty.add(row)
+
+    def rows_inserted(self, first: int, count: int):
+        """빈 행 삽입 반영 (저장본은 그대로, 행 번호만 이동)"""
+        if self._target is None:
+            return
+        pos = bisect_left(self._filled, first)
+        self._filled[pos:] = [r + count for r in self._filled[pos:]]
+        self._dirty = {(r + count if r >= first else r) for r in self._dirty}
+
+    def rows_removed(self, first: int, count: int):
+        """행 삭제 반영"""
+        if self._target is None:
+            return
+        lo = bisect_left(self._filled, first)
+        hi = bisect_left(self._filled, first + count)
+        if lo != hi:
+            self.invalidate()  # 저장된 행 삭제 → 다음 저장 시 전체 사본
+            return
+        self._filled[lo:] = [r - count for r in self._filled[lo:]]
+        self._dirty = {
+            (r - count if r >= first + count else r)
+            for r in self._dirty
+            if not first <= r < first + count
+        }
+
+    def invalidate(self):
+        """기록 폐기 (다음 저장 시 전체 사본)"""
+        self._target = None
+        self._filled = []
+        self._dirty.clear()
+
+    def attach(self, working: GongjongColumns, target: GongjongColumns) -> bool:
+        """
+        작업 사본을 불러온 저장본과 연결 (저장본에 빈 행이 있으면 연결하지 않음)
+
+        Returns:
+            연결 여부
+        """
+        self.invalidate()
+        if target is None:
+            return False
+        filled = working.filled_rows()
+        if len(filled) != len(target):
+            return False
+        self._target = target
+        self._filled = filled
+        return True
+
+    def flush(self, working: GongjongColumns, target: GongjongColumns = None,
+              pool: StringPool = None) -> GongjongColumns:
+        """
+        변경 행을 저장본에 반영
+
+        Args:
+            working: 작업 사본
+            target: 현재 저장본 (연결된 저장본과 다르면 전체 사본 생성)
+            pool: 전체 사본에 사용할 문자열 풀
+
+        Returns:
+            최신 저장본 (target 또는 새 사본)
+        """
+        if target is None or target is not self._target:
+            filled = working.filled_rows()
+            snapshot = working.compacted(pool, filled)
+            self._target = snapshot
+            self._filled = filled
+            self._dirty.clear()
+            return snapshot
+
+        filled = self._filled
+        for row in sorted(self._dirty):
+            pos = bisect_left(filled, row)
+            stored = pos < len(filled) and filled[pos] == row
+            cells = working.stripped_cells(row) if row < len(working) else {}
+            if cells:
+                if not stored:
+                    target.insert_rows(pos, 1)
+                    filled.insert(pos, row)
+                target.replace_row(pos, cells)
+            elif stored:
+                target.remove_rows(pos, 1)
+                del filled[pos]
+        self._dirty.clear()
+        return target
+
+
+def as_columns(items) -> GongjongColumns:
+    """공종 데이터(GongjongColumns 또는 행 dict 목록) → GongjongColumns"""
+    if isinstance(items, GongjongColumns):
+        return items
+    return GongjongColumns.from_rows(items)
+
+
+# ============== 테스트 ==============
+if __name__ == "__main__":
+    store = EuljiStore(
+        {
+            "1. 전등공사": [
+                {"item": "전선 2.5sq", "formula": "100+50", "total": "150", "unit": "m"},
+                {"item": "전선 2.5sq", "formula": "2.3+<1.5+2.3>+3", "unit": "m"},
+                {5: "조명기구", 6: "5", 8: "개"},
+            ],
+        }
+    )
+    columns = store["1. 전등공사"]
+    rows = list(columns)
+
+    cases = [
+        (len(columns), 3, "행 수"),
+        (rows[2].get("item", ""), "조명기구", "컬럼 번호 키 → 필드명 조회"),
+        (rows[0].get(7, ""), "150", "필드명 키 → 컬럼 번호 조회"),
+        (len(store.pool), 5, "문자열 풀 (빈 문자열 + 품명 2 + 단위 2)"),
+        ([float(q) for q in columns.quantities()], [150.0, 9.1, 5.0], "수량 (계 없으면 수식)"),
+    ]
+
+    rows[1]["total"] = "2.50"
+    cases.append((rows[1]["total"], "2.50", "계 원문 유지"))
+    rows[0]["total"] = "확인필요"
+    cases.append((float(columns.quantities()[0]), 0.0, "숫자 아닌 계 → 수량 0"))
+    cases.append((columns.row_cells(2), [(5, "조명기구"), (6, "5"), (8, "개")], "행 셀 목록"))
+    moved = columns.copy(StringPool())
+    cases.append(((len(moved.pool), [moved.row_cells(r) for r in range(3)]),
+                  (5, [columns.row_cells(r) for r in range(3)]), "다른 문자열 풀로 사본 (빈 문자열 + 품명 2 + 단위 2)"))
+
+    # 변경 기록: 작업 사본(빈 행 포함) → 저장본
+    working = GongjongColumns(store.pool)
+    for row in ({"item": "A"}, {}, {"item": "B"}, {}):
+        working.append_row(row)
+    journal = RowJournal()
+    saved = journal.flush(working, None, store.pool)
+    cases.append(([r["item"] for r in saved], ["A", "B"], "전체 사본 (빈 행 제외)"))
+    working.set(1, "item", "C")
+    journal.mark(1)
+    working.set(2, "item", "B2")
+    journal.mark(2)
+    journal.rows_inserted(0, 1)
+    working.insert_rows(0, 1)
+    cases.append((journal.flush(working, saved) is saved, True, "변경 행만 반영 (같은 저장본)"))
+    cases.append(([r["item"] for r in saved], ["A", "C", "B2"], "변경 행 반영 결과"))
+    working.set(2, "item", " ")
+    journal.mark(2)
+    journal.flush(working, saved)
+    cases.append(([r["item"] for r in saved], ["A", "B2"], "비워진 행 제거"))
+
+    print("=" * 60)
+    print("을지 저장소 테스트")
+    print("=" * 60)
+    for i, (result, expected, desc) in enumerate(cases, 1):
+        status = "✅" if result == expected else "❌"
+        print(f"{i:2d}. {status} {desc}: {result} (기대: {expected})")
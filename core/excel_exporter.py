@@ -6,36 +6,496 @@
 
 기능:
 - 총괄표 시트 생성
-- 공종별 산출내역서 시트
+- 공종별 산출내역서 시트 (시트마다 독립적으로 작성)
 - 산출일위대 포함
 - 서식 적용 (헤더, 테두리, 숫자 형식)
+- 스트리밍 저장: write-only 통합문서에 행을 만드는 즉시 기록
+  (셀마다 서식 객체를 만들지 않고 통합문서에 한 번 등록한 이름 있는 스타일 사용)
+- 병렬 작성: 공종 시트를 작업자 스레드에서 부분 파일로 작성한 뒤 마지막에 xlsx 조립
+- 진행률/취소: ExcelExportJob (대화상자는 백그라운드 스레드로 실행하여 화면 멈춤 없음)
 """
 
 try:
     from openpyxl import Workbook
-    from openpyxl.styles import Font, Border, Side, PatternFill, Alignment
-    from openpyxl.utils import get_column_letter
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, Border, Side, PatternFill, Alignment, NamedStyle
+    from openpyxl.worksheet.cell_range import CellRange
 
     OPENPYXL_AVAILABLE = True
 except ImportError:
     OPENPYXL_AVAILABLE = False
     print("[WARN] openpyxl 미설치: pip install openpyxl")
 
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from xml.etree import ElementTree
+
+from core.estimate_aggregate import gongjong_total
+from core.eulji_store import EULJI_FIELDS, GongjongColumns, StringPool
+from utils.debug_log import get_logger
+
+_log = get_logger("excel_export")
+
+# 공종 시트 작성 작업자 수 (1이면 부분 파일 없이 통합문서 하나에 바로 기록)
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+# 취소 확인 간격 (초)
+_POLL_INTERVAL = 0.1
+
+# 이름 있는 스타일 (통합문서마다 1회 등록, 셀에는 이름만 지정)
+STYLE_HEADER = "oasis_header"
+STYLE_TEXT = "oasis_text"
+STYLE_NUMBER = "oasis_number"
+STYLE_CELL = "oasis_cell"
+STYLE_UNIT_PRICE = "oasis_unit_price"
+STYLE_GONGJONG = "oasis_gongjong"
+STYLE_NAMES = (STYLE_HEADER, STYLE_TEXT, STYLE_NUMBER, STYLE_CELL, STYLE_UNIT_PRICE, STYLE_GONGJONG)
+
+SUMMARY_HEADERS = ["번호", "공종명", "수량", "비고"]
+SUMMARY_WIDTHS = {"A": 8, "B": 40, "C": 12, "D": 30}
+
+EULJI_HEADERS = ["#.", "구분", "FROM", "TO", "회로", "산출목록", "산출수식", "계", "단위", "비고"]
+# 산출내역서 열 스타일 (#. 구분 FROM TO 회로 산출목록 산출수식 계 단위 비고)
+EULJI_STYLES = (
+    STYLE_NUMBER, STYLE_TEXT, STYLE_CELL, STYLE_CELL, STYLE_CELL,
+    STYLE_TEXT, STYLE_CELL, STYLE_NUMBER, STYLE_NUMBER, STYLE_CELL,
+)
+# 산출내역서에 쓰는 필드 (번호 열은 행 순번으로 채움)
+_EXPORT_FIELDS = EULJI_FIELDS[1:]
+_TOTAL_INDEX = _EXPORT_FIELDS.index("total")
+
+ESTIMATE_HEADERS = ["품명", "규격", "단위", "산출수량", "결정수량", "단가", "금액", "구분"]
+
+# xlsx 조립: 셀 서식 표와 시트 XML의 셀 서식 번호
+_SHEET_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_CELL_STYLE = re.compile(rb'(<c [^>]*?\bs=")(\d+)"')
+
+
+def _named_styles():
+    """내보내기에 쓰는 이름 있는 스타일 목록"""
+    thin = Side(style="thin")
+    thin_border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    return [
+        NamedStyle(
+            name=STYLE_HEADER,
+            font=Font(bold=True, size=11),
+            fill=PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid"),
+            border=thin_border,
+            alignment=Alignment(horizontal="center", vertical="center"),
+        ),
+        NamedStyle(
+            name=STYLE_TEXT,
+            border=thin_border,
+            alignment=Alignment(horizontal="left", vertical="center"),
+        ),
+        NamedStyle(
+            name=STYLE_NUMBER,
+            border=thin_border,
+            alignment=Alignment(horizontal="right", vertical="center"),
+        ),
+        NamedStyle(name=STYLE_CELL, border=thin_border),
+        NamedStyle(
+            name=STYLE_UNIT_PRICE,
+            fill=PatternFill(start_color="F2F2F2", end_color="F2F2F2", fill_type="solid"),
+        ),
+        NamedStyle(name=STYLE_GONGJONG, font=Font(bold=True)),
+    ]
+
+
+def new_workbook():
+    """스트리밍(write-only) 통합문서 + 이름 있는 스타일 등록"""
+    wb = Workbook(write_only=True)
+    for style in _named_styles():
+        wb.add_named_style(style)
+    return wb
+
+
+def discard_workbook(wb):
+    """저장하지 않고 버리는 write-only 통합문서 닫기 (시트 임시 파일은 openpyxl이 종료 시 정리)"""
+    for ws in wb.worksheets:
+        if not ws.closed:
+            ws.close()
+    wb.close()
+
+
+class _RowStyler:
+    """
+    시트 1개의 행 → 스타일 지정된 WriteOnlyCell 목록
+
+    스타일은 (열, 스타일)마다 셀을 처음 만들 때 한 번만 지정하고, 이후 행은 같은 셀에 값만 바꿔 쓴다
+    (write-only 시트는 append 즉시 행을 기록하므로 다음 행에서 셀을 다시 써도 안전)
+    """
+
+    def __init__(self, ws):
+        self.ws = ws
+        self._cells = {}
+
+    def row(self, values, styles):
+        """값 목록 + 열별 스타일 이름 (None이면 값 그대로)"""
+        row = []
+        for column, (value, style) in enumerate(zip(values, styles)):
+            if style is None:
+                row.append(value)
+                continue
+            cell = self._cells.get((column, style))
+            if cell is None:
+                cell = self._cells[(column, style)] = WriteOnlyCell(self.ws)
+                cell.style = style
+            cell.value = value
+            row.append(cell)
+        return row
+
+    def header(self, headers):
+        """헤더 행 (전 열 헤더 스타일)"""
+        return self.row(headers, [STYLE_HEADER] * len(headers))
+
+
+def _total_value(text: str):
+    """계 텍스트 → 숫자 (숫자가 아니면 빈 값)"""
+    text = text.strip()
+    if text and text.replace(".", "").replace("-", "").isdigit():
+        try:
+            return float(text)
+        except ValueError:
+            pass
+    return ""
+
+
+def _eulji_values(items):
+    """
+    공종 데이터 → (필드 값 튜플, 산출일위대 dict 또는 None) 순서대로 생성
+
+    GongjongColumns는 컬럼 배열을 그대로 묶어 읽고, 행 dict 목록은 행마다 읽는다.
+    """
+    if isinstance(items, GongjongColumns):
+        for values in zip(*(items.column(f) for f in _EXPORT_FIELDS)):
+            yield values, None
+        return
+    for item in items:
+        yield tuple(item.get(f, "") for f in _EXPORT_FIELDS), item.get("unit_price")
+
+
+def summary_totals(project_data):
+    """총괄표 [(공종명, 수량)] (계가 입력된 행만 합산, 을지 저장소면 유지 중인 집계)"""
+    return [(gongjong, gongjong_total(project_data, gongjong, total_only=True)) for gongjong in project_data]
+
+
+def write_summary_sheet(wb, totals, title: str = "산출 총괄표"):
+    """
+    총괄표 시트 작성 (번호, 공종명, 수량, 비고)
+
+    Args:
+        totals: summary_totals() 결과 [(공종명, 수량)]
+    """
+    ws = wb.create_sheet(title=title[:31])  # 시트명 31자 제한
+    for column, width in SUMMARY_WIDTHS.items():
+        ws.column_dimensions[column].width = width
+
+    ws.append(_RowStyler(ws).header(SUMMARY_HEADERS))
+    for number, (gongjong, total_qty) in enumerate(totals, 1):
+        ws.append([number, gongjong, total_qty])
+    return ws
+
+
+def write_gongjong_sheet(wb, gongjong: str, items, include_unit_price: bool = True):
+    """
+    공종 산출내역서 시트 1개 작성 (다른 시트와 독립)
+
+    행은 만들어지는 즉시 기록하며, 산출일위대가 있으면 해당 행 바로 아래에 이어 쓴다.
+
+    Returns:
+        int: 기록한 행 수 (헤더 포함)
+    """
+    ws = wb.create_sheet(title=gongjong[:31])
+    styler = _RowStyler(ws)
+    ws.append(styler.header(EULJI_HEADERS))
+    written = 1
+
+    for number, (values, unit_price) in enumerate(_eulji_values(items), 1):
+        values = list(values)
+        values[_TOTAL_INDEX] = _total_value(values[_TOTAL_INDEX])
+        ws.append(styler.row([number, *values], EULJI_STYLES))
+        written += 1
+
+        # 산출일위대 추가 (있는 경우)
+        if include_unit_price and unit_price:
+            written += 1
+            ws.append(styler.row(["", "  └─ 산출일위대가:"], [None, STYLE_UNIT_PRICE]))
+            ws.merged_cells.add(CellRange(min_col=2, min_row=written, max_col=10, max_row=written))
+
+            # 일위대 세부항목
+            for u_idx, unit_item in enumerate(unit_price.get("items", []), 1):
+                ws.append(["", f"    {u_idx}.", unit_item.get("name", ""), unit_item.get("qty", "")])
+                written += 1
+    return written
+
+
+def snapshot_gongjong(items):
+    """
+    내보내기용 공종 데이터 사본 (작업자 스레드/프로세스로 보낼 수 있는 형태)
+
+    GongjongColumns는 전용 문자열 풀을 쓰는 사본 (셀 텍스트 그대로), 행 dict 목록은 행별 사본
+    """
+    if isinstance(items, GongjongColumns):
+        return items.copy(StringPool())
+    return [dict(item) for item in items]
+
+
+def render_gongjong_part(gongjong: str, items, include_unit_price: bool, path: str) -> str:
+    """
+    [작업자] 공종 시트 1개만 든 부분 xlsx 작성 → 경로 반환
+
+    조립 단계에서 이 파일의 시트 XML을 최종 파일의 해당 시트 자리에 넣는다.
+    """
+    wb = new_workbook()
+    try:
+        write_gongjong_sheet(wb, gongjong, items, include_unit_price)
+    except Exception:
+        discard_workbook(wb)
+        raise
+    wb.save(path)
+    return path
+
+
+class ExcelExportJob:
+    """
+    산출내역 엑셀 내보내기 작업 (진행률 보고, 취소 가능)
+
+    - 총괄표 수량은 생성 시(호출 스레드) 계산. snapshot=True면 공종 데이터 사본도 미리 만들어
+      run()을 다른 스레드에서 실행해도 화면의 데이터와 충돌하지 않음
+      (False면 원본을 그대로 읽고, 프로세스로 보낼 공종만 보낼 때 사본 생성)
+    - workers > 1: 공종 시트를 작업자 스레드(processes=True면 프로세스)에서 부분 파일로 작성하고,
+      총괄표 + 빈 공종 시트로 만든 뼈대 파일에 시트 XML을 넣어 xlsx 조립
+    - workers == 1: 통합문서 하나에 순서대로 기록
+    - processes=True는 앱 밖(스크립트)에서만 사용: Windows(spawn)에서는 작업자마다 실행 중인
+      __main__(main.py)을 다시 import하여 PyQt6/화면 모듈을 읽고 시작 로그를 덮어씀
+    - 진행률: done / total (공종 시트 수 + 조립 1단계), progress(done, total) 호출
+    - cancel(): 남은 시트 작성 중단, 출력 파일은 만들지 않음 (run()은 False)
+    """
+
+    def __init__(self, project_data, output_path: str, include_unit_price: bool = True,
+                 sheet_name: str = "산출 총괄표", workers: int = DEFAULT_WORKERS,
+                 processes: bool = False, progress=None, snapshot: bool = False):
+        self.output_path = output_path
+        self.include_unit_price = include_unit_price
+        self.sheet_name = sheet_name
+        self.workers = max(1, workers or 1)
+        self.processes = processes
+        self.progress = progress
+
+        self.totals = summary_totals(project_data)
+        self.snapshot = snapshot
+        if snapshot:
+            self.sheets = [(gongjong, snapshot_gongjong(items)) for gongjong, items in project_data.items()]
+        else:
+            self.sheets = list(project_data.items())
+        self.total = len(self.sheets) + 1
+        self.done = 0
+        self.error = None
+        self._cancel = threading.Event()
+
+    # ---------- 진행/취소 ----------
+
+    def cancel(self):
+        """취소 요청 (어느 스레드에서나 호출 가능)"""
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def finished(self) -> bool:
+        """모든 단계 완료 (파일 저장까지)"""
+        return self.done == self.total
+
+    def _step(self):
+        self.done += 1
+        if self.progress is not None:
+            self.progress(self.done, self.total)
+
+    # ---------- 실행 ----------
+
+    def run(self) -> bool:
+        """내보내기 실행 → 성공 여부 (취소/실패 시 False, 실패 원인은 error)"""
+        started = time.perf_counter()
+        self.done = 0
+        try:
+            with tempfile.TemporaryDirectory(prefix="oasis_export_") as temp_dir:
+                if self.workers == 1:
+                    ok = self._write_direct()
+                else:
+                    ok = self._write_parts(temp_dir)
+        except Exception as e:
+            self.error = e
+            print(f"[ERROR] 엑셀 내보내기 실패: {e}")
+            return False
+
+        if not ok:
+            print("[INFO] 엑셀 내보내기 취소")
+            return False
+        _log.info(
+            "excel: %d 시트, workers=%d, processes=%s, %.1fms",
+            len(self.sheets), self.workers, self.processes, (time.perf_counter() - started) * 1000,
+        )
+        print(f"[INFO] 엑셀 저장 완료: {self.output_path}")
+        return True
+
+    def _write_direct(self) -> bool:
+        """통합문서 하나에 총괄표 → 공종 시트 순서로 기록"""
+        wb = new_workbook()
+        try:
+            write_summary_sheet(wb, self.totals, self.sheet_name)
+            for gongjong, items in self.sheets:
+                if self.cancelled:
+                    discard_workbook(wb)
+                    return False
+                write_gongjong_sheet(wb, gongjong, items, self.include_unit_price)
+                self._step()
+        except Exception:
+            discard_workbook(wb)
+            raise
+        wb.save(self.output_path)
+        self._step()
+        return True
+
+    def _write_parts(self, temp_dir: str) -> bool:
+        """공종 시트 병렬 작성 → 뼈대 파일에 조립"""
+        # 뼈대: 총괄표 + 빈 공종 시트 (시트 이름/순서/스타일 표는 여기서 결정)
+        skeleton = new_workbook()
+        write_summary_sheet(skeleton, self.totals, self.sheet_name)
+        placeholders = [skeleton.create_sheet(title=gongjong[:31]) for gongjong, _items in self.sheets]
+        if placeholders:
+            # 모든 스타일의 셀 서식을 뼈대 서식 표에 등록 (빈 시트 내용은 조립 시 교체되어 남지 않음)
+            placeholders[0].append(_RowStyler(placeholders[0]).row([""] * len(STYLE_NAMES), STYLE_NAMES))
+        skeleton_path = os.path.join(temp_dir, "skeleton.xlsx")
+        skeleton.save(skeleton_path)
+        # 시트 XML 위치 (저장 시 정해짐) → 부분 파일
+        parts = {}
+
+        if self.processes:
+            executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ExcelExport")
+        try:
+            pending = deque()
+            for index, (gongjong, items) in enumerate(self.sheets):
+                part_path = os.path.join(temp_dir, f"part{index}.xlsx")
+                if self.processes and not self.snapshot:
+                    items = snapshot_gongjong(items)
+                future = executor.submit(render_gongjong_part, gongjong, items, self.include_unit_price, part_path)
+                pending.append((placeholders[index].path[1:], future))
+                # 동시에 작성 중인 시트는 작업자 수의 2배 이하
+                while len(pending) >= self.workers * 2 or (index == len(self.sheets) - 1 and pending):
+                    if not self._collect(pending, parts):
+                        return False
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        if self.cancelled:
+            return False
+        self._assemble(skeleton_path, parts)
+        self._step()
+        return True
+
+    def _collect(self, pending: deque, parts: dict) -> bool:
+        """가장 앞의 부분 파일 완료 대기 (취소 시 False)"""
+        sheet_path, future = pending[0]
+        while not wait([future], timeout=_POLL_INTERVAL).done:
+            if self.cancelled:
+                return False
+        pending.popleft()
+        parts[sheet_path] = future.result()
+        self._step()
+        return not self.cancelled
+
+    def _assemble(self, skeleton_path: str, parts: dict):
+        """
+        뼈대 파일의 빈 공종 시트 XML을 부분 파일 시트 XML로 바꿔 최종 파일 저장
+
+        부분 파일의 셀 서식 번호는 통합문서마다 처음 쓴 순서로 정해지므로,
+        같은 서식을 가진 뼈대 파일의 번호로 바꿔 넣는다.
+        """
+        temp_path = self.output_path + ".tmp"
+        try:
+            with zipfile.ZipFile(skeleton_path) as source, \
+                    zipfile.ZipFile(temp_path, "w", zipfile.ZIP_DEFLATED, allowZip64=True) as target:
+                formats = {}
+                for index, xf in enumerate(_cell_formats(source)):
+                    formats.setdefault(xf, index)
+                for info in source.infolist():
+                    part_path = parts.get(info.filename)
+                    if part_path is None:
+                        target.writestr(info, source.read(info.filename))
+                        continue
+                    with zipfile.ZipFile(part_path) as part:
+                        try:
+                            mapping = [formats[xf] for xf in _cell_formats(part)]
+                        except KeyError:
+                            raise ValueError(f"부분 파일 셀 서식이 뼈대 파일에 없음: {info.filename}")
+                        with part.open("xl/worksheets/sheet1.xml") as src, \
+                                target.open(info.filename, "w", force_zip64=True) as dst:
+                            if mapping == list(range(len(mapping))):
+                                shutil.copyfileobj(src, dst)
+                            else:
+                                _copy_restyled(src, dst, mapping)
+            os.replace(temp_path, self.output_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+def _cell_formats(archive) -> list:
+    """xlsx 셀 서식 표 (cellXfs 순서, 서식마다 XML 바이트)"""
+    root = ElementTree.fromstring(archive.read("xl/styles.xml"))
+    cell_xfs = root.find(f"{{{_SHEET_NS}}}cellXfs")
+    return [ElementTree.tostring(xf) for xf in (cell_xfs if cell_xfs is not None else ())]
+
+
+def _copy_restyled(src, dst, mapping, chunk_size: int = 1 << 20):
+    """시트 XML 복사 + 셀 서식 번호(s="N") 바꾸기 (태그가 잘리지 않게 마지막 '<' 앞까지씩 처리)"""
+
+    def restyle(match):
+        return match.group(1) + str(mapping[int(match.group(2))]).encode() + b'"'
+
+    rest = b""
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            dst.write(_CELL_STYLE.sub(restyle, rest))
+            return
+        data = rest + chunk
+        cut = data.rfind(b"<")
+        if cut <= 0:
+            rest = data
+            continue
+        dst.write(_CELL_STYLE.sub(restyle, data[:cut]))
+        rest = data[cut:]
+
 
 def export_to_excel(
     project_data: dict,
     output_path: str,
     include_unit_price: bool = True,
     sheet_name: str = "산출 총괄표",
+    **job_options,
 ):
     """
-    산출 데이터를 엑셀로 내보내기
+    산출 데이터를 엑셀로 내보내기 (스트리밍 저장)
 
     Args:
-        project_data: {"공종명": [...(산출 행 데이터)]}
+        project_data: {"공종명": [...(산출 행 데이터)]} 또는 EuljiStore
         output_path: 저장 경로 (.xlsx)
         include_unit_price: 산출일위대 포함 여부
         sheet_name: 총괄표 시트명
+        job_options: ExcelExportJob 인자 (workers, processes, progress, snapshot)
 
     Returns:
         bool: 성공 여부
@@ -45,175 +505,16 @@ def export_to_excel(
         return False
 
     try:
-        wb = Workbook()
-
-        # 스타일 정의
-        header_font = Font(bold=True, size=11)
-        header_fill = PatternFill(
-            start_color="D9E1F2", end_color="D9E1F2", fill_type="solid"
-        )
-        thin_border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
-        )
-        header_alignment = Alignment(horizontal="center", vertical="center")
-        num_alignment = Alignment(horizontal="right", vertical="center")
-        text_alignment = Alignment(horizontal="left", vertical="center")
-
-        # 시트 1: 산출 총괄표
-        ws_summary = wb.active
-        ws_summary.title = sheet_name[:31]  # 시트명 31자 제한
-
-        # 총괄표 헤더
-        summary_headers = ["번호", "공종명", "수량", "비고"]
-        for col, header in enumerate(summary_headers, 1):
-            cell = ws_summary.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.border = thin_border
-            cell.alignment = header_alignment
-
-        # 총괄표 데이터
-        for row_idx, (gongjong, items) in enumerate(project_data.items(), 2):
-            ws_summary.cell(row=row_idx, column=1, value=row_idx - 1)
-            ws_summary.cell(row=row_idx, column=2, value=gongjong)
-
-            # 수량 합산
-            total_qty = 0
-            for item in items:
-                total = item.get("total", "").strip()
-                if total:
-                    try:
-                        total_qty += float(total)
-                    except:
-                        pass
-            ws_summary.cell(row=row_idx, column=3, value=total_qty)
-
-        # 열 너비 조정
-        ws_summary.column_dimensions["A"].width = 8
-        ws_summary.column_dimensions["B"].width = 40
-        ws_summary.column_dimensions["C"].width = 12
-        ws_summary.column_dimensions["D"].width = 30
-
-        # 시트 2~N: 공종별 산출내역서
-        for gongjong, items in project_data.items():
-            sheet_name = gongjong[:31]
-            ws = wb.create_sheet(title=sheet_name)
-
-            # 산출내역서 헤더
-            eulji_headers = [
-                "#.",
-                "구분",
-                "FROM",
-                "TO",
-                "회로",
-                "산출목록",
-                "산출수식",
-                "계",
-                "단위",
-                "비고",
-            ]
-            for col, header in enumerate(eulji_headers, 1):
-                cell = ws.cell(row=1, column=col, value=header)
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.border = thin_border
-                cell.alignment = header_alignment
-
-            # 데이터 행
-            for row_idx, item in enumerate(items, 2):
-                # 번호
-                cell = ws.cell(row=row_idx, column=1, value=row_idx - 1)
-                cell.border = thin_border
-                cell.alignment = num_alignment
-
-                # 구분
-                cell = ws.cell(row=row_idx, column=2, value=item.get("gubun", ""))
-                cell.border = thin_border
-                cell.alignment = text_alignment
-
-                # FROM
-                cell = ws.cell(row=row_idx, column=3, value=item.get("from", ""))
-                cell.border = thin_border
-
-                # TO
-                cell = ws.cell(row=row_idx, column=4, value=item.get("to", ""))
-                cell.border = thin_border
-
-                # 회로
-                cell = ws.cell(row=row_idx, column=5, value=item.get("circuit", ""))
-                cell.border = thin_border
-
-                # 산출목록
-                cell = ws.cell(row=row_idx, column=6, value=item.get("item", ""))
-                cell.border = thin_border
-                cell.alignment = text_alignment
-
-                # 산출수식
-                cell = ws.cell(row=row_idx, column=7, value=item.get("formula", ""))
-                cell.border = thin_border
-
-                # 계
-                total = item.get("total", "").strip()
-                cell = ws.cell(
-                    row=row_idx,
-                    column=8,
-                    value=float(total)
-                    if total and total.replace(".", "").replace("-", "").isdigit()
-                    else "",
-                )
-                cell.border = thin_border
-                cell.alignment = num_alignment
-
-                # 단위
-                cell = ws.cell(row=row_idx, column=9, value=item.get("unit", ""))
-                cell.border = thin_border
-                cell.alignment = num_alignment
-
-                # 비고
-                cell = ws.cell(row=row_idx, column=10, value=item.get("remark", ""))
-                cell.border = thin_border
-
-                # 산출일위대 추가 (있는 경우)
-                if include_unit_price and item.get("unit_price"):
-                    # 빈 행 추가
-                    ws.cell(row=row_idx + 1, column=1, value="")
-                    ws.merge_cells(
-                        start_row=row_idx + 1,
-                        start_column=2,
-                        end_row=row_idx + 1,
-                        end_column=10,
-                    )
-                    unit_cell = ws.cell(
-                        row=row_idx + 1, column=2, value="  └─ 산출일위대가:"
-                    )
-                    unit_cell.fill = PatternFill(
-                        start_color="F2F2F2", end_color="F2F2F2", fill_type="solid"
-                    )
-
-                    # 일위대 세부항목
-                    unit_items = item.get("unit_price", {}).get("items", [])
-                    for u_idx, unit_item in enumerate(unit_items, 1):
-                        u_row = row_idx + 1 + u_idx
-                        ws.cell(row=u_row, column=2, value=f"    {u_idx}.")
-                        ws.cell(row=u_row, column=3, value=unit_item.get("name", ""))
-                        ws.cell(row=u_row, column=4, value=unit_item.get("qty", ""))
-
-        # 저장
-        wb.save(output_path)
-        print(f"[INFO] 엑셀 저장 완료: {output_path}")
-        return True
-
+        job = ExcelExportJob(project_data, output_path, include_unit_price, sheet_name, **job_options)
     except Exception as e:
         print(f"[ERROR] 엑셀 내보내기 실패: {e}")
         return False
+    return job.run()
 
 
 def export_estimate_to_excel(estimate_data: dict, output_path: str):
     """
-    견적 데이터를 엑셀로 내보내기
+    견적 데이터를 엑셀로 내보내기 (스트리밍 저장)
 
     Args:
         estimate_data: 견적 데이터 {"공종명": [...]}
@@ -227,62 +528,22 @@ def export_estimate_to_excel(estimate_data: dict, output_path: str):
         return False
 
     try:
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, Border, Side, PatternFill, Alignment
-
-        wb = Workbook()
-
-        # 스타일
-        header_font = Font(bold=True, size=11)
-        header_fill = PatternFill(
-            start_color="D9E1F2", end_color="D9E1F2", fill_type="solid"
-        )
-        thin_border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
-        )
+        wb = new_workbook()
+        ws = wb.create_sheet(title="견적서")
+        styler = _RowStyler(ws)
 
         # 견적서 헤더
-        headers = [
-            "품명",
-            "규격",
-            "단위",
-            "산출수량",
-            "결정수량",
-            "단가",
-            "금액",
-            "구분",
-        ]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.border = thin_border
-
-        ws = wb.active
-        ws.title = "견적서"
+        ws.append(styler.header(ESTIMATE_HEADERS))
 
-        # 데이터
+        # 데이터 (행 번호 없이 순서대로 추가)
+        item_styles = [STYLE_CELL] * len(ESTIMATE_HEADERS)
         for gongjong, items in estimate_data.items():
             # 공종명 행
-            ws.cell(row=ws.max_row + 1, column=1, value=gongjong)
-            ws.cell(row=ws.max_row, column=1).font = Font(bold=True)
+            ws.append(styler.row([gongjong], [STYLE_GONGJONG]))
 
             for item in items:
-                row = ws.max_row + 1
-                ws.cell(row=row, column=1, value=item.get("품명", ""))
-                ws.cell(row=row, column=2, value=item.get("규격", ""))
-                ws.cell(row=row, column=3, value=item.get("단위", ""))
-                ws.cell(row=row, column=4, value=item.get("산출수량", ""))
-                ws.cell(row=row, column=5, value=item.get("결정수량", ""))
-                ws.cell(row=row, column=6, value=item.get("단가", ""))
-                ws.cell(row=row, column=7, value=item.get("금액", ""))
-                ws.cell(row=row, column=8, value=item.get("구분", ""))
-
-                for col in range(1, 9):
-                    ws.cell(row=row, column=col).border = thin_border
+                values = [item.get(header, "") for header in ESTIMATE_HEADERS]
+                ws.append(styler.row(values, item_styles))
 
         wb.save(output_path)
         print(f"[INFO] 견적서 엑셀 저장 완료: {output_path}")
@@ -298,12 +559,16 @@ def show_export_dialog(parent=None, eulji_data: dict = None):
     [GUI] 엑셀 내보내기 대화상자 표시
     Toolbar에서 호출용 래퍼 함수
 
+    내보내기는 백그라운드 스레드에서 실행하고, 진행률 대화상자는 타이머로 진행 상태만 읽는다
+    (취소 버튼 → ExcelExportJob.cancel). 완료 메시지는 끝난 뒤 화면 스레드에서 표시.
+
     Args:
         parent: 부모 위젯 (QWidget)
         eulji_data: 산출 데이터 딕셔너리
     """
     try:
-        from PyQt6.QtWidgets import QFileDialog, QMessageBox
+        from PyQt6.QtCore import Qt, QTimer
+        from PyQt6.QtWidgets import QFileDialog, QMessageBox, QProgressDialog
 
         if not OPENPYXL_AVAILABLE:
             QMessageBox.warning(
@@ -313,23 +578,48 @@ def show_export_dialog(parent=None, eulji_data: dict = None):
             )
             return
 
-        if not eulji_data or not isinstance(eulji_data, dict):
+        if not eulji_data or not isinstance(eulji_data, Mapping):
             eulji_data = {}
 
         # 파일 대화상자
         file_path, _ = QFileDialog.getSaveFileName(
             parent, "엑셀 파일로 내보내기", "산출내역.xlsx", "Excel Files (*.xlsx)"
         )
+        if not file_path:
+            return
 
-        if file_path:
-            success = export_to_excel(eulji_data, file_path, include_unit_price=True)
-            if success:
+        # 데이터 사본은 화면 스레드에서 생성
+        job = ExcelExportJob(eulji_data, file_path, include_unit_price=True, snapshot=True)
+        worker = threading.Thread(target=job.run, name="ExcelExport", daemon=True)
+
+        dialog = QProgressDialog("엑셀 파일 작성 중...", "취소", 0, job.total, parent)
+        dialog.setWindowTitle("엑셀 출력")
+        dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        dialog.canceled.connect(job.cancel)
+        timer = QTimer(dialog)
+        timer.setInterval(100)
+
+        def poll():
+            if worker.is_alive():
+                dialog.setValue(min(job.done, job.total - 1))
+                return
+            timer.stop()
+            dialog.canceled.disconnect(job.cancel)
+            dialog.close()
+            dialog.deleteLater()
+            if job.cancelled:
+                return
+            if job.finished:
                 QMessageBox.information(
                     parent, "완료", f"엑셀 파일이 저장되었습니다.\n{file_path}"
                 )
             else:
                 QMessageBox.warning(parent, "오류", "엑셀 내보내기에 실패했습니다.")
 
+        timer.timeout.connect(poll)
+        worker.start()
+        timer.start()
+
     except ImportError:
         print("[ERROR] PyQt6 미설치: GUI 대화상자를 사용할 수 없습니다.")
     except Exception as e:
@@ -338,6 +628,12 @@ def show_export_dialog(parent=None, eulji_data: dict = None):
 
 # ============== 테스트 ==============
 if __name__ == "__main__":
+    import tracemalloc
+
+    from openpyxl import load_workbook
+
+    from core.eulji_store import EuljiStore
+
     # 테스트 데이터
     test_data = {
         "1. 전등공사": [
@@ -348,6 +644,7 @@ if __name__ == "__main__":
                 "unit": "개",
                 "gubun": "조명",
                 "remark": "LED 조명",
+                "unit_price": {"items": [{"name": "노무비", "qty": "0.2"}, {"name": "잡재료", "qty": "1"}]},
             },
             {
                 "item": "전선 2.5sq",
@@ -368,6 +665,123 @@ if __name__ == "__main__":
         ],
     }
 
-    # 엑셀 내보내기
-    export_to_excel(test_data, "test_output.xlsx", include_unit_price=False)
-    print("✅ 테스트 완료: test_output.xlsx")
+    out_dir = tempfile.mkdtemp()
+    path = os.path.join(out_dir, "test_output.xlsx")
+    ok = export_to_excel(test_data, path, include_unit_price=True, workers=1)
+    wb = load_workbook(path)
+    light = wb["1. 전등공사"]
+    light_rows = [list(r) for r in light.iter_rows(values_only=True)]
+
+    def sheet_dump(file_path):
+        """시트별 (이름, 값, 스타일 이름, 병합 범위)"""
+        book = load_workbook(file_path)
+        return [
+            (ws.title,
+             [[(c.value, c.style) for c in row] for row in ws.iter_rows()],
+             sorted(str(r) for r in ws.merged_cells.ranges))
+            for ws in book.worksheets
+        ]
+
+    # 병렬 작성 (부분 파일 조립) 결과는 순서대로 기록한 결과와 같아야 함
+    mixed = dict(test_data)
+    mixed.update({gongjong: columns for gongjong, columns in list(EuljiStore({
+        f"{g + 3}. 동력공사 {'가' * 30}{g}": [
+            {"item": f"케이블 {i}", "total": str(i), "unit": "m", "remark": "  "} for i in range(300)
+        ]
+        for g in range(4)
+    }).items())})
+    direct_path = os.path.join(out_dir, "direct.xlsx")
+    process_path = os.path.join(out_dir, "process.xlsx")
+    thread_path = os.path.join(out_dir, "thread.xlsx")
+    export_to_excel(mixed, direct_path, workers=1)
+    steps = []
+    thread_ok = export_to_excel(mixed, thread_path, workers=2, progress=lambda done, total: steps.append((done, total)))
+    process_ok = export_to_excel(mixed, process_path, workers=2, processes=True, snapshot=True)
+    direct_dump = sheet_dump(direct_path)
+
+    # 취소: 첫 시트 완료 후 취소 → 출력 파일 없음
+    cancel_path = os.path.join(out_dir, "cancel.xlsx")
+    cancel_job = ExcelExportJob(mixed, cancel_path, workers=2, processes=False)
+    cancel_job.progress = lambda done, total: cancel_job.cancel()
+    cancel_ok = cancel_job.run()
+
+    # 화면 스레드 밖 실행: 사본 생성 후 원본을 바꿔도 결과는 생성 시점 데이터
+    live = EuljiStore({"1. 전등공사": [{"item": "전선", "total": "5", "unit": "m"}]})
+    live_job = ExcelExportJob(live, os.path.join(out_dir, "live.xlsx"), workers=1, snapshot=True)
+    live["1. 전등공사"].set(0, "total", "7")
+    worker = threading.Thread(target=live_job.run)
+    worker.start()
+    worker.join()
+    live_value = load_workbook(live_job.output_path)["1. 전등공사"]["H2"].value
+
+    estimate_path = os.path.join(out_dir, "estimate.xlsx")
+    estimate_ok = export_estimate_to_excel(
+        {"1. 전등공사": [{"품명": "전선 2.5sq", "단위": "m", "산출수량": 150.0, "결정수량": 150}]},
+        estimate_path,
+    )
+    estimate_rows = [list(r) for r in load_workbook(estimate_path)["견적서"].iter_rows(values_only=True)]
+
+    # 대용량: 공종 10개 x 5천 행 = 5만 행
+    big = EuljiStore({
+        f"{g + 1}. 공종": [
+            {"item": f"전선 {i % 40}sq", "formula": f"{i}+1", "total": str(i + 1), "unit": "m", "gubun": "간선"}
+            for i in range(5000)
+        ]
+        for g in range(10)
+    })
+    big_path = os.path.join(out_dir, "big.xlsx")
+    started = time.perf_counter()
+    big_ok = export_to_excel(big, big_path)
+    elapsed = time.perf_counter() - started
+
+    # 최대 메모리: 행 수가 3배여도 거의 같아야 함 (행을 만드는 즉시 기록)
+    peaks = []
+    for count in (1, 3):
+        part = {gongjong: big[gongjong] for gongjong in list(big)[:count]}
+        tracemalloc.start()
+        export_to_excel(part, os.path.join(out_dir, f"part{count}.xlsx"), workers=1)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1e6)
+        tracemalloc.stop()
+    big_sheet = load_workbook(big_path, read_only=True)["10. 공종"]
+    big_sheet.reset_dimensions()
+    big_rows = sum(1 for _ in big_sheet.iter_rows(values_only=True))
+
+    cases = [
+        (ok, True, "산출내역 저장"),
+        (wb.sheetnames, ["산출 총괄표", "1. 전등공사", "2. 전열공사"], "시트 순서"),
+        ([list(r) for r in wb["산출 총괄표"].iter_rows(min_row=2, values_only=True)],
+         [[1, "1. 전등공사", 160, None], [2, "2. 전열공사", 20, None]], "총괄표 수량"),
+        (summary_totals({"공종": [{"item": "A", "total": "3"}, {"item": "B", "formula": "5"}]}),
+         [("공종", 3.0)], "총괄표 수량은 계 입력 행만 합산"),
+        (light_rows[0], EULJI_HEADERS, "산출내역서 헤더"),
+        (light_rows[1][:9], [1, "조명", None, None, None, "조명기구 TYPE-A", "10", 10, "개"], "데이터 행"),
+        (light_rows[2][1], "  └─ 산출일위대가:", "산출일위대 제목 행 (데이터 행과 겹치지 않음)"),
+        (light_rows[3][1:4], ["    1.", "노무비", "0.2"], "산출일위대 세부항목"),
+        (light_rows[5][:2], [2, "조명"], "다음 데이터 행은 일위대 아래"),
+        ([str(r) for r in light.merged_cells.ranges], ["B3:J3"], "일위대 제목 병합"),
+        ((light["A1"].style, light["B2"].style, light["H2"].style, light["B3"].style),
+         (STYLE_HEADER, STYLE_TEXT, STYLE_NUMBER, STYLE_UNIT_PRICE), "이름 있는 스타일"),
+        (light["A1"].font.bold and light["A1"].border.left.style, "thin", "헤더 서식"),
+        (wb["산출 총괄표"].column_dimensions["B"].width, 40, "총괄표 열 너비"),
+        (process_ok and sheet_dump(process_path) == direct_dump, True, "병렬 작성(프로세스) = 순서대로 작성"),
+        (thread_ok and sheet_dump(thread_path) == direct_dump, True, "병렬 작성(스레드) = 순서대로 작성"),
+        (len(set(name for name, _rows, _merged in direct_dump)), 7, "긴 공종명 시트 이름 중복 없음"),
+        (steps[-1], (7, 7), "진행률 (공종 6 + 조립)"),
+        ([done for done, _total in steps], list(range(1, 8)), "진행률 순서"),
+        ((cancel_ok, cancel_job.cancelled, os.path.exists(cancel_path), os.path.exists(cancel_path + ".tmp")),
+         (False, True, False, False), "취소 시 파일 없음"),
+        ((live_job.finished, live_value), (True, 5), "사본으로 백그라운드 실행"),
+        (estimate_ok, True, "견적서 저장"),
+        (estimate_rows, [ESTIMATE_HEADERS, ["1. 전등공사"] + [None] * 7,
+                         ["전선 2.5sq", None, "m", 150, 150, None, None, None]], "견적서 행 순서"),
+        (big_ok and big_rows, 5001, "5만 행 저장"),
+        (elapsed < 30, True, f"5만 행 저장 시간 {elapsed:.1f}초"),
+        (peaks[1] < peaks[0] * 1.5, True, f"최대 메모리 5천 행 {peaks[0]:.1f}MB / 1만5천 행 {peaks[1]:.1f}MB"),
+    ]
+
+    print("=" * 60)
+    print("엑셀 내보내기 테스트")
+    print("=" * 60)
+    for i, (result, expected, desc) in enumerate(cases, 1):
+        status = "✅" if result == expected else "❌"
+        print(f"{i:2d}. {status} {desc}: {result} (기대: {expected})")
@@ -13,19 +13,21 @@
 
 import re
 
+from core.eulji_store import as_columns
+
 
 def check_formula_errors(formula: str) -> list:
     """
-     수식 오류 검사
-
-     Args:
-         formula: 산출수식 문자열
+    수식 오류 검사
 
-     Returns:
-         list: 오류 목록 (빈列表이면 정상 errors = []
+    Args:
+        formula: 산출수식 문자열
 
-    )
+    Returns:
+        list: 오류 목록 (빈 리스트이면 정상)
     """
+    errors = []
+
     if not formula or not formula.strip():
         return errors
 
@@ -110,14 +112,18 @@ def check_all_formulas(eulji_data: dict) -> list:
         list: [{"공종", "행", "수식", "오류": [...]}, ...]
     """
     all_errors = []
+    checked = {}  # 동일 수식은 1회만 검사
 
     for gongjong, items in eulji_data.items():
-        for row_idx, item in enumerate(items, 1):
-            formula = item.get("formula", "").strip()
+        for row_idx, formula in enumerate(as_columns(items).column("formula"), 1):
+            formula = formula.strip()
             if not formula:
                 continue
 
-            errors = check_formula_errors(formula)
+            errors = checked.get(formula)
+            if errors is None:
+                errors = check_formula_errors(formula)
+                checked[formula] = errors
             if errors:
                 all_errors.append(
                     {
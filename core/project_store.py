@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+프로젝트 파일 저장소 (Project Store)
+================================
+프로젝트 1개를 SQLite 파일 1개(WAL 모드)로 보관
+
+기능:
+- 엔티티별 테이블 (갑지 행, 을지 행, 메타 정보)
+- 변경된 행만 기록 (마지막 저장/불러오기 상태와 비교)
+- 저장 1회 = 트랜잭션 1회 (중간에 종료되어도 이전 저장 상태 유지)
+- 열기 시 파일 1개만 읽음 (공종별 JSON 파일 불필요)
+"""
+
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from core.eulji_store import EULJI_FIELDS, EuljiStore, GongjongColumns
+
+PROJECT_EXT = ".emx"
+PROJECT_FILTER = "EasyMax 프로젝트 (*.emx)"
+SCHEMA_VERSION = 1
+
+_EULJI_COLUMNS = ", ".join(f'"{f}"' for f in EULJI_FIELDS)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS gapji (
+    row INTEGER PRIMARY KEY,
+    cells TEXT NOT NULL,
+    payload TEXT
+);
+CREATE TABLE IF NOT EXISTS eulji (
+    gongjong TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    {", ".join(f'"{f}" TEXT NOT NULL DEFAULT ' + "''" for f in EULJI_FIELDS)},
+    PRIMARY KEY (gongjong, row)
+) WITHOUT ROWID;
+"""
+
+GapjiRow = Tuple[Tuple[str, ...], Optional[object]]  # (셀 텍스트, UserRole 데이터)
+
+
+def _eulji_rows(columns: GongjongColumns) -> List[Tuple[str, ...]]:
+    """공종 데이터 → 행 튜플 목록 (컬럼 순서)"""
+    if not len(columns):
+        return []
+    return list(zip(*(columns.column(f) for f in EULJI_FIELDS)))
+
+
+def _dump_payload(payload) -> Optional[str]:
+    if payload is None:
+        return None
+    try:
+        return json.dumps(payload, ensure_ascii=False, default=str)
+    except (TypeError, ValueError):
+        return None
+
+
+class ProjectStore:
+    """
+    프로젝트 파일 (SQLite)
+
+    불러오기/저장 시점의 행 내용을 기억해 두고, 다음 저장 때는
+    달라진 행만 INSERT/UPDATE/DELETE 한다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        if self.get_meta("schema_version") is None:
+            with self._conn:
+                self._set_meta("schema_version", str(SCHEMA_VERSION))
+
+        self._saved_eulji: Dict[str, List[Tuple[str, ...]]] = {}
+        self._saved_gapji: Dict[int, Tuple[str, Optional[str]]] = {}
+
+    def close(self):
+        """파일 닫기 (WAL 내용을 본 파일에 반영)"""
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error:
+            pass
+        self._conn.close()
+        self._conn = None
+
+    @contextmanager
+    def transaction(self):
+        """원자적 쓰기 (예외 시 전체 롤백)"""
+        with self._conn:
+            yield self._conn
+
+    # ---------- 메타 정보 ----------
+
+    def get_meta(self, key: str, default=None):
+        row = self._conn.execute("SELECT value FROM meta WHERE key=?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value):
+        with self._conn:
+            self._set_meta(key, value)
+
+    def _set_meta(self, key: str, value):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value))
+        )
+
+    # ---------- 을지 ----------
+
+    def load_eulji(self, store: EuljiStore) -> EuljiStore:
+        """저장된 을지 데이터를 store에 채움 (공종별 행 순서 유지)"""
+        self._saved_eulji = {}
+        cursor = self._conn.execute(
+            f"SELECT gongjong, {_EULJI_COLUMNS} FROM eulji ORDER BY gongjong, row"
+        )
+        current = None
+        columns = None
+        for gongjong, *cells in cursor:
+            if gongjong != current:
+                current = gongjong
+                columns = store.columns(gongjong)
+                self._saved_eulji[gongjong] = []
+            columns.append_row(dict(zip(EULJI_FIELDS, cells)))
+            self._saved_eulji[gongjong].append(tuple(cells))
+        return store
+
+    def _write_eulji(self, store: EuljiStore) -> int:
+        """달라진 을지 행만 기록 (트랜잭션 안에서 호출)"""
+        written = 0
+        for gongjong in list(self._saved_eulji):
+            if gongjong not in store or not len(store[gongjong]):
+                self._conn.execute("DELETE FROM eulji WHERE gongjong=?", (gongjong,))
+                written += len(self._saved_eulji.pop(gongjong))
+
+        for gongjong, columns in store.items():
+            rows = _eulji_rows(columns)
+            saved = self._saved_eulji.get(gongjong, [])
+            changed = [
+                (gongjong, r, *cells)
+                for r, cells in enumerate(rows)
+                if r >= len(saved) or saved[r] != cells
+            ]
+            if changed:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO eulji (gongjong, row, {_EULJI_COLUMNS}) "
+                    f"VALUES ({', '.join('?' * (len(EULJI_FIELDS) + 2))})",
+                    changed,
+                )
+            if len(saved) > len(rows):
+                self._conn.execute(
+                    "DELETE FROM eulji WHERE gongjong=? AND row>=?", (gongjong, len(rows))
+                )
+            written += len(changed) + max(0, len(saved) - len(rows))
+            if rows:
+                self._saved_eulji[gongjong] = rows
+            else:
+                self._saved_eulji.pop(gongjong, None)
+        return written
+
+    # ---------- 갑지 ----------
+
+    def load_gapji(self) -> Dict[int, GapjiRow]:
+        """저장된 갑지 행 {행: (셀 텍스트, UserRole 데이터)}"""
+        self._saved_gapji = {}
+        rows = {}
+        for row, cells, payload in self._conn.execute(
+            "SELECT row, cells, payload FROM gapji ORDER BY row"
+        ):
+            self._saved_gapji[row] = (cells, payload)
+            rows[row] = (tuple(json.loads(cells)), json.loads(payload) if payload else None)
+        return rows
+
+    def _write_gapji(self, rows: Dict[int, GapjiRow]) -> int:
+        """달라진 갑지 행만 기록 (트랜잭션 안에서 호출)"""
+        encoded = {
+            row: (json.dumps(list(cells), ensure_ascii=False), _dump_payload(payload))
+            for row, (cells, payload) in rows.items()
+        }
+        changed = [
+            (row, cells, payload)
+            for row, (cells, payload) in encoded.items()
+            if self._saved_gapji.get(row) != (cells, payload)
+        ]
+        removed = [(row,) for row in self._saved_gapji if row not in encoded]
+        if changed:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO gapji (row, cells, payload) VALUES (?, ?, ?)", changed
+            )
+        if removed:
+            self._conn.executemany("DELETE FROM gapji WHERE row=?", removed)
+        self._saved_gapji = encoded
+        return len(changed) + len(removed)
+
+    # ---------- 프로젝트 저장 ----------
+
+    def save(self, store: EuljiStore, gapji_rows: Dict[int, GapjiRow] = None,
+             meta: dict = None) -> int:
+        """
+        프로젝트 저장 (변경 행만, 단일 트랜잭션)
+
+        Args:
+            store: 을지 데이터
+            gapji_rows: 갑지 행 {행: (셀 텍스트, UserRole 데이터)} (None이면 갑지 유지)
+            meta: 추가 메타 정보 (프로젝트명 등)
+
+        Returns:
+            기록한 행 수
+        """
+        saved_eulji = {k: list(v) for k, v in self._saved_eulji.items()}
+        saved_gapji = dict(self._saved_gapji)
+        try:
+            with self._conn:
+                written = self._write_eulji(store)
+                if gapji_rows is not None:
+                    written += self._write_gapji(gapji_rows)
+                for key, value in (meta or {}).items():
+                    self._set_meta(key, value)
+        except Exception:
+            # 롤백된 경우 비교 기준도 되돌림
+            self._saved_eulji = saved_eulji
+            self._saved_gapji = saved_gapji
+            raise
+        return written
+
+
+# ============== 테스트 ==============
+if __name__ == "__main__":
+    import tempfile
+
+    path = os.path.join(tempfile.mkdtemp(), "test" + PROJECT_EXT)
+    store = EuljiStore(
+        {
+            "1. 전등공사": [
+                {"item": "전선 2.5sq", "formula": "100+50", "total": "150", "unit": "m"},
+                {"item": "조명기구", "formula": "5", "unit": "개"},
+            ],
+            "2. 전열공사": [{"item": "콘센트", "formula": "$H*2", "unit": "개"}],
+        }
+    )
+    gapji = {0: (("", "공 사 명", "Project", "테스트 현장"), None), 2: (("", "", "1", "1. 전등공사"), {"k": 1})}
+
+    project = ProjectStore(path)
+    cases = [(project.save(store, gapji, {"project_name": "테스트 현장"}), 5, "최초 저장 (전체 행)")]
+    cases.append((project.save(store, gapji), 0, "변경 없음 → 기록 없음"))
+
+    store["1. 전등공사"].set(1, "formula", "6")
+    del store["2. 전열공사"]
+    cases.append((project.save(store, gapji), 2, "수정 1행 + 삭제 공종 1행"))
+    project.close()
+
+    reopened = ProjectStore(path)
+    loaded = reopened.load_eulji(EuljiStore())
+    cases.append((list(loaded), ["1. 전등공사"], "공종 목록"))
+    cases.append((loaded["1. 전등공사"].get(1, "formula"), "6", "수정 행 반영"))
+    cases.append((reopened.load_gapji()[2][1], {"k": 1}, "갑지 UserRole 데이터"))
+    cases.append((reopened.get_meta("project_name"), "테스트 현장", "메타 정보"))
+    cases.append((reopened.save(loaded, gapji), 0, "불러온 직후 저장"))
+    reopened.close()
+
+    print("=" * 60)
+    print("프로젝트 저장소 테스트")
+    print("=" * 60)
+    for i, (result, expected, desc) in enumerate(cases, 1):
+        status = "✅" if result == expected else "❌"
+        print(f"{i:2d}. {status} {desc}: {result} (기대: {expected})")
@@ -0,0 +1,532 @@
+# -*- coding: utf-8 -*-
+"""
+자료사전 DB 행 공급자 (Reference Row Source)
+=========================================
+자료사전(19,000+ 행)을 전부 메모리에 올리지 않고 필요한 구간만 읽기
+
+기능:
+- 행 번호 ↔ ID 배열 (array, 행당 8바이트)
+- 페이지 단위 지연 로딩 (ID 키셋 조회) + 최근 페이지 LRU 캐시
+- 검색 색인 (FTS5, 2글자 조각 토큰) → 전체 일치 행을 순위순으로 반환
+- 검색 색인 사이드카 파일 (DB 수정 시각/크기/해시로 유효성 확인, 바뀔 때만 재생성)
+- 색인 준비 전/FTS5 미지원 시 DB LIKE 검색으로 대체
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import weakref
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from core.db_service import db_service
+
+# 조회 컬럼 순서 (행 튜플 인덱스)
+# 0:ID, 1:품명, 2:규격, 3:단위, 4:CODE, 5:그룹, 6~10:목록2~6, 11:약칭, 12:W, 13:산출목록, 14:검색목록
+REFERENCE_COLUMNS = (
+    "ID", "품명", "규격", "단위", "CODE",
+    "그룹", "목록2", "목록3", "목록4", "목록5", "목록6", "약칭", "W", "산출목록", "검색목록",
+)
+# 검색 대상 컬럼 ('+'는 공백으로 치환하여 단어 단위 검색)
+SEARCH_COLUMNS = ("목록2", "목록3", "목록4", "목록5", "목록6", "약칭", "산출목록", "검색목록", "품명", "규격", "CODE")
+# 순위 가중치: 표시 명칭 컬럼 일치가 분류/별칭 컬럼 일치보다 우선
+PRIMARY_SEARCH_COLUMNS = ("산출목록", "품명", "규격", "CODE")
+SECONDARY_SEARCH_COLUMNS = tuple(c for c in SEARCH_COLUMNS if c not in PRIMARY_SEARCH_COLUMNS)
+PRIMARY_WEIGHT = 4.0
+
+try:
+    sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5(a)")
+    FTS5_AVAILABLE = True
+except sqlite3.Error:
+    FTS5_AVAILABLE = False
+
+PAGE_SIZE = 256
+MAX_CACHED_PAGES = 16
+
+# 검색 색인 사이드카: "<DB 파일>.search" (색인 형식이 바뀌면 버전 증가)
+INDEX_SUFFIX = ".search"
+INDEX_VERSION = "1"
+
+_TABLE = "[자료사전]"
+_WHERE = "품명 != '자료사전'"
+_SELECT = ", ".join(REFERENCE_COLUMNS)
+_SEARCH_EXPR = "replace({}, '+', ' ')".format(
+    " || ' ' || ".join(f"coalesce({c}, '')" for c in SEARCH_COLUMNS)
+)
+
+
+def normalize_search_text(text: str) -> str:
+    """검색 문자열 정규화 (소문자, '+' → 공백)"""
+    return text.lower().replace("+", " ")
+
+
+def _gram_tokens(text: str, last_char: bool = True) -> str:
+    """
+    정규화된 문자열 → 색인 토큰 (단어별 연속 2글자 조각 + 마지막 1글자, 16진 부호화)
+
+    한글은 형태소 분석 없이 2글자 조각으로 부분 일치를 지원한다.
+    마지막 1글자 토큰은 1글자 검색어(접두 검색)가 단어 끝 글자도 찾도록 한다.
+    토큰을 16진으로 바꿔 FTS 토크나이저가 기호/한글을 분리하지 않게 한다.
+    """
+    tokens = []
+    for word in text.split():
+        for i in range(len(word) - 1):
+            tokens.append(word[i:i + 2].encode("utf-8").hex())
+        if last_char:
+            tokens.append(word[-1].encode("utf-8").hex())
+    return " ".join(tokens)
+
+
+def _match_query(query: str) -> Optional[str]:
+    """검색어 → FTS MATCH 식 (단어별 2글자 조각 구문, 1글자 단어는 접두 검색, AND 결합)"""
+    terms = []
+    for word in query.split():
+        if len(word) == 1:
+            terms.append(word.encode("utf-8").hex() + "*")
+        else:
+            terms.append('"' + _gram_tokens(word, last_char=False) + '"')
+    return " AND ".join(terms) if terms else None
+
+
+def _file_digest(path: str) -> str:
+    """파일 내용 SHA-1 (1MB 단위로 읽음)"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _remove_file(path: str):
+    """파일 삭제 (없거나 지울 수 없으면 무시)"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _like_pattern(query: str) -> str:
+    """LIKE 부분 일치 패턴 (%, _ 이스케이프)"""
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class ReferenceSearchIndex:
+    """
+    자료사전 검색 색인 (FTS5)
+
+    사이드카 파일("<DB>.search")이 현재 DB와 일치하면 바로 열어 쓰고,
+    없거나 DB가 바뀌었으면 백그라운드 스레드에서 다시 만든다.
+    사이드카를 쓸 수 없는 위치면 메모리 색인으로 대체한다.
+    """
+
+    # 생성된 색인 (사이드카 교체 전에 같은 파일을 연 이전 색인의 연결을 닫기 위함)
+    _instances = weakref.WeakSet()
+
+    def __init__(self, db_path: str, background: bool = True, index_path: str = None):
+        self.db_path = db_path
+        self.index_path = index_path if index_path is not None else db_path + INDEX_SUFFIX
+        self._conn = None
+        self._lock = threading.Lock()  # 연결 교체/닫기와 검색 직렬화
+        self._ready = threading.Event()
+        ReferenceSearchIndex._instances.add(self)
+        if not FTS5_AVAILABLE:
+            return
+        if self._open_sidecar():
+            return
+        if background:
+            threading.Thread(target=self._build, name="ReferenceSearchIndex", daemon=True).start()
+        else:
+            self._build()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._ready.wait(timeout)
+
+    # ---------- 사이드카 ----------
+
+    def _source_stamp(self) -> dict:
+        stat = os.stat(self.db_path)
+        return {"version": INDEX_VERSION, "mtime": repr(stat.st_mtime), "size": str(stat.st_size)}
+
+    def _open_sidecar(self) -> bool:
+        """유효한 사이드카 색인이 있으면 열고 True"""
+        if not os.path.exists(self.index_path):
+            return False
+        conn = None
+        try:
+            conn = sqlite3.connect(self.index_path, check_same_thread=False)
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+            stamp = self._source_stamp()
+            if meta.get("version") != stamp["version"] or meta.get("size") != stamp["size"]:
+                conn.close()
+                return False
+            if meta.get("mtime") != stamp["mtime"]:
+                # 수정 시각만 바뀐 경우 (복사/덮어쓰기) 내용 해시가 같으면 재사용
+                if meta.get("sha1") != _file_digest(self.db_path):
+                    conn.close()
+                    return False
+                with conn:
+                    conn.execute("UPDATE meta SET value = ? WHERE key = 'mtime'", (stamp["mtime"],))
+        except (sqlite3.Error, OSError):
+            if conn is not None:
+                conn.close()
+            return False
+        self._attach(conn)
+        return True
+
+    def _attach(self, conn):
+        with self._lock:
+            self._conn = conn
+            self._ready.set()
+
+    def _detach(self):
+        """색인 연결 닫기 (이후 검색은 호출 측 LIKE 검색으로 대체)"""
+        with self._lock:
+            self._ready.clear()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _release_sidecar(self):
+        """같은 사이드카 파일을 연 다른 색인(이전 DB 기준)의 연결 닫기 — 열려 있으면 Windows에서 교체 불가"""
+        target = os.path.normcase(os.path.abspath(self.index_path))
+        for other in list(ReferenceSearchIndex._instances):
+            if other is not self and os.path.normcase(os.path.abspath(other.index_path)) == target:
+                other._detach()
+
+    def _build(self):
+        try:
+            stamp = self._source_stamp()
+            stamp["sha1"] = _file_digest(self.db_path)
+            conn = self._build_into(self.index_path + ".tmp", stamp)
+            if conn is None:
+                conn = self._build_into(":memory:", stamp)
+            self._attach(conn)
+        except (sqlite3.Error, OSError) as e:
+            print(f"[WARN] 자료사전 검색 색인 생성 실패: {e}")
+
+    def _build_into(self, path: str, stamp: dict):
+        """
+        path에 색인 생성 (파일이면 완성 후 사이드카 경로로 교체)
+
+        교체에 실패하면 다시 만들지 않고 완성된 색인을 메모리로 복사해 쓰며,
+        실패한 경우 모두 임시 파일을 남기지 않는다.
+
+        Returns:
+            색인 연결, 파일을 쓸 수 없으면 None
+        """
+        if path != ":memory:":
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+                conn = sqlite3.connect(path, check_same_thread=False)
+            except (sqlite3.Error, OSError):
+                return None
+        else:
+            conn = sqlite3.connect(path, check_same_thread=False)
+        try:
+            conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+            # 접두 색인: 1글자 검색어 (16진 2자리 = ASCII, 6자리 = 한글)
+            conn.execute("CREATE VIRTUAL TABLE ref_fts USING fts5(main, extra, prefix='2 6')")
+            source_rows = db_service.query(
+                self.db_path,
+                f"SELECT ID, {', '.join(PRIMARY_SEARCH_COLUMNS + SECONDARY_SEARCH_COLUMNS)} "
+                f"FROM {_TABLE} WHERE {_WHERE}",
+            )
+            split = len(PRIMARY_SEARCH_COLUMNS)
+
+            def rows():
+                for row_id, *values in source_rows:
+                    texts = [normalize_search_text(str(v)) if v is not None else "" for v in values]
+                    yield (
+                        row_id,
+                        _gram_tokens(" ".join(texts[:split])),
+                        _gram_tokens(" ".join(texts[split:])),
+                    )
+
+            conn.executemany("INSERT INTO ref_fts (rowid, main, extra) VALUES (?, ?, ?)", rows())
+            conn.execute("INSERT INTO ref_fts (ref_fts) VALUES ('optimize')")
+            conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", stamp.items())
+            conn.commit()
+        except sqlite3.Error:
+            conn.close()
+            if path == ":memory:":
+                raise
+            _remove_file(path)
+            return None
+        if path == ":memory:":
+            return conn
+
+        self._release_sidecar()
+        try:
+            conn.close()
+            os.replace(path, self.index_path)
+            return sqlite3.connect(self.index_path, check_same_thread=False)
+        except (sqlite3.Error, OSError):
+            return self._load_into_memory(path)
+
+    @staticmethod
+    def _load_into_memory(path: str):
+        """완성된 임시 색인 파일 → 메모리 색인 연결 (임시 파일 삭제, 실패 시 None)"""
+        memory = None
+        try:
+            source = sqlite3.connect(path)
+            try:
+                memory = sqlite3.connect(":memory:", check_same_thread=False)
+                source.backup(memory)
+            finally:
+                source.close()
+        except sqlite3.Error:
+            if memory is not None:
+                memory.close()
+            memory = None
+        _remove_file(path)
+        return memory
+
+    def search_ids(self, query: str) -> Optional[List[int]]:
+        """
+        검색어의 모든 일치 ID (순위순)
+
+        Returns:
+            ID 목록, 색인을 쓸 수 없으면 None (호출 측에서 LIKE 검색으로 대체)
+        """
+        if not self._ready.is_set():
+            return None
+        match = _match_query(normalize_search_text(query))
+        if match is None:
+            return None
+        with self._lock:
+            if self._conn is None:
+                return None
+            cursor = self._conn.execute(
+                "SELECT rowid FROM ref_fts WHERE ref_fts MATCH ? "
+                f"ORDER BY bm25(ref_fts, {PRIMARY_WEIGHT}, 1.0), rowid",
+                (match,),
+            )
+            return [r[0] for r in cursor]
+
+    def close(self):
+        self._detach()
+
+
+class ReferenceRowSource:
+    """
+    자료사전 행 공급자
+
+    전체 ID만 미리 읽고 (정렬 순서 = 행 번호), 행 내용은 요청된 페이지만 읽는다.
+    같은 DB 파일(수정 시각 동일)에 대해서는 get()으로 인스턴스를 공유한다.
+    """
+
+    _instances = {}
+
+    def __init__(self, db_path: str, page_size: int = PAGE_SIZE, max_pages: int = MAX_CACHED_PAGES,
+                 background_index: bool = True):
+        self.db_path = db_path
+        self.mtime = os.path.getmtime(db_path)
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self._ids = array("q", (
+            row[0]
+            for row in db_service.query(db_path, f"SELECT ID FROM {_TABLE} WHERE {_WHERE} ORDER BY ID")
+        ))
+        self._pages: "OrderedDict[int, List[Tuple]]" = OrderedDict()
+        self.search_index = ReferenceSearchIndex(db_path, background=background_index)
+
+    @classmethod
+    def get(cls, db_path: str) -> "ReferenceRowSource":
+        """DB 경로별 공유 인스턴스 (파일이 바뀌면 새로 생성)"""
+        source = cls._instances.get(db_path)
+        if source is None or source.mtime != os.path.getmtime(db_path):
+            if source is not None:
+                source.close()
+            source = cls(db_path)
+            cls._instances[db_path] = source
+        return source
+
+    def close(self):
+        self._pages.clear()
+        self.search_index.close()
+
+    def __len__(self):
+        return len(self._ids)
+
+    # ---------- 행 조회 ----------
+
+    def row(self, index: int) -> Tuple:
+        """행 튜플 (REFERENCE_COLUMNS 순서)"""
+        page_no, offset = divmod(index, self.page_size)
+        page = self._pages.get(page_no)
+        if page is None:
+            page = self._load_page(page_no)
+        else:
+            self._pages.move_to_end(page_no)
+        return page[offset]
+
+    def _load_page(self, page_no: int) -> List[Tuple]:
+        start = page_no * self.page_size
+        end = min(start + self.page_size, len(self._ids)) - 1
+        page = db_service.query(
+            self.db_path,
+            f"SELECT {_SELECT} FROM {_TABLE} WHERE {_WHERE} AND ID BETWEEN ? AND ? ORDER BY ID",
+            (self._ids[start], self._ids[end]),
+        )
+        self._pages[page_no] = page
+        if len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        return page
+
+    def row_of_id(self, row_id) -> int:
+        """ID → 행 번호 (없으면 -1)"""
+        pos = bisect_left(self._ids, row_id)
+        if pos < len(self._ids) and self._ids[pos] == row_id:
+            return pos
+        return -1
+
+    # ---------- 검색 ----------
+
+    def search(self, query: str) -> List[int]:
+        """
+        검색어의 모든 일치 행 번호 (순위순)
+
+        색인이 준비되어 있으면 단어별 부분 일치(AND)를 순위순으로,
+        아니면 search_rows()의 결과(행 순서)를 반환한다.
+        """
+        ids = self.search_index.search_ids(query)
+        if ids is None:
+            return self.search_rows(query)
+        rows = (self.row_of_id(row_id) for row_id in ids)
+        return [r for r in rows if r >= 0]
+
+    def search_rows(self, query: str) -> List[int]:
+        """검색어를 포함하는 행 번호 목록 (오름차순, 대소문자 무시)"""
+        query = normalize_search_text(query).strip()
+        if not query:
+            return []
+        id_rows = db_service.query(
+            self.db_path,
+            f"SELECT ID FROM {_TABLE} WHERE {_WHERE} "
+            f"AND lower({_SEARCH_EXPR}) LIKE ? ESCAPE '\\' ORDER BY ID",
+            (_like_pattern(query),),
+        )
+        rows = (self.row_of_id(r[0]) for r in id_rows)
+        return [r for r in rows if r >= 0]
+
+    def find_next(self, query: str, start_row: int = 0) -> Optional[int]:
+        """start_row부터 순환 검색하여 첫 일치 행 (없으면 None)"""
+        rows = self.search_rows(query)
+        if not rows:
+            return None
+        pos = bisect_left(rows, start_row)
+        return rows[pos] if pos < len(rows) else rows[0]
+
+
+# ============== 테스트 ==============
+if __name__ == "__main__":
+    import tempfile
+
+    path = os.path.join(tempfile.mkdtemp(), "ref.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        f"CREATE TABLE {_TABLE} (ID INTEGER PRIMARY KEY, "
+        + ", ".join(f"{c} TEXT" for c in REFERENCE_COLUMNS[1:]) + ")"
+    )
+    conn.execute(f"INSERT INTO {_TABLE} (ID, 품명) VALUES (0, '자료사전')")
+    conn.executemany(
+        f"INSERT INTO {_TABLE} (ID, 품명, 규격, 단위, CODE, 목록2) VALUES (?, ?, ?, ?, ?, ?)",
+        [(i, f"품목{i}", f"{i}sq", "m", f"C{i:05d}", "전선+관로" if i % 100 == 0 else "") for i in range(1, 1001)],
+    )
+    conn.commit()
+    conn.close()
+
+    import time
+
+    source = ReferenceRowSource(path, page_size=64, max_pages=4, background_index=False)
+    cases = [
+        (len(source), 1000, "전체 행 수 (자료사전 제목 행 제외)"),
+        (source.row(0)[1], "품목1", "첫 행"),
+        (source.row(999)[4], "C01000", "마지막 행"),
+        (len(source._pages), 2, "읽은 페이지만 캐시"),
+    ]
+    for i in range(0, 1000, 64):
+        source.row(i)
+    cases.append((len(source._pages), 4, "LRU 페이지 수 제한"))
+    cases.append((source.search_rows("전선 관로")[:3], [99, 199, 299], "'+' 공백 치환 검색"))
+    cases.append((source.find_next("c00500", 0), 499, "대소문자 무시 검색"))
+    cases.append((source.find_next("전선", 950), 999, "시작 행 이후 검색"))
+    cases.append((source.find_next("전선", 1000), 99, "순환 검색"))
+    cases.append((source.find_next("50%", 0), None, "LIKE 특수문자 이스케이프"))
+    cases.append((source.search_index.ready, FTS5_AVAILABLE, "검색 색인 준비"))
+    cases.append((source.search("품목12")[:2], [11, 119], "색인 검색 (부분 일치)"))
+    cases.append((source.search("관로 전선")[:2], [99, 199], "단어 AND 검색"))
+    cases.append((source.search("c01000"), [999], "CODE 검색"))
+    cases.append((source.search("관")[:3], [99, 199, 299], "1글자 검색어 (접두 검색)"))
+    cases.append((source.search("로")[:3], [99, 199, 299], "1글자 검색어 (단어 끝 글자)"))
+    source.close()
+
+    # 사이드카 재사용: 같은 DB면 다시 만들지 않음 (생성자에서 바로 준비)
+    cases.append((os.path.exists(path + INDEX_SUFFIX), FTS5_AVAILABLE, "사이드카 색인 파일 생성"))
+    index = ReferenceSearchIndex(path, background=False)
+    cases.append((index.ready and index.search_ids("관로 전선")[:2], FTS5_AVAILABLE and [100, 200], "사이드카 재사용"))
+    index.close()
+    # 수정 시각만 바뀜 → 해시 일치로 재사용
+    os.utime(path, (time.time() + 10, time.time() + 10))
+    index = ReferenceSearchIndex(path, background=True)
+    cases.append((index.ready, FTS5_AVAILABLE, "시각만 바뀐 DB → 해시 확인 후 재사용"))
+    index.close()
+    # 내용 변경 → 재생성
+    conn = sqlite3.connect(path)
+    conn.execute(f"UPDATE {_TABLE} SET 품명 = '새품명' WHERE ID = 5")
+    conn.commit()
+    conn.close()
+    index = ReferenceSearchIndex(path, background=False)
+    cases.append((index.search_ids("새품명"), FTS5_AVAILABLE and [5] or None, "DB 변경 → 색인 재생성"))
+
+    # 이전 DB 기준 색인이 사이드카를 연 채로 재생성 → 교체 전에 이전 연결 닫기
+    conn = sqlite3.connect(path)
+    conn.execute(f"UPDATE {_TABLE} SET 품명 = '다른품명' WHERE ID = 6")
+    conn.commit()
+    conn.close()
+    rebuilt = ReferenceSearchIndex(path, background=False)
+    cases.append(((index.ready, rebuilt.search_ids("다른품명")), (False, FTS5_AVAILABLE and [6] or None),
+                  "재생성 시 이전 사이드카 연결 닫기"))
+    index.close()
+    rebuilt.close()
+
+    class CountingIndex(ReferenceSearchIndex):
+        """색인 생성 대상 기록"""
+
+        def _build_into(self, target, stamp):
+            self.targets.append(target)
+            return super()._build_into(target, stamp)
+
+    # 사이드카 교체 실패 (같은 이름의 폴더) → 다시 만들지 않고 메모리로 복사, 임시 파일 삭제
+    blocked = os.path.join(os.path.dirname(path), "blocked.search")
+    os.makedirs(os.path.join(blocked, "x"))
+    CountingIndex.targets = []
+    index = CountingIndex(path, background=False, index_path=blocked)
+    cases.append(((index.search_ids("관로 전선") or [])[:2], FTS5_AVAILABLE and [100, 200] or [], "교체 실패 → 완성된 색인 사용"))
+    cases.append((CountingIndex.targets, FTS5_AVAILABLE and [blocked + ".tmp"] or [], "교체 실패 시 재생성 안 함"))
+    cases.append((os.path.exists(blocked + ".tmp"), False, "교체 실패 시 임시 파일 삭제"))
+    index.close()
+
+    # 색인 생성 실패 (자료사전 표 없음) → 임시 파일 삭제
+    empty_db = os.path.join(os.path.dirname(path), "empty.db")
+    sqlite3.connect(empty_db).close()
+    index = ReferenceSearchIndex(empty_db, background=False)
+    cases.append(((index.ready, os.path.exists(empty_db + INDEX_SUFFIX + ".tmp")), (False, False),
+                  "생성 실패 시 임시 파일 삭제"))
+    index.close()
+
+    print("=" * 60)
+    print("자료사전 행 공급자 테스트")
+    print("=" * 60)
+    for i, (result, expected, desc) in enumerate(cases, 1):
+        status = "✅" if result == expected else "❌"
+        print(f"{i:2d}. {status} {desc}: {result} (기대: {expected})")
@@ -116,17 +116,17 @@ def aggregate_sections_for_connections(
 
     total_sections = 0
 
+    row_count = tables.rowCount()
     for row in rows:
-        if row < 0 or row >= tables.rowCount():
+        if row < 0 or row >= row_count:
             continue
 
         formula_item = tables.item(row, 6)  # FORMULA 컬럼
         if not formula_item:
             continue
 
-        formula = formula_item.text().strip()
-        sections = count_sections(formula)
-        total_sections += sections
+        # 수식별 캐시: 같은 수식은 다시 해석하지 않음
+        total_sections += count_sections(formula_item.text().strip())
 
     # 총 접속선 길이
     total_length = wire_length * connection_count * total_sections
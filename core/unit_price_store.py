@@ -0,0 +1,447 @@
+# -*- coding: utf-8 -*-
+"""
+산출일위표 조각 저장소 (Unit Price Chunk Store)
+============================================
+산출목록 항목별 일위표를 JSON 파일 1개씩이 아니라 SQLite 파일 1개(WAL)에 보관
+
+기능:
+- (프로젝트, 항목명) 기본키 색인 → 행 이동마다 파일 열기 없음
+- 프로젝트 파일(.emx)이 열려 있으면 그 파일 안에 보관 (파일과 함께 이동, 이름 변경 무관)
+  프로젝트 파일이 없으면 조각 폴더의 공용 저장소(unit_price.db)에 프로젝트 이름별로 보관
+- 최근 사용 조각 LRU 캐시 (없는 항목도 캐시)
+- 쓰기 묶음 처리 (짧은 지연 후 트랜잭션 1회로 기록, 종료 시 자동 기록)
+- 기존 조각 폴더(<프로젝트>/<항목>.json)는 처음 접근 시 한 번 가져오기
+- 이웃 행 조각 미리 읽기 (백그라운드 스레드, 최신 요청만 처리)
+"""
+
+import atexit
+import json
+import os
+import re
+import sqlite3
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+STORE_FILE = "unit_price.db"
+UNSAVED_PROJECT = "_unsaved_session_"
+PROJECT_FILE_KEY = "_project_file_"  # 프로젝트 파일 안의 저장소는 프로젝트 구분 없이 이 키 사용
+MAX_CACHED_CHUNKS = 512
+FLUSH_DELAY = 0.5  # 초: 이 시간 동안 모인 저장 요청을 한 번에 기록
+FLUSH_BATCH = 64  # 대기 중인 저장이 이만큼 쌓이면 즉시 기록
+_PREFETCH_QUERY_LIMIT = 500  # SQLite 변수 개수 제한 대비 IN 목록 크기
+
+_UNSAFE_CHARS = re.compile(r'[\\/*?:"<>|]')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    project TEXT NOT NULL,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (project, name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS imported (
+    project TEXT PRIMARY KEY
+);
+"""
+
+_MISSING = object()
+
+
+@lru_cache(maxsize=4096)
+def safe_name(name: str) -> str:
+    """파일명에 쓸 수 없는 문자 → '_' (기존 조각 파일명과 같은 키)"""
+    return _UNSAFE_CHARS.sub("_", name).strip()
+
+
+def chunk_project_name(parent_tab) -> str:
+    """공용 저장소의 프로젝트 구분 이름 (프로젝트가 없으면 미저장 세션)"""
+    project_name = "-"
+    if parent_tab is not None and hasattr(parent_tab, "lbl_project_name"):
+        project_label = parent_tab.lbl_project_name.text()
+        if project_label.startswith("Project: "):
+            project_name = project_label.replace("Project: ", "").strip()
+
+    if not project_name or project_name == "-":
+        project_name = UNSAVED_PROJECT
+    return project_name
+
+
+class UnitPriceStore:
+    """
+    산출일위표 조각 저장소
+
+    get()은 캐시 → DB 순으로 읽고, put()은 캐시에 바로 반영한 뒤
+    FLUSH_DELAY 후(또는 FLUSH_BATCH개가 쌓이면) 한 트랜잭션으로 기록한다.
+
+    chunk_dir: 조각 폴더의 공용 저장소 (기존 JSON 조각 가져오기 포함)
+    path: 프로젝트 파일 안의 저장소 (프로젝트 이름 인자는 무시하고 PROJECT_FILE_KEY 사용)
+    """
+
+    def __init__(self, chunk_dir: str = None, max_cached: int = MAX_CACHED_CHUNKS, path: str = None):
+        if path is None:
+            os.makedirs(chunk_dir, exist_ok=True)
+            path = os.path.join(chunk_dir, STORE_FILE)
+            self.chunk_dir = chunk_dir
+            self.project_key = None
+        else:
+            self.chunk_dir = None
+            self.project_key = PROJECT_FILE_KEY
+        self.path = path
+        self.max_cached = max_cached
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+        self._cache: "OrderedDict[Tuple[str, str], Optional[list]]" = OrderedDict()
+        self._pending: Dict[Tuple[str, str], Optional[list]] = {}
+        self._timer = None
+        self._imported = {row[0] for row in self._conn.execute("SELECT project FROM imported")}
+        self._prefetch_executor = None
+        self._prefetch_generation = 0
+        _open_stores.add(self)
+
+    # ---------- 키 ----------
+
+    def _project(self, project: str) -> str:
+        if self.project_key is not None:
+            return self.project_key
+        return safe_name(project or "") or UNSAVED_PROJECT
+
+    def key(self, project: str, name: str) -> Optional[Tuple[str, str]]:
+        """(프로젝트, 항목명) → 저장 키 (항목명이 비면 None)"""
+        project = self._project(project)
+        name = safe_name(name or "")
+        if not name:
+            return None
+        return project, name
+
+    # ---------- 조회/저장 ----------
+
+    def get(self, project: str, name: str) -> Optional[list]:
+        """조각 데이터 (없으면 None, 반환 목록은 캐시와 공유되므로 수정하지 말 것)"""
+        key = self.key(project, name)
+        if key is None:
+            return None
+        with self._lock:
+            cached = self._cache.get(key, _MISSING)
+            if cached is not _MISSING:
+                self._cache.move_to_end(key)
+                return cached
+            self._import_legacy(key[0])
+            row = self._conn.execute(
+                "SELECT data FROM chunks WHERE project=? AND name=?", key
+            ).fetchone()
+            data = json.loads(row[0]) if row else None
+            self._remember(key, data)
+            return data
+
+    def put(self, project: str, name: str, data: Optional[list]):
+        """조각 저장 예약 (data가 비어 있으면 삭제)"""
+        key = self.key(project, name)
+        if key is None:
+            return
+        data = data or None
+        with self._lock:
+            self._import_legacy(key[0])
+            self._remember(key, data)
+            self._pending[key] = data
+            if len(self._pending) >= FLUSH_BATCH:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(FLUSH_DELAY, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def delete(self, project: str, name: str):
+        self.put(project, name, None)
+
+    def prefetch(self, project: str, names: List[str]):
+        """
+        캐시에 없는 조각을 백그라운드에서 미리 읽기
+
+        커서가 빠르게 움직이면 이전 요청은 건너뛰고 마지막 요청만 처리한다.
+        """
+        keys = [k for k in (self.key(project, name) for name in names) if k is not None]
+        if not keys:
+            return None
+        with self._lock:
+            self._prefetch_generation += 1
+            generation = self._prefetch_generation
+            if self._prefetch_executor is None:
+                self._prefetch_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="UnitPricePrefetch"
+                )
+        return self._prefetch_executor.submit(self._prefetch, keys, generation)
+
+    def _prefetch(self, keys, generation) -> int:
+        with self._lock:
+            if generation != self._prefetch_generation or self._conn is None:
+                return 0
+            missing = list(dict.fromkeys(k for k in keys if k not in self._cache))
+            if not missing:
+                return 0
+            self._import_legacy(missing[0][0])
+            found = {}
+            for start in range(0, len(missing), _PREFETCH_QUERY_LIMIT):
+                part = missing[start:start + _PREFETCH_QUERY_LIMIT]
+                names = [name for _, name in part]
+                rows = self._conn.execute(
+                    f"SELECT name, data FROM chunks WHERE project=? AND name IN ({','.join('?' * len(names))})",
+                    [part[0][0], *names],
+                )
+                found.update((name, data) for name, data in rows)
+            for key in missing:
+                data = found.get(key[1])
+                self._remember(key, json.loads(data) if data is not None else None)
+            return len(missing)
+
+    def flush(self) -> int:
+        """대기 중인 저장을 한 트랜잭션으로 기록, 기록한 항목 수 반환"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending or self._conn is None:
+                return 0
+            upserts = [
+                (project, name, json.dumps(data, ensure_ascii=False))
+                for (project, name), data in self._pending.items()
+                if data is not None
+            ]
+            deletes = [key for key, data in self._pending.items() if data is None]
+            with self._conn:
+                if upserts:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO chunks (project, name, data) VALUES (?, ?, ?)", upserts
+                    )
+                if deletes:
+                    self._conn.executemany("DELETE FROM chunks WHERE project=? AND name=?", deletes)
+            count = len(self._pending)
+            self._pending.clear()
+            return count
+
+    def names(self, project: str = None) -> List[str]:
+        """프로젝트의 저장된 항목명 목록"""
+        project = self._project(project)
+        with self._lock:
+            self.flush()
+            self._import_legacy(project)
+            return [
+                row[0] for row in self._conn.execute(
+                    "SELECT name FROM chunks WHERE project=? ORDER BY name", (project,)
+                )
+            ]
+
+    def copy_project(self, source: "UnitPriceStore", project: str = None) -> int:
+        """
+        다른 저장소의 프로젝트 조각 전체를 이 저장소로 복사 (같은 항목은 덮어씀)
+
+        처음 저장/다른 이름으로 저장 시 이전 저장소의 일위표를 새 프로젝트 파일로 옮길 때 사용
+        """
+        source_project = source._project(project)
+        target_project = self._project(project)
+        with source._lock:
+            source.flush()
+            source._import_legacy(source_project)
+            rows = [
+                (target_project, name, data)
+                for name, data in source._conn.execute(
+                    "SELECT name, data FROM chunks WHERE project=?", (source_project,)
+                )
+            ]
+        with self._lock:
+            self.flush()
+            for key in [k for k in self._cache if k[0] == target_project]:
+                del self._cache[key]
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO chunks (project, name, data) VALUES (?, ?, ?)", rows
+                )
+        return len(rows)
+
+    def clear_project(self, project: str = None):
+        """프로젝트의 조각 전체 삭제 (미저장 세션 초기화 등)"""
+        project = self._project(project)
+        with self._lock:
+            self.flush()
+            for key in [k for k in self._cache if k[0] == project]:
+                del self._cache[key]
+            with self._conn:
+                self._conn.execute("DELETE FROM chunks WHERE project=?", (project,))
+
+    def close(self):
+        with self._lock:
+            if self._prefetch_executor is not None:
+                self._prefetch_executor.shutdown(wait=False)
+                self._prefetch_executor = None
+            self.flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._cache.clear()
+
+    # ---------- 내부 ----------
+
+    def _remember(self, key, data):
+        self._cache[key] = data
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+
+    def _import_legacy(self, project: str):
+        """기존 JSON 조각 폴더 가져오기 (프로젝트당 1회, 원본 파일은 그대로 둠)"""
+        if project in self._imported or self.chunk_dir is None:
+            return
+        self._imported.add(project)
+        rows = []
+        project_dir = os.path.join(self.chunk_dir, project)
+        if os.path.isdir(project_dir):
+            for file_name in os.listdir(project_dir):
+                if not file_name.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(project_dir, file_name), "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                if data:
+                    rows.append((project, file_name[:-5], json.dumps(data, ensure_ascii=False)))
+        with self._conn:
+            # 이미 저장소에 있는 항목은 덮어쓰지 않음
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO chunks (project, name, data) VALUES (?, ?, ?)", rows
+            )
+            self._conn.execute("INSERT OR IGNORE INTO imported (project) VALUES (?)", (project,))
+
+
+# ============== 공용 인스턴스 ==============
+
+_stores: Dict[str, UnitPriceStore] = {}
+_stores_lock = threading.Lock()
+# 열려 있는 모든 저장소 (프로젝트 파일 저장소 포함, 종료 시 대기 중인 저장 기록)
+_open_stores: "weakref.WeakSet[UnitPriceStore]" = weakref.WeakSet()
+
+
+def get_unit_price_store(chunk_dir: str) -> UnitPriceStore:
+    """조각 폴더별 공용 저장소 (산출일위표 팝업/패널이 함께 사용)"""
+    key = os.path.normcase(os.path.abspath(chunk_dir))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = UnitPriceStore(chunk_dir)
+        return store
+
+
+def active_store(parent_tab, chunk_dir: str) -> UnitPriceStore:
+    """
+    탭에서 사용할 조각 저장소
+
+    프로젝트 파일이 열려 있으면 그 파일 안의 저장소(parent_tab.unit_price_chunks),
+    아니면 조각 폴더의 공용 저장소
+    """
+    store = getattr(parent_tab, "unit_price_chunks", None)
+    return store if store is not None else get_unit_price_store(chunk_dir)
+
+
+@atexit.register
+def _flush_all():
+    for store in list(_open_stores):
+        try:
+            store.flush()
+        except sqlite3.Error:
+            pass
+
+
+# ============== 테스트 ==============
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    chunk_dir = tempfile.mkdtemp()
+    legacy_dir = os.path.join(chunk_dir, "기존 프로젝트")
+    os.makedirs(legacy_dir)
+    with open(os.path.join(legacy_dir, "전선_2.5sq.json"), "w", encoding="utf-8") as f:
+        json.dump([{"mark": "", "list": "전선", "qty": "1.1"}], f, ensure_ascii=False)
+
+    store = UnitPriceStore(chunk_dir)
+    cases = [
+        (store.get("기존 프로젝트", "전선/2.5sq"), [{"mark": "", "list": "전선", "qty": "1.1"}], "기존 JSON 가져오기 (파일명 규칙 키)"),
+        (store.get("기존 프로젝트", "없는 항목"), None, "없는 항목"),
+        (store.get("", "아무거나"), None, "프로젝트 없음 → 미저장 세션"),
+        (store.key("P", "  "), None, "빈 항목명"),
+    ]
+
+    store.put("P", "배관", [{"list": "배관", "qty": "2"}])
+    cases.append((store.get("P", "배관"), [{"list": "배관", "qty": "2"}], "저장 직후 캐시 조회"))
+    cases.append((len(store._pending), 1, "저장 대기 (묶음 기록)"))
+    time.sleep(FLUSH_DELAY + 0.3)
+    cases.append((len(store._pending), 0, "지연 후 자동 기록"))
+
+    for i in range(FLUSH_BATCH):
+        store.put("P", f"항목{i}", [{"qty": str(i)}])
+    cases.append((len(store._pending), 0, "묶음 크기 도달 시 즉시 기록"))
+
+    store.delete("P", "배관")
+    store.flush()
+    reopened = UnitPriceStore(chunk_dir)
+    cases.append((reopened.get("P", "배관"), None, "삭제 기록"))
+    cases.append((reopened.get("P", "항목5"), [{"qty": "5"}], "다시 열기"))
+    cases.append((len(reopened.names("P")), FLUSH_BATCH, "항목 목록"))
+
+    # 가져온 뒤 원본 JSON을 고쳐도 저장소 내용 유지 (가져오기는 1회)
+    with open(os.path.join(legacy_dir, "전선_2.5sq.json"), "w", encoding="utf-8") as f:
+        json.dump([{"qty": "9"}], f)
+    cases.append((reopened.get("기존 프로젝트", "전선_2.5sq")[0]["qty"], "1.1", "가져오기 1회"))
+
+    reopened.clear_project("P")
+    cases.append((reopened.names("P"), [], "프로젝트 초기화"))
+
+    # 미리 읽기: 한 번의 조회로 캐시 채우기 (없는 항목도 캐시)
+    prefetching = UnitPriceStore(chunk_dir)
+    prefetching.put("R", "가", [{"qty": "1"}])
+    prefetching.flush()
+    prefetching._cache.clear()
+    prefetching.prefetch("R", ["가", "나", ""]).result()
+    cases.append((dict(prefetching._cache), {("R", "가"): [{"qty": "1"}], ("R", "나"): None}, "이웃 조각 미리 읽기"))
+    with prefetching._lock:  # 작업 스레드가 첫 요청을 처리하기 전에 두 요청 접수
+        stale = prefetching.prefetch("R", ["다"])
+        latest = prefetching.prefetch("R", ["라"])
+    cases.append(((stale.result(), latest.result()), (0, 1), "이전 요청 건너뜀"))
+    prefetching.close()
+
+    small = UnitPriceStore(chunk_dir, max_cached=2)
+    for name in ("a", "b", "c"):
+        small.get("Q", name)
+    cases.append((list(small._cache), [("Q", "b"), ("Q", "c")], "LRU 캐시 크기 제한"))
+    for s in (store, reopened, small):
+        s.close()
+
+    # 프로젝트 파일 안의 저장소: 공용 저장소에서 복사 → 파일 이름을 바꿔도 유지
+    shared = UnitPriceStore(chunk_dir)
+    shared.put("현장A", "배관", [{"qty": "3"}])
+    project_path = os.path.join(chunk_dir, "현장A.emx")
+    in_file = UnitPriceStore(path=project_path)
+    cases.append((in_file.copy_project(shared, "현장A"), 1, "공용 저장소 → 프로젝트 파일 복사"))
+    cases.append((in_file.get("이름 무관", "배관"), [{"qty": "3"}], "프로젝트 파일은 프로젝트 이름 무시"))
+    in_file.close()
+    renamed_path = os.path.join(chunk_dir, "현장B.emx")
+    os.replace(project_path, renamed_path)
+    renamed = UnitPriceStore(path=renamed_path)
+    cases.append((renamed.names(), ["배관"], "파일 이름 변경 후 유지"))
+    copied = UnitPriceStore(path=os.path.join(chunk_dir, "사본.emx"))
+    copied.copy_project(renamed)
+    cases.append((copied.get(None, "배관"), [{"qty": "3"}], "프로젝트 파일 → 다른 파일 복사"))
+    for s in (shared, renamed, copied):
+        s.close()
+
+    print("=" * 60)
+    print("산출일위표 조각 저장소 테스트")
+    print("=" * 60)
+    for i, (result, expected, desc) in enumerate(cases, 1):
+        status = "✅" if result == expected else "❌"
+        print(f"{i:2d}. {status} {desc}: {result} (기대: {expected})")
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
-from datetime import datetime
+import os
 from PyQt6.QtCore import Qt
 
+from core.unit_price_store import active_store, chunk_project_name
+from utils.debug_log import get_logger
+
+_log = get_logger("trigger")
+
 # 산출일위표 패널 호출에서 제외할 특수 산출목록 텍스트 목록
 EXCLUDED_ITEM_TEXTS = [
     "전등수량(갯수)산출",
@@ -9,6 +14,9 @@ EXCLUDED_ITEM_TEXTS = [
     "분전반 산출",
 ]
 
+# 커서 위/아래로 산출일위표를 미리 읽어 둘 행 수
+PREFETCH_ROWS = 8
+
 class CalculationUnitPriceTrigger:
     """산출일위표 팝업 자동 트리거 관리
     
@@ -19,9 +27,6 @@ class CalculationUnitPriceTrigger:
         self.parent_tab = parent_tab
         self.popup = None
         self._is_handling = False  # 재진입 방지 가드
-        # 절대 경로 로그 파일 설정
-        import os
-        self.debug_log = os.path.join(self.parent_tab.project_root, "debug_trigger.log")
 
     def handle_cell_selection(self, row, col):
         """특정 셀 선택 시 팝업 제어
@@ -38,11 +43,7 @@ class CalculationUnitPriceTrigger:
             item_col = self.parent_tab.EULJI_COLS["ITEM"]
             formula_col = self.parent_tab.EULJI_COLS["FORMULA"]
             
-            # [DEBUG] 로그 파일에 기록
-            try:
-                with open(self.debug_log, "a", encoding="utf-8") as f:
-                    f.write(f"[{datetime.now()}] Trigger: row={row}, col={col}, item_col={item_col}, formula_col={formula_col}\n")
-            except: pass
+            _log.debug("Trigger: row=%s, col=%s, item_col=%s, formula_col=%s", row, col, item_col, formula_col)
             
             # 산출목록(ITEM) 컬럼인 경우에만 산출일위표 표시
             if col == item_col:
@@ -55,10 +56,7 @@ class CalculationUnitPriceTrigger:
                 
                 # 제외 대상인 경우 산출일위표 표시하지 않음
                 if item_text in EXCLUDED_ITEM_TEXTS:
-                    try:
-                        with open(self.debug_log, "a", encoding="utf-8") as f:
-                            f.write(f"[{datetime.now()}] Excluded item '{item_text}' - skipping popup\n")
-                    except: pass
+                    _log.debug("Excluded item '%s' - skipping popup", item_text)
                     # 팝업이 표시 중이면 숨김
                     if self.popup and not self.popup.isHidden():
                         self.popup.hide_popup()
@@ -66,10 +64,7 @@ class CalculationUnitPriceTrigger:
                 
                 # 팝업 인스턴스 생성 (최초 1회)
                 if not self.popup:
-                    try:
-                        with open(self.debug_log, "a", encoding="utf-8") as f:
-                            f.write(f"[{datetime.now()}] Creating new CalculationUnitPricePopup instance...\n")
-                    except: pass
+                    _log.debug("Creating new CalculationUnitPricePopup instance...")
                     # 모듈화된 경로에서 임포트
                     from popups.calculation_unit_price_popup import CalculationUnitPricePopup
                     self.popup = CalculationUnitPricePopup(self.parent_tab.main_window)
@@ -77,26 +72,39 @@ class CalculationUnitPriceTrigger:
                 # prepare_show는 항상 ITEM 컬럼 기준으로 호출
                 self.popup.prepare_show(self.parent_tab, row, item_col)
                 self.popup.show_popup()
+                self._prefetch_neighbors(row, item_col)
                 
-                try:
-                    with open(self.debug_log, "a", encoding="utf-8") as f:
-                        f.write(f"[{datetime.now()}] Popup show requested for row {row} (clicked col={col})\n")
-                except: pass
+                _log.debug("Popup show requested for row %s (clicked col=%s)", row, col)
             else:
                 # '산출목록' 외 컬럼 클릭 시 자동으로 팝업 숨기기
                 if self.popup and not self.popup.isHidden():
                     self.popup.hide_popup()
-                    try:
-                        with open(self.debug_log, "a", encoding="utf-8") as f:
-                            f.write(f"[{datetime.now()}] Popup hidden - focused on other column (col={col})\n")
-                    except: pass
+                    _log.debug("Popup hidden - focused on other column (col=%s)", col)
         except Exception as e:
             import traceback
             error_msg = f"[ERROR] handle_cell_selection failed: {e}\n{traceback.format_exc()}"
-            try:
-                with open(self.debug_log, "a", encoding="utf-8") as f:
-                    f.write(error_msg + "\n")
-            except: pass
+            _log.error(error_msg)
             print(error_msg)
         finally:
             self._is_handling = False
+
+    def _prefetch_neighbors(self, row, item_col):
+        """커서 위/아래 PREFETCH_ROWS행의 산출일위표를 백그라운드에서 캐시로 읽기"""
+        table = getattr(self.parent_tab, "eulji_table", None)
+        if table is None or PREFETCH_ROWS <= 0:
+            return
+        names = []
+        for offset in range(1, PREFETCH_ROWS + 1):
+            for r in (row + offset, row - offset):
+                if r < 0 or r >= table.rowCount():
+                    continue
+                item = table.item(r, item_col)
+                text = item.text().strip() if item else ""
+                if text in EXCLUDED_ITEM_TEXTS:
+                    continue
+                # 항목명이 없는 행은 팝업과 같은 임시 이름 사용
+                names.append(text or f"unnamed_row_{r}")
+        store = active_store(
+            self.parent_tab, os.path.join(self.parent_tab.project_root, "data", "unit_price_chunks")
+        )
+        store.prefetch(chunk_project_name(self.parent_tab), names)
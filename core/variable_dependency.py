@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+변수 의존성 인덱스 (Variable Dependency Index)
+=========================================
+갑지 변수($H, $L)를 참조하는 을지 행을 추적
+
+기능:
+- 변수 → (공종, 행) 역인덱스
+- 행 삽입/삭제 시 행 번호 이동
+- 갑지 층고/천정 변경 시 재계산 대상 행만 조회
+- 아직 표시하지 않은 공종은 처음 조회할 때 구성 (ensure)
+"""
+
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+
+from utils.formula_parser import find_variables
+
+
+class VariableDependencyIndex:
+    """$H/$L 변수 → 참조 행 인덱스
+
+    행 번호는 공종별로 관리한다.
+    (표시 중인 공종은 을지 테이블 행, 그 외 공종은 eulji_data 리스트 인덱스)
+    """
+
+    def __init__(self):
+        self._rows: Dict[str, Dict[int, Tuple[str, ...]]] = {}  # {공종: {행: 변수}}
+        self._dependents: Dict[str, Dict[str, Set[int]]] = {}  # {변수: {공종: 행}}
+
+    def update_row(self, gongjong: str, row: int, formula: str):
+        """행의 산출수식 변경 반영"""
+        variables = find_variables(formula)
+        rows = self._rows.setdefault(gongjong, {})
+        old = rows.get(row, ())
+        if old == variables:
+            return
+
+        for var in old:
+            self._dependents.get(var, {}).get(gongjong, set()).discard(row)
+        if variables:
+            rows[row] = variables
+            for var in variables:
+                self._dependents.setdefault(var, {}).setdefault(gongjong, set()).add(
+                    row
+                )
+        else:
+            rows.pop(row, None)
+
+    def __contains__(self, gongjong: str) -> bool:
+        """공종이 인덱스에 구성되어 있는지 (변수 참조 행이 없어도 구성되었으면 True)"""
+        return gongjong in self._rows
+
+    def rebuild(self, gongjong: str, formulas: Iterable[Tuple[int, str]]):
+        """공종 전체 재구성 (formulas: (행, 산출수식) 목록)"""
+        self.clear(gongjong)
+        self._rows[gongjong] = {}
+        for row, formula in formulas:
+            if formula and "$" in formula:
+                self.update_row(gongjong, row, formula)
+
+    def ensure(self, gongjong: str, formulas: Callable[[], Iterable[Tuple[int, str]]]):
+        """공종이 아직 구성되지 않았으면 구성 (formulas: (행, 산출수식) 목록을 돌려주는 함수)"""
+        if gongjong not in self._rows:
+            self.rebuild(gongjong, formulas())
+
+    def shift_rows(self, gongjong: str, first: int, delta: int):
+        """
+        행 삽입/삭제 반영
+
+        Args:
+            first: 삽입/삭제 시작 행
+            delta: 삽입 행 수(+) 또는 삭제 행 수(-)
+        """
+        rows = self._rows.get(gongjong)
+        if not rows or delta == 0:
+            return
+
+        shifted = {}
+        for row, variables in rows.items():
+            if row < first:
+                shifted[row] = variables
+            elif delta < 0 and row < first - delta:
+                continue  # 삭제된 행
+            else:
+                shifted[row + delta] = variables
+
+        self.clear(gongjong)
+        self._rows[gongjong] = shifted
+        for row, variables in shifted.items():
+            for var in variables:
+                self._dependents.setdefault(var, {}).setdefault(gongjong, set()).add(
+                    row
+                )
+
+    def rows_for(self, gongjong: str, variables: Iterable[str]) -> List[int]:
+        """공종 내에서 변수를 참조하는 행 목록 (오름차순)"""
+        result = set()
+        for var in variables:
+            result |= self._dependents.get(var, {}).get(gongjong, set())
+        return sorted(result)
+
+    def clear(self, gongjong: str = None):
+        """인덱스 비우기 (공종 지정 시 해당 공종만)"""
+        if gongjong is None:
+            self._rows.clear()
+            self._dependents.clear()
+            return
+
+        self._rows.pop(gongjong, None)
+        for by_gongjong in self._dependents.values():
+            by_gongjong.pop(gongjong, None)
+
+
+# ============== 테스트 ==============
+if __name__ == "__main__":
+    index = VariableDependencyIndex()
+    index.rebuild(
+        "1. 전등공사",
+        [(0, "$Hm-1.8m"), (1, "2.3+5"), (2, "$L*2+$H"), (3, "$L*2")],
+    )
+
+    cases = [
+        (index.rows_for("1. 전등공사", ["$H"]), [0, 2], "$H 참조 행"),
+        (index.rows_for("1. 전등공사", ["$L"]), [2, 3], "$L 참조 행"),
+        (index.rows_for("2. 전열공사", ["$H"]), [], "다른 공종"),
+    ]
+
+    index.update_row("1. 전등공사", 1, "$H+1")
+    cases.append((index.rows_for("1. 전등공사", ["$H"]), [0, 1, 2], "행 수정"))
+
+    index.shift_rows("1. 전등공사", 1, 2)  # 1행 앞에 2행 삽입
+    cases.append((index.rows_for("1. 전등공사", ["$H"]), [0, 3, 4], "행 삽입"))
+
+    index.shift_rows("1. 전등공사", 0, -1)  # 0행 삭제
+    cases.append((index.rows_for("1. 전등공사", ["$H"]), [2, 3], "행 삭제"))
+
+    # 표시한 적 없는 공종 (프로젝트 열기 직후): 처음 조회할 때 저장 데이터로 구성
+    stored = {"3. 동력공사": ["10", "$H+1", "", "$L*2"]}
+    calls = []
+
+    def stored_formulas():
+        calls.append(1)
+        return enumerate(stored["3. 동력공사"])
+
+    cases.append(("3. 동력공사" in index, False, "미표시 공종은 구성 전"))
+    index.ensure("3. 동력공사", stored_formulas)
+    cases.append((index.rows_for("3. 동력공사", ["$H"]), [1], "미표시 공종 $H 참조 행"))
+    index.ensure("3. 동력공사", stored_formulas)
+    cases.append((len(calls), 1, "구성은 1회"))
+    index.rebuild("4. 전열공사", [(0, "5")])
+    cases.append((("4. 전열공사" in index, index.rows_for("4. 전열공사", ["$H"])), (True, []), "참조 없는 공종도 구성됨"))
+    index.clear()
+    cases.append(("3. 동력공사" in index, False, "초기화 후 다시 구성 대상"))
+
+    print("=" * 60)
+    print("변수 의존성 인덱스 테스트")
+    print("=" * 60)
+    for i, (result, expected, desc) in enumerate(cases, 1):
+        status = "✅" if result == expected else "❌"
+        print(f"{i:2d}. {status} {desc}: {result} (기대: {expected})")
@@ -5,7 +5,6 @@ Distribution Board Management Module
 """
 
 import os
-import sqlite3
 import json
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget, 
@@ -15,6 +14,7 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, QTimer, QEvent
 from PyQt6.QtGui import QFont, QColor
 
+from core.db_service import db_service
 from utils.column_settings import CleanStyleDelegate, setup_common_table, UNIT_PRICE_ROW_HEIGHT, UNIT_PRICE_COL_NAMES, UNIT_PRICE_COL_WIDTHS, UNIT_PRICE_COLS, NumericDelegate, CenterAlignmentDelegate
 
 class UnitPriceTable(QTableWidget):
@@ -161,12 +161,8 @@ class DistributionBoardPopup(QDialog):
             return
 
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # Sheet1 테이블에서 번호, 분전반 목록, 구분, 산출수량 로드
-            cursor.execute("SELECT 번호, [분전반 목록], 구분, 산출수량 FROM Sheet1")
-            rows = cursor.fetchall()
+            rows = db_service.query(self.db_path, "SELECT 번호, [분전반 목록], 구분, 산출수량 FROM Sheet1")
             
             self.table.setUpdatesEnabled(False)
             self.table.setRowCount(max(len(rows), 30)) # 최소 30행 보장
@@ -196,7 +192,6 @@ class DistributionBoardPopup(QDialog):
                     self.table.setItem(r, c, QTableWidgetItem(""))
             
             self.table.setUpdatesEnabled(True)
-            conn.close()
         except Exception as e:
             print(f"[ERROR] Failed to load distribution board data: {e}")
 
@@ -42,9 +42,64 @@ except ImportError:
 
 from database_reference_popup import DatabaseReferencePopup
 from utils.column_settings import CleanStyleDelegate
+from core.autocomplete import PrefixIndex, reference_product_index
+from core.db_service import db_service
 
 import sqlite3
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# 산출목록 행 이동 시 미리 읽어 둘 이웃 행 수 (위/아래 각각, 0이면 미리 읽기 안 함)
+TEMPLATE_PREFETCH_NEIGHBORS = 2
+
+MANUAL_MAPPING_PATH = r"D:\오아시스\data\manual_mapping.json"
+
+# 수동 매핑 파일 캐시: {경로: ((수정 시각, 크기), 매핑)}
+_manual_mapping_cache = {}
+# W 검증 색상/폰트 (QApplication 생성 후 최초 사용 시 한 번 만듦)
+_code_styles = None
+
+
+def load_manual_mapping(path):
+    """
+    수동 매핑 JSON ({"품명|규격": CODE}) — 파일 수정 시각/크기가 바뀔 때만 다시 읽음
+
+    파일이 없거나 읽을 수 없으면 빈 dict (반환값은 공유되므로 수정하지 말 것)
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        _manual_mapping_cache.pop(path, None)
+        return {}
+    stamp = (stat.st_mtime, stat.st_size)
+    cached = _manual_mapping_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            mapping = json.load(f)
+    except Exception as e:
+        print(f"[DEBUG] Error loading manual mappings: {e}")
+        mapping = {}
+    _manual_mapping_cache[path] = (stamp, mapping)
+    return mapping
+
+
+def _code_status_styles():
+    """W 검증 색상/폰트 공용 객체"""
+    global _code_styles
+    if _code_styles is None:
+        _code_styles = {
+            "ilwi": QColor(0, 0, 139),  # 일위대가 (i): 짙은 청색
+            "mismatch": QColor(255, 0, 0),  # 미매칭 (~): 빨강
+            "normal": QColor(0, 0, 0),  # 일반: 검정
+            "empty": QColor(128, 128, 0),  # 빈값 (**): 올리브/갈색
+            "bold_font": QFont("새굴림", 11, QFont.Weight.Bold),
+            "normal_font": QFont("새굴림", 11),
+        }
+    return _code_styles
 
 
 def evaluate_math(expression):
@@ -71,6 +126,75 @@ def evaluate_math(expression):
         return 0.0
 
 
+class LightingTemplateCache:
+    """
+    조명기구 템플릿 테이블 캐시 (프로세스 공용)
+
+    키: (DB 경로, 테이블명) — DB 수정 시각이 바뀌면 다시 읽는다.
+    값: DB 첫 줄을 제외한 표시 행 튜플 (W, CODE, 목록, 수식, 계), '계'는 미리 계산.
+    """
+
+    def __init__(self, max_tables: int = 512):
+        self.max_tables = max_tables
+        self._tables = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def get(self, db_path, table):
+        """템플릿 행 (테이블이 없으면 sqlite3.OperationalError)"""
+        mtime = os.path.getmtime(db_path)
+        key = (db_path, table)
+        with self._lock:
+            entry = self._tables.get(key)
+            if entry is not None and entry[0] == mtime:
+                self._tables.move_to_end(key)
+                return entry[1]
+        rows = self._load(db_path, table)
+        with self._lock:
+            self._tables[key] = (mtime, rows)
+            self._tables.move_to_end(key)
+            while len(self._tables) > self.max_tables:
+                self._tables.popitem(last=False)
+        return rows
+
+    def is_cached(self, db_path, table):
+        entry = self._tables.get((db_path, table))
+        return entry is not None and entry[0] == os.path.getmtime(db_path)
+
+    @staticmethod
+    def _load(db_path, table):
+        rows = db_service.query(db_path, f"SELECT * FROM [{table}]")
+        templates = []
+        # DB의 2번째 행부터 사용 (DB 기준 첫 줄 제외)
+        for row_data in rows[1:]:
+            texts = [str(val) if val is not None else "" for val in row_data[1:6]]
+            if len(texts) > 4:  # '계' 컬럼 자동 계산
+                texts[4] = f"{evaluate_math(texts[3]):g}"
+            templates.append(tuple(texts))
+        return tuple(templates)
+
+    def prefetch(self, db_path, tables):
+        """백그라운드 스레드에서 템플릿 미리 읽기 (캐시에 없는 테이블만)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="LightingTemplate")
+        for table in tables:
+            self._executor.submit(self._prefetch_one, db_path, table)
+
+    def _prefetch_one(self, db_path, table):
+        try:
+            if not self.is_cached(db_path, table):
+                self.get(db_path, table)
+        except (sqlite3.Error, OSError):
+            pass
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+
+
+lighting_templates = LightingTemplateCache()
+
+
 class LightingPowerDelegate(CleanStyleDelegate):
     """전등/전열 팝업 전용 델리게이트 - 편집 중 Tab 키 가로채기 지원"""
 
@@ -195,44 +319,28 @@ class LightingPowerPopup(QDialog):
             print(f"[DEBUG] Reference DB not found: {self.ref_db_path}")
             return
         try:
-            conn = sqlite3.connect(self.ref_db_path)
-            cursor = conn.cursor()
             # 사용자의 요청에 따라 'CODE' 컬럼을 매칭 포인트로 사용 (ID는 일련번호)
-            cursor.execute("SELECT CAST(CODE AS TEXT) FROM [자료사전]")
-            codes = cursor.fetchall()
+            codes = db_service.query(self.ref_db_path, "SELECT CAST(CODE AS TEXT) FROM [자료사전]")
             self.reference_codes = {
                 str(c[0]).strip() for c in codes if c[0] is not None
             }
-            conn.close()
             # print(f"[DEBUG] Loaded {len(self.reference_codes)} reference codes.")
         except Exception as e:
             print(f"[DEBUG] Error loading reference codes: {e}")
 
     def _load_reference_products(self):
         """[PHASE 3-4] 자료사전에서 품목/규격/CODE 데이터 로드 (자동 완성용)"""
+        self.reference_index = PrefixIndex(())
         self.reference_products = {}  # {품목: (규격, CODE)}
 
         if not os.path.exists(self.ref_db_path):
             return
 
         try:
-            conn = sqlite3.connect(self.ref_db_path)
-            cursor = conn.cursor()
-            # 품명, 규격, CODE 조회
-            cursor.execute("SELECT 품명, 규격, CODE FROM [자료사전]")
-            rows = cursor.fetchall()
-
-            for row in rows:
-                product, spec, code = row
-                if product:
-                    product_key = str(product).strip()
-                    # 품목 → (규격, CODE) 매핑
-                    self.reference_products[product_key] = (
-                        str(spec) if spec else "",
-                        str(code) if code else "",
-                    )
+            # 품명, 규격, CODE 정렬 색인 (같은 DB는 다른 팝업과 공유)
+            self.reference_index = reference_product_index(self.ref_db_path)
+            self.reference_products = self.reference_index.values
 
-            conn.close()
             print(
                 f"[DEBUG] Loaded {len(self.reference_products)} reference products for autocomplete."
             )
@@ -318,6 +426,7 @@ class LightingPowerPopup(QDialog):
         self.master_table.setItemDelegate(CleanStyleDelegate(self.master_table))
         self.master_table.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
         self.master_table.itemClicked.connect(self._on_master_item_clicked)
+        self.master_table.currentCellChanged.connect(self._on_master_current_changed)
 
         main_layout.addWidget(self.master_table)
 
@@ -584,23 +693,16 @@ class LightingPowerPopup(QDialog):
             return
 
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            # [OPTIMIZE] 성능 향상 PRAGMA
-            cursor.execute("PRAGMA journal_mode=WAL;")
-            cursor.execute("PRAGMA synchronous=NORMAL;")
-
+            # 공용 읽기 전용 연결 사용 (열 때마다 연결/PRAGMA 설정 없음)
             table_name = "조명기구목록"
-            cursor.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND (name='조명기구목록' OR name='조명기구목골');"
+            result = db_service.query_one(
+                self.db_path,
+                "SELECT name FROM sqlite_master WHERE type='table' AND (name='조명기구목록' OR name='조명기구목골');",
             )
-            result = cursor.fetchone()
             if result:
                 table_name = result[0]
 
-            cursor.execute(f"SELECT * FROM [{table_name}]")
-            rows = cursor.fetchall()
+            rows = db_service.query(self.db_path, f"SELECT * FROM [{table_name}]")
 
             # [OPTIMIZE] UI 업데이트 일시 중지
             self.master_table.setUpdatesEnabled(False)
@@ -651,8 +753,6 @@ class LightingPowerPopup(QDialog):
                 self.splitter.setSizes(
                     [left_width_target, total_width - left_width_target]
                 )
-
-            conn.close()
         except Exception as e:
             print(f"[DEBUG] Error loading master data: {e}")
 
@@ -684,9 +784,9 @@ class LightingPowerPopup(QDialog):
             # [Step 10] '계' 변경되었으므로 전체 합계 업데이트
             self._update_preview_sum()
 
-        # [NEW] CODE(1번) 또는 산출목록(2번) 변경 시 W 상태 재검증
+        # [NEW] CODE(1번) 또는 산출목록(2번) 변경 시 해당 행만 W 상태 재검증
         if col in [1, 2]:
-            self._verify_all_codes()
+            self._verify_code_row(item.row())
 
         # [PHASE 3-4] 산출목록(컬럼 2) 입력 시 자동 완성
         if col == 2:
@@ -819,22 +919,14 @@ class LightingPowerPopup(QDialog):
             project_folder = os.path.dirname(os.path.abspath(sys.argv[0]))
 
             # [NEW] 매핑 로드 우선순위: 프로젝트 → 원본 (병합)
-            manual_mappings = {}
-
-            # 1. 원본 매핑 로드
-            original_mapping_path = r"D:\오아시스\data\manual_mapping.json"
-            if os.path.exists(original_mapping_path):
-                with open(original_mapping_path, "r", encoding="utf-8") as f:
-                    manual_mappings = json.load(f)
+            # 1. 원본 매핑 로드 (파일이 바뀌었으면 다시 읽음)
+            manual_mappings = dict(load_manual_mapping(MANUAL_MAPPING_PATH))
 
             # 2. 프로젝트 매핑 로드 (원본 덮어쓰기 - 프로젝트 우선)
             project_mapping_path = os.path.join(
                 project_folder, "project_data", "manual_mapping.json"
             )
-            if os.path.exists(project_mapping_path):
-                with open(project_mapping_path, "r", encoding="utf-8") as f:
-                    project_mappings = json.load(f)
-                    manual_mappings.update(project_mappings)  # 프로젝트 값으로 덮어쓰기
+            manual_mappings.update(load_manual_mapping(project_mapping_path))
 
             if manual_mappings:
                 # 산출일위 테이블 순회하며 수동 매핑 적용
@@ -872,120 +964,148 @@ class LightingPowerPopup(QDialog):
         """[5단계] 모든 행의 CODE를 자료사전과 매칭 검증하고 W 컬럼 및 스타일 업데이트"""
         try:
             self.detail_table.blockSignals(True)
+            manual_mappings = self._verify_manual_mappings()
+            for row in range(self.detail_table.rowCount()):
+                self._apply_code_status(row, manual_mappings)
+            self.detail_table.blockSignals(False)
 
-            # 색상/폰트 정의
-            color_ilwi = QColor(0, 0, 139)  # 일위대가 (i): 짙은 청색
-            color_mismatch = QColor(255, 0, 0)  # 미매칭 (~): 빨강
-            color_normal = QColor(0, 0, 0)  # 일반: 검정
-            color_empty = QColor(128, 128, 0)  # 빈값 (**): 올리브/갈색
-
-            # [Step 12] 수동 매핑 데이터 로드 (전등수량 산출인 경우에만)
-            manual_mappings = {}
-            if self.item_name == "전등수량(갯수)산출":
-                mapping_path = r"D:\오아시스\data\manual_mapping.json"
-                if os.path.exists(mapping_path):
-                    try:
-                        with open(mapping_path, "r", encoding="utf-8") as f:
-                            manual_mappings = json.load(f)
-                    except Exception as e:
-                        print(f"[DEBUG] Error loading manual mappings: {e}")
-
-            # [NEW] 첫 행(0번 행, 기구명) 스타일 초기화 및 마커 제거
-            if self.detail_table.rowCount() > 0:
-                first_w = self.detail_table.item(0, 0)
-                if first_w:
-                    first_w.setText("")  # 마커 제거
-
-                # 첫 행 전체 스타일 초기화 (기본 검정, 볼드)
-                first_font = QFont("새굴림", 11, QFont.Weight.Bold)
-                for c in range(self.detail_table.columnCount()):
-                    it = self.detail_table.item(0, c)
-                    if it:
-                        it.setForeground(color_normal)
-                        it.setFont(first_font)
-
-            for row in range(1, self.detail_table.rowCount()):  # [FIX] 첫 행 제외
-                code_item = self.detail_table.item(row, 1)  # CODE 컬럼
-                w_item = self.detail_table.item(row, 0)  # W 컬럼
-                product_item = self.detail_table.item(row, 2)  # 산출목록
-
-                if not code_item:
-                    continue
-                if not w_item:
-                    w_item = QTableWidgetItem("")
-                    self.detail_table.setItem(row, 0, w_item)
-
-                code_val = code_item.text().strip()
+        except Exception as e:
+            print(f"[ERROR] Error in _verify_all_codes: {e}")
+            self.detail_table.blockSignals(False)
 
-                # [Step 12] 코드가 없는 경우 수동 매핑 사전 확인
-                if not code_val and self.item_name == "전등수량(갯수)산출":
-                    if product_item:
-                        spec_item = self.detail_table.item(row, 3)
-                        name_text = product_item.text().strip()
-                        spec_text = spec_item.text().strip() if spec_item else ""
-                        key_text = f"{name_text}|{spec_text}"
+    def _verify_code_row(self, row):
+        """한 행만 CODE 매칭 검증 (CODE/산출목록 편집 시)"""
+        try:
+            self.detail_table.blockSignals(True)
+            self._apply_code_status(row, self._verify_manual_mappings())
+            self.detail_table.blockSignals(False)
+        except Exception as e:
+            print(f"[ERROR] Error in _verify_code_row: {e}")
+            self.detail_table.blockSignals(False)
 
-                        if key_text in manual_mappings:
-                            code_val = manual_mappings[key_text]
-                            code_item.setText(code_val)
-                            print(
-                                f"[DEBUG] Auto-applied manual CODE for {key_text}: {code_val}"
-                            )
-
-                # 1. 일위대가 판정 (인터페이스 호출)
-                is_ilwi = self.is_ilwi_item(code_val)
-
-                # 2. W 상태 판정 규칙
-                if not code_val:
-                    # CODE 빈값
-                    w_status = "**"
-                    text_color = color_empty
-                else:
-                    matched = code_val in self.reference_codes
-                    if matched:
-                        # 매칭 성공
-                        w_status = "-i-" if is_ilwi else "--"
-                        text_color = color_ilwi if is_ilwi else color_normal
-                    else:
-                        # 매칭 실패
-                        w_status = "~i" if is_ilwi else "~*"
-                        text_color = color_ilwi if is_ilwi else color_mismatch
+    def _verify_manual_mappings(self):
+        """[Step 12] 수동 매핑 데이터 (전등수량 산출인 경우에만, 파일이 바뀔 때만 다시 읽음)"""
+        if self.item_name != "전등수량(갯수)산출":
+            return {}
+        return load_manual_mapping(MANUAL_MAPPING_PATH)
+
+    def _apply_code_status(self, row, manual_mappings):
+        """행 하나의 W 상태/스타일 적용 (신호 차단 상태에서 호출)"""
+        styles = _code_status_styles()
+
+        # [NEW] 첫 행(0번 행, 기구명) 스타일 초기화 및 마커 제거
+        if row == 0:
+            first_w = self.detail_table.item(0, 0)
+            if first_w:
+                first_w.setText("")  # 마커 제거
+
+            # 첫 행 전체 스타일 초기화 (기본 검정, 볼드)
+            for c in range(self.detail_table.columnCount()):
+                it = self.detail_table.item(0, c)
+                if it:
+                    it.setForeground(styles["normal"])
+                    it.setFont(styles["bold_font"])
+            return
 
-                # 3. UI 적용
-                w_item.setText(w_status)
-                w_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        code_item = self.detail_table.item(row, 1)  # CODE 컬럼
+        w_item = self.detail_table.item(row, 0)  # W 컬럼
+        product_item = self.detail_table.item(row, 2)  # 산출목록
 
-                # 폰트 및 색상 적용
-                bold_font = QFont("새굴림", 11, QFont.Weight.Bold)
-                normal_font = QFont("새굴림", 11)
+        if not code_item:
+            return
+        if not w_item:
+            w_item = QTableWidgetItem("")
+            self.detail_table.setItem(row, 0, w_item)
+
+        code_val = code_item.text().strip()
+
+        # [Step 12] 코드가 없는 경우 수동 매핑 사전 확인
+        if not code_val and manual_mappings and product_item:
+            spec_item = self.detail_table.item(row, 3)
+            name_text = product_item.text().strip()
+            spec_text = spec_item.text().strip() if spec_item else ""
+            key_text = f"{name_text}|{spec_text}"
+
+            if key_text in manual_mappings:
+                code_val = manual_mappings[key_text]
+                code_item.setText(code_val)
+                print(
+                    f"[DEBUG] Auto-applied manual CODE for {key_text}: {code_val}"
+                )
 
-                # 'i' 행은 항상 짙은 청색, 그 외는 상태 색상
-                current_row_color = color_ilwi if is_ilwi else text_color
+        # 1. 일위대가 판정 (인터페이스 호출)
+        is_ilwi = self.is_ilwi_item(code_val)
 
-                w_item.setForeground(current_row_color)
-                w_item.setFont(bold_font)
+        # 2. W 상태 판정 규칙
+        if not code_val:
+            # CODE 빈값
+            w_status = "**"
+            text_color = styles["empty"]
+        else:
+            matched = code_val in self.reference_codes
+            if matched:
+                # 매칭 성공
+                w_status = "-i-" if is_ilwi else "--"
+                text_color = styles["ilwi"] if is_ilwi else styles["normal"]
+            else:
+                # 매칭 실패
+                w_status = "~i" if is_ilwi else "~*"
+                text_color = styles["ilwi"] if is_ilwi else styles["mismatch"]
+
+        # 3. UI 적용
+        w_item.setText(w_status)
+        w_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        # 'i' 행은 항상 짙은 청색, 그 외는 상태 색상
+        current_row_color = styles["ilwi"] if is_ilwi else text_color
+
+        w_item.setForeground(current_row_color)
+        w_item.setFont(styles["bold_font"])
+
+        if product_item:
+            product_item.setForeground(current_row_color)
+            # 일위대가는 목록도 볼드 처리 (선택사항이나 가독성 위해 유지)
+            product_item.setFont(styles["bold_font"] if is_ilwi else styles["normal_font"])
+
+        # CODE 컬럼도 색상 동기화
+        code_item.setForeground(current_row_color)
 
-                if product_item:
-                    product_item.setForeground(current_row_color)
-                    # 일위대가는 목록도 볼드 처리 (선택사항이나 가독성 위해 유지)
-                    if is_ilwi:
-                        product_item.setFont(bold_font)
-                    else:
-                        product_item.setFont(normal_font)
+    def _on_master_item_clicked(self, item):
+        """마스터 클릭 시 구분별 상세 테이블 로드 및 산출수식 클릭 시 산출일위 팝업 표시"""
+        row_idx = item.row()
+        if row_idx == self.current_master_row:
+            # 행 전환(currentCellChanged)에서 이미 로드됨
+            lighting_item = self.master_table.item(row_idx, 0)
+            gubun_item = self.master_table.item(row_idx, 1)
+            if not lighting_item or not gubun_item or not gubun_item.text().strip():
+                return
+            lighting_name = lighting_item.text().strip()
+        else:
+            lighting_name = self._select_master_row(row_idx)
+            if lighting_name is None:
+                return
 
-                # CODE 컬럼도 색상 동기화
-                code_item.setForeground(current_row_color)
+        # 클릭 시 산출수식(2번 컬럼)으로 포커스 이동
+        if item.column() != 2:
+            self.master_table.setCurrentCell(row_idx, 2)
 
-            self.detail_table.blockSignals(False)
+        # 4. [NEW] 산출수식(2번 컬럼) 클릭 시 산출일위 팝업 표시
+        if item.column() == 2:
+            self._show_detail_popup(lighting_name)
 
-        except Exception as e:
-            print(f"[ERROR] Error in _verify_all_codes: {e}")
-            self.detail_table.blockSignals(False)
+    def _on_master_current_changed(self, row, col, prev_row, prev_col):
+        """방향키 등으로 마스터 행이 바뀌면 상세 테이블 로드 (팝업/포커스 이동 없음)"""
+        if row < 0 or row == self.current_master_row:
+            return
+        self._select_master_row(row)
 
-    def _on_master_item_clicked(self, item):
-        """마스터 클릭 시 구분별 상세 테이블 로드 및 산출수식 클릭 시 산출일위 팝업 표시"""
-        row_idx = item.row()
+    def _select_master_row(self, row_idx):
+        """
+        마스터 행 전환: 작업 중이던 상세 내역을 캐시에 저장하고 새 행의 상세 내역 로드
 
+        Returns:
+            조명기구명, 행이 비어 있으면 None
+        """
         # [Step 12] 1. 기존에 작업하던 상세 내역을 캐시에 저장 (항목 이동 시 소실 방지)
         if self.current_master_row != -1:
             prev_data = []
@@ -1005,23 +1125,33 @@ class LightingPowerPopup(QDialog):
 
         if not lighting_item or not gubun_item:
             print(f"[DEBUG] Selection contains empty items at row {row_idx}")
-            return
+            return None
 
         lighting_name = lighting_item.text().strip()
         gubun_text = gubun_item.text().strip()
         if not gubun_text:
-            return
-
-        # 클릭 시 산출수식(2번 컬럼)으로 포커스 이동
-        if item.column() != 2:
-            self.master_table.setCurrentCell(row_idx, 2)
+            return None
 
         # 3. detail_table에 데이터 로드 (캐시 또는 DB)
         self._load_detail_data(row_idx, lighting_name, gubun_text)
+        self._prefetch_neighbor_templates(row_idx)
+        return lighting_name
 
-        # 4. [NEW] 산출수식(2번 컬럼) 클릭 시 산출일위 팝업 표시
-        if item.column() == 2:
-            self._show_detail_popup(lighting_name)
+    def _prefetch_neighbor_templates(self, row_idx):
+        """이웃 마스터 행의 템플릿을 백그라운드에서 미리 읽기"""
+        if TEMPLATE_PREFETCH_NEIGHBORS <= 0 or not os.path.exists(self.db_path):
+            return
+        tables = []
+        for offset in range(1, TEMPLATE_PREFETCH_NEIGHBORS + 1):
+            for r in (row_idx + offset, row_idx - offset):
+                if r < 0 or r >= self.master_table.rowCount() or r in self.master_details_cache:
+                    continue
+                gubun_item = self.master_table.item(r, 1)
+                gubun_text = gubun_item.text().strip() if gubun_item else ""
+                if gubun_text and gubun_text not in tables:
+                    tables.append(gubun_text)
+        if tables:
+            lighting_templates.prefetch(self.db_path, tables)
 
     def _load_detail_data(self, row_idx, lighting_name, gubun_text):
         """detail_table에 데이터 로드 (캐시 우선, 없으면 DB에서 로드)"""
@@ -1050,55 +1180,48 @@ class LightingPowerPopup(QDialog):
             self._verify_all_codes()  # 검표 수행
             return
 
-        # 캐시에 없는 경우에만 DB에서 조명기구 템플릿 로드
+        # 캐시에 없는 경우에만 조명기구 템플릿 로드 (공용 템플릿 캐시 → DB)
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute(f"SELECT * FROM [{gubun_text}]")
-            rows = cursor.fetchall()
+            valid_rows = lighting_templates.get(self.db_path, gubun_text)
 
-            # DB의 2번째 행부터 출력하도록 (DB 기준 첫 줄 제외)
-            valid_rows = rows[1:] if len(rows) > 1 else []
-            
             # 최소 30행 보장 (데이터 + 1(헤더)가 30보다 작으면 30으로 설정)
             row_count = max(len(valid_rows) + 1, 30)
+            # 셀마다 itemChanged(W 검증/자동 완성)가 돌지 않도록 채우는 동안 신호 차단
+            self.detail_table.blockSignals(True)
             self.detail_table.setRowCount(row_count)
+            self.detail_table.clearContents()  # 이전 조명기구의 남은 행 제거
             self.detail_table.setShowGrid(True)
 
             # [1행] 타입별 조명기구명 입력
             header_item = QTableWidgetItem(lighting_name)
             self.detail_table.setItem(0, 2, header_item)  # 산출목록 컬럼
 
-            for r_idx, row_data in enumerate(valid_rows):
+            for r_idx, display_data in enumerate(valid_rows):
                 # 실제 데이터는 2행(Index 1)부터 입력
                 target_r = r_idx + 1
-                display_data = row_data[1:6]  # W, CODE, 목록, 수식, 계
-
-                for c_idx, val in enumerate(display_data):
-                    text = str(val) if val is not None else ""
-
-                    if c_idx == 4:  # '계' 컬럼 자동 계산
-                        formula = (
-                            str(display_data[3]) if display_data[3] is not None else ""
-                        )
-                        calc_val = evaluate_math(formula)
-                        text = f"{calc_val:g}"
 
+                # W, CODE, 목록, 수식, 계 ('계'는 캐시에서 미리 계산됨)
+                for c_idx, text in enumerate(display_data):
                     cell_item = QTableWidgetItem(text)
                     if c_idx in [0, 1, 4]:
                         cell_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
 
                     self.detail_table.setItem(target_r, c_idx, cell_item)
+            self.detail_table.blockSignals(False)
+
+            # 산출목록 자동 완성 (CODE 채움) — 셀 신호로 돌던 처리를 행별 1회로
+            for r in range(len(valid_rows) + 1):
+                product_item = self.detail_table.item(r, 2)
+                if product_item:
+                    self._auto_complete_product(r, product_item.text())
 
             # 모든 행에 일관된 높이 적용
             for r in range(row_count):
                 self.detail_table.setRowHeight(r, 22)
 
-            conn.close()
-
-            # 데이터 로딩 후 일괄 W 마커 검증
+            # 데이터 로딩 후 일괄 W 마커 검증 및 합계 갱신
             self._verify_all_codes()
+            self._update_preview_sum()
 
         except sqlite3.OperationalError:
             print(f"[WARNING] Table '{gubun_text}' not found in DB.")
@@ -1165,6 +1288,8 @@ class LightingPowerPopup(QDialog):
             raw_cache = saved_data.get("master_details_cache", {})
             # JSON은 키를 문자열로 저장하므로 다시 정수로 변환
             self.master_details_cache = {int(k): v for k, v in raw_cache.items()}
+            # 복구한 캐시를 현재 화면 내용으로 덮어쓰지 않도록 행 선택 초기화
+            self.current_master_row = -1
 
             # [Step 12] 4. 마지막 작업 상태(마스터 행) 복구
             ui_state = saved_data.get("ui_state", {})
@@ -1751,29 +1876,11 @@ class LightingPowerPopup(QDialog):
         if not product_text.strip():
             return
 
-        # 정확히 일치하는 품목 찾기
-        exact_match = None
-        partial_matches = []
-
-        search_text = product_text.strip().upper()
-
-        for product, (spec, code) in self.reference_products.items():
-            product_upper = product.upper()
+        # 정확히 일치하는 품목, 없으면 첫 번째 시작 일치 품목
+        product = self.reference_index.best_match(product_text)
 
-            # 정확한 일치
-            if product_upper == search_text:
-                exact_match = (product, spec, code)
-                break
-
-            # 부분 일치 (시작 일치)
-            if product_upper.startswith(search_text):
-                partial_matches.append((product, spec, code))
-
-        # 일치 결과 적용
-        match_found = exact_match or (partial_matches[0] if partial_matches else None)
-
-        if match_found:
-            product, spec, code = match_found
+        if product is not None:
+            spec, code = self.reference_products[product]
 
             # CODE 자동 입력 (컬럼 1)
             if code:
@@ -1791,16 +1898,7 @@ class LightingPowerPopup(QDialog):
         if not partial_text.strip():
             return []
 
-        search_text = partial_text.strip().upper()
-        suggestions = []
-
-        for product in self.reference_products.keys():
-            if product.upper().startswith(search_text):
-                suggestions.append(product)
-                if len(suggestions) >= 10:
-                    break
-
-        return suggestions
+        return self.reference_index.complete(partial_text, 10)
 
     def _drag_enter_event(self, event):
         """[PHASE 3-5] 드래그 진입 이벤트: .piece 파일 감지"""
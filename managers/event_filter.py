@@ -2,6 +2,12 @@
 from PyQt6.QtCore import Qt, QObject, QEvent, QTimer
 from PyQt6.QtWidgets import QApplication, QTableWidget, QWidget, QTableWidgetItem
 
+from ui.eulji_table import EuljiTableWidget, ensure_item
+from utils.debug_log import TAB_LOG, get_logger
+from utils.formula_parser import FormulaLineBuffer
+
+_logger = get_logger("event_filter", TAB_LOG)
+
 
 class TableEventFilter(QObject):
     """테이블 키 이벤트 필터"""
@@ -13,7 +19,10 @@ class TableEventFilter(QObject):
         super().__init__()
         self.parent_tab = parent_tab
         TableEventFilter._instance_count += 1
-        self._log_file = "tab_debug.log"
+
+        # 산출수식 연속입력 버퍼 (셀이 바뀌면 다시 계산)
+        self._formula_line = FormulaLineBuffer(max_bytes=self.FORMULA_MAX_BYTES)
+        self._formula_line_cell = None
         self._log(
             f"TableEventFilter initialized. Instance count: {TableEventFilter._instance_count}"
         )
@@ -25,15 +34,8 @@ class TableEventFilter(QObject):
             self._log("Event filter installed on QApplication")
 
     def _log(self, msg):
-        """파일에 디버그 로그 기록"""
-        try:
-            import datetime
-
-            with open(self._log_file, "a", encoding="utf-8") as f:
-                ts = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
-                f.write(f"[{ts}] {msg}\n")
-        except:
-            pass
+        """디버그 로그 기록 (tab_debug.log, 백그라운드 기록)"""
+        _logger.debug(msg)
 
     def eventFilter(self, obj, event):
         try:
@@ -157,7 +159,7 @@ class TableEventFilter(QObject):
                 target_table = None
                 curr = obj
                 while curr and isinstance(curr, QObject):
-                    if isinstance(curr, QTableWidget):
+                    if isinstance(curr, (QTableWidget, EuljiTableWidget)):
                         target_table = curr
                         break
                     curr = curr.parent() if hasattr(curr, "parent") else None
@@ -283,24 +285,24 @@ class TableEventFilter(QObject):
     def _handle_formula_enter(self, table, row, col):
         """[Phase 1-2] 산출수식 Enter 연속입력 처리"""
         try:
-            from utils.formula_parser import calc_byte_length
-
             formula_item = table.item(row, col)
             if not formula_item:
                 return
 
             current_text = formula_item.text().strip()
 
-            # 현재 텍스트에서 숫자 추출하여 현재 값 확인
-            from utils.formula_parser import parse_formula
-
-            current_value = parse_formula(current_text)
+            # 같은 셀에서 이어 입력한 경우 추가된 부분만 바이트 수 계산
+            cell = (id(table), row, col)
+            if cell != self._formula_line_cell:
+                self._formula_line_cell = cell
+                self._formula_line.reset(current_text)
+            else:
+                self._formula_line.sync(current_text)
 
             # "+" 추가하여 연속입력 준비
-            new_text = current_text + "+" if current_text else ""
-            new_byte_len = calc_byte_length(new_text)
+            suffix = "+" if current_text else ""
 
-            if new_byte_len > self.FORMULA_MAX_BYTES:
+            if not self._formula_line.fits(suffix):
                 # 40byte 초과: 다음 행으로 이동하여 이어서 입력
                 next_row = row + 1
 
@@ -317,12 +319,10 @@ class TableEventFilter(QObject):
                 if not next_item or not next_item.text().strip():
                     if current_item_text:
                         # 새 행에 산출목록 복사
-                        if not next_item:
-                            next_item = QTableWidgetItem()
-                            table.setItem(next_row, item_col, next_item)
-                        next_item.setText(current_item_text)
+                        ensure_item(table, next_row, item_col).setText(current_item_text)
 
                 # 다음 행의 FORMULA 컬럼으로 포커스 이동
+                self._formula_line_cell = None
                 table.setCurrentCell(next_row, col)
                 table.editItem(table.item(next_row, col))
 
@@ -330,7 +330,8 @@ class TableEventFilter(QObject):
                 # 실제 데이터는 사용자가 입력 후 Enter를 누를 때 처리
             else:
                 # 40byte 이내: 같은 셀에 "+" 추가하고 계속 입력
-                formula_item.setText(new_text)
+                self._formula_line.append(suffix)
+                formula_item.setText(self._formula_line.text)
                 table.setCurrentCell(row, col)
                 table.editItem(formula_item)  # 편집 상태 유지
 
@@ -485,10 +486,7 @@ class TableEventFilter(QObject):
                     else ""
                 },
             )
-            formula_item = table.item(current_row, formula_col)
-            if not formula_item:
-                formula_item = QTableWidgetItem()
-                table.setItem(current_row, formula_col, formula_item)
+            formula_item = ensure_item(table, current_row, formula_col)
             formula_item.setText("1@")
 
             # 계(TOTAL)를 0으로 설정
@@ -502,10 +500,7 @@ class TableEventFilter(QObject):
                     else ""
                 },
             )
-            total_item = table.item(current_row, total_col)
-            if not total_item:
-                total_item = QTableWidgetItem()
-                table.setItem(current_row, total_col, total_item)
+            total_item = ensure_item(table, current_row, total_col)
             total_item.setText("")
 
             # 다음 행으로 이동
@@ -522,10 +517,7 @@ class TableEventFilter(QObject):
     def _handle_ctrl_number(self, table, num: int):
         """[Phase 2-3] Ctrl+N - 위로 N줄의 구간을 합산하여 접속선 산출"""
         try:
-            from core.section_connection import (
-                calculate_section_connection,
-                create_connection_item,
-            )
+            from core.section_connection import aggregate_sections_for_connections
 
             current_row = table.currentRow()
             if current_row < 0:
@@ -538,57 +530,36 @@ class TableEventFilter(QObject):
                 self._log(f"합산할 행이 없음: 현재행={current_row}, N={num}")
                 return
 
-            # 구간 계산
-            total_sections = 0
-            for row in rows_to_sum:
-                formula_item = table.item(row, 6)  # FORMULA 컬럼
-                if formula_item and formula_item.text().strip():
-                    from utils.formula_parser import count_sections
-
-                    sections = count_sections(formula_item.text())
-                    total_sections += sections
+            # 구간 합산 + 접속선 계산 (수식별 캐시 사용)
+            conn_info = aggregate_sections_for_connections(table, rows_to_sum)
+            total_sections = conn_info["sections"]
 
             if total_sections == 0:
                 self._log("합산된 구간이 없음")
                 return
 
-            # 접속선 계산
-            conn_info = calculate_section_connection(f"0.2*2*{total_sections}")
-
             # 현재 행에 접속선 데이터 입력
             self.parent_tab.record_undo(table, "edit", current_row, {})
             table.blockSignals(True)
 
             # 산출목록
             item_col = self.parent_tab.EULJI_COLS.get("ITEM", 5)
-            item = table.item(current_row, item_col)
-            if not item:
-                item = QTableWidgetItem()
-                table.setItem(current_row, item_col, item)
+            item = ensure_item(table, current_row, item_col)
             item.setText("접속선")
 
             # 산출수식
             formula_col = self.parent_tab.EULJI_COLS.get("FORMULA", 6)
-            formula = table.item(current_row, formula_col)
-            if not formula:
-                formula = QTableWidgetItem()
-                table.setItem(current_row, formula_col, formula)
+            formula = ensure_item(table, current_row, formula_col)
             formula.setText(conn_info["formula"])
 
             # 계(TOTAL)
             total_col = self.parent_tab.EULJI_COLS.get("TOTAL", 7)
-            total = table.item(current_row, total_col)
-            if not total:
-                total = QTableWidgetItem()
-                table.setItem(current_row, total_col, total)
+            total = ensure_item(table, current_row, total_col)
             total.setText(str(conn_info["total_length"]))
 
             # 단위
             unit_col = self.parent_tab.EULJI_COLS.get("UNIT", 8)
-            unit = table.item(current_row, unit_col)
-            if not unit:
-                unit = QTableWidgetItem()
-                table.setItem(current_row, unit_col, unit)
+            unit = ensure_item(table, current_row, unit_col)
             unit.setText("m")
 
             table.blockSignals(False)
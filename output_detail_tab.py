@@ -56,23 +56,35 @@ from utils.column_settings import (
 from utils.grid_clipboard import setup_clipboard_handler
 # from lighting_power_manager import LightingPowerManager # Removed to prevent circular import, imported locally in __init__
 
-from ui.eulji_table import EuljiTableWidget
+from ui.eulji_table import EuljiTableWidget, ensure_item
 from ui.gapji_table import GapjiTableWidget
 from ui.side_panel import GongjongListPanel
 from ui.eulji_menu import EuljiCategoryMenu
+from core.eulji_store import EuljiStore
+from core.project_store import PROJECT_EXT, PROJECT_FILTER, ProjectStore
+from core.unit_price_store import (
+    UNSAVED_PROJECT,
+    UnitPriceStore,
+    active_store,
+    chunk_project_name,
+    get_unit_price_store,
+)
 from core.unit_price_trigger import CalculationUnitPriceTrigger
+from core.variable_dependency import VariableDependencyIndex
 from managers.event_filter import TableEventFilter
+from utils.debug_log import TAB_LOG, get_logger
+from utils.formula_parser import (
+    DEFAULT_VARIABLES,
+    find_variables,
+    parse_formula,
+    substitute_variables,
+)
 
-# [DEBUG] Module-level log to confirm import
-try:
-    with open("tab_debug.log", "a", encoding="utf-8") as _f:
-        import datetime as _dt
+_log = get_logger("output_detail_tab")
+_tab_log = get_logger("output_detail_tab.tab", TAB_LOG)
 
-        _f.write(
-            f"[{_dt.datetime.now().strftime('%H:%M:%S')}] output_detail_tab.py module loaded with new modular structure\n"
-        )
-except:
-    pass
+# [DEBUG] Module-level log to confirm import
+_tab_log.debug("output_detail_tab.py module loaded with new modular structure")
 
 
 class OutputDetailTab:
@@ -177,10 +189,21 @@ class OutputDetailTab:
         )
 
         # 데이터 저장소
-        self.eulji_data = {}
+        self.eulji_data = EuljiStore()
         self.eulji_results = {}
         self.eulji_row_details = {}
 
+        # [NEW] 프로젝트 파일 (SQLite, 변경 행만 저장)
+        self.project_store = None
+        # 프로젝트 파일 안의 산출일위표 조각 저장소 (파일이 없으면 공용 저장소 사용)
+        self.unit_price_chunks = None
+
+        # [NEW] $H/$L 변수 → 참조 행 인덱스 (갑지 층고/천정 변경 시 해당 행만 재계산)
+        self.variable_index = VariableDependencyIndex()
+        self._current_variables = dict(DEFAULT_VARIABLES)
+        # [NEW] 공종명 → 갑지 행 인덱스 (_find_gapji_row에서 검증 후 사용)
+        self._gapji_row_index = {}
+
         # 실행 취소(Undo) 스택
         self.undo_stack = []
 
@@ -230,15 +253,19 @@ class OutputDetailTab:
                 print(f"[DEBUG] Cleaning up unsaved chunks: {unsaved_dir}")
                 shutil.rmtree(unsaved_dir)
                 os.makedirs(unsaved_dir, exist_ok=True)
+            get_unit_price_store(os.path.dirname(unsaved_dir)).clear_project(UNSAVED_PROJECT)
         except Exception as e:
             print(f"[WARN] Failed to cleanup unsaved chunks: {e}")
 
     def reset_internal_data(self):
         """새로운 공종(시트) 로드 시 내부 데이터 초기화"""
         print(f"[DEBUG] OutputDetailTab: Resetting internal data...")
-        self.eulji_data = {}
+        self.eulji_data = EuljiStore()
         self.eulji_results = {}
         self.eulji_row_details = {}
+        self.variable_index.clear()
+        self._current_variables = dict(DEFAULT_VARIABLES)
+        self._gapji_row_index = {}
         self.current_row = -1
         self.current_gongjong = ""
         self.undo_stack = []
@@ -273,8 +300,7 @@ class OutputDetailTab:
             if "eulji_items" in template:
                 for item in template["eulji_items"]:
                     gongjong = template.get("gongjong", "000. 기초작업")
-                    if gongjong not in self.eulji_data:
-                        self.eulji_data[gongjong] = []
+                    columns = self.eulji_data.columns(gongjong)
 
                     # 행 데이터 구성
                     row_data = {
@@ -289,12 +315,12 @@ class OutputDetailTab:
                         "unit": item.get("unit", ""),
                         "remark": item.get("remark", ""),
                     }
-                    self.eulji_data[gongjong].append(row_data)
+                    columns.append_row(row_data)
 
                     # 일위대가 데이터 저장
                     if item.get("unit_price", {}).get("enabled", False):
                         unit_items = item.get("unit_price", {}).get("items", [])
-                        row_idx = len(self.eulji_data[gongjong]) - 1
+                        row_idx = len(columns) - 1
                         chunk_file = os.path.join(
                             "data", "unit_price_chunks", f"{gongjong}_{row_idx}.json"
                         )
@@ -319,8 +345,6 @@ class OutputDetailTab:
             for item in items:
                 qty_str = item.get("qty", "0")
                 try:
-                    from utils.formula_parser import parse_formula
-
                     qty = parse_formula(qty_str)
                 except:
                     qty = 0.0
@@ -427,7 +451,7 @@ class OutputDetailTab:
         """
 
         for menu_name, shortcut_key, callback_name in [
-            ("파일(F)", "F", None),
+            ("파일(F)", "F", "_show_file_menu"),
             ("편집(E)", "E", None),
             ("보기(V)", "V", None),
             ("도구(T)", "T", None),
@@ -678,6 +702,9 @@ class OutputDetailTab:
         )
         # [NEW] 더블 클릭 연결
         self.eulji_table.cellDoubleClicked.connect(self._on_eulji_double_clicked)
+        # [NEW] 행 삽입/삭제 시 변수 인덱스 행 번호 이동
+        self.eulji_table.model().rowsInserted.connect(self._on_eulji_rows_inserted)
+        self.eulji_table.model().rowsRemoved.connect(self._on_eulji_rows_removed)
         self.eulji_splitter.addWidget(self.eulji_table)
 
         # 전등/전열 산출공종 우측 패널 추가
@@ -1139,6 +1166,10 @@ class OutputDetailTab:
 
                     self.gapji_table.blockSignals(False)
 
+        elif column in (self.HEIGHT_COL, self.CEILING_COL):
+            # [NEW] 층고($H)/천정($L) 변경 → 참조 행만 재계산
+            self._on_gapji_variable_changed(row, column)
+
     def on_gapji_cell_clicked(self, row, column):
         """갑지 테이블 셀 클릭 시"""
         pass
@@ -1156,13 +1187,7 @@ class OutputDetailTab:
         
         try:
             print(f"[DEBUG] CELL CLICKED: row={row}, col={column}")
-            try:
-                from datetime import datetime
-                log_path = os.path.join(self.project_root, "debug_trigger.log")
-                with open(log_path, "a", encoding="utf-8") as f:
-                    f.write(f"[{datetime.now()}] on_eulji_cell_clicked: row={row}, col={column}\n")
-            except:
-                pass
+            _log.debug("on_eulji_cell_clicked: row=%s, col=%s", row, column)
 
             # 해당 행의 산출목록(ITEM) 텍스트 확인
             item_col = self.EULJI_COLS["ITEM"]
@@ -1224,7 +1249,7 @@ class OutputDetailTab:
 
                 curr = focus_w
                 while curr:
-                    if isinstance(curr, QTableWidget):
+                    if isinstance(curr, (QTableWidget, EuljiTableWidget)):
                         target_table = curr
                         break
                     curr = curr.parent()
@@ -1234,8 +1259,7 @@ class OutputDetailTab:
             self.reference_popup.exec()
 
         except Exception as e:
-            with open("tab_debug.log", "a", encoding="utf-8") as f:
-                f.write(f"[ERROR] _show_reference_popup failed: {e}\n")
+            _tab_log.error("[ERROR] _show_reference_popup failed: %s", e)
             QMessageBox.critical(
                 self.main_window, "오류", f"자료사전을 열 수 없습니다: {e}"
             )
@@ -1253,46 +1277,131 @@ class OutputDetailTab:
         try:
             if column == self.EULJI_COLS["FORMULA"]:
                 # 산출수식 변경 시 계산 (새로운 파서 사용)
+                # 수식을 지운 셀은 item이 None (계도 다시 계산해 비움)
                 formula_item = self.eulji_table.item(row, column)
-                if formula_item:
-                    formula = formula_item.text().strip()
-                    try:
-                        # [Phase 1-1] 새로운 파서 사용: 문자 포함 수식 지원
-                        from utils.formula_parser import parse_formula
+                formula = formula_item.text().strip() if formula_item else ""
+                self.variable_index.update_row(self.current_gongjong, row, formula)
+                try:
+                    # [Phase 1-1] 새로운 파서 사용: 문자 포함 수식 지원
+                    result = self._evaluate_eulji_formula(formula)
 
-                        result = parse_formula(formula)
-
-                        self.eulji_table.blockSignals(True)
-                        total_item = self.eulji_table.item(
-                            row, self.EULJI_COLS["TOTAL"]
-                        )
-                        if not total_item:
-                            total_item = QTableWidgetItem()
-                            self.eulji_table.setItem(
-                                row, self.EULJI_COLS["TOTAL"], total_item
-                            )
-
-                        # 결과가 0이 아니거나 수식이 있으면 표시
-                        if result != 0 or formula.strip():
-                            # 소수점 정리 (불필요한 .0 제거)
-                            if result == int(result):
-                                total_item.setText(str(int(result)))
-                            else:
-                                total_item.setText(str(result))
-                        else:
-                            total_item.setText("")
-                        self.eulji_table.blockSignals(False)
-                    except Exception as e:
-                        print(f"[WARN] 수식 계산 실패: {formula} -> {e}")
-                        self._clear_eulji_total(row)
+                    self.eulji_table.blockSignals(True)
+                    total_item = ensure_item(self.eulji_table, row, self.EULJI_COLS["TOTAL"])
+                    total_item.setText(self._format_eulji_total(result, formula))
+                    self.eulji_table.blockSignals(False)
+                except Exception as e:
+                    print(f"[WARN] 수식 계산 실패: {formula} -> {e}")
+                    self._clear_eulji_total(row)
 
             # [성능 최적화] 즉시 저장 대신 타이머 시작 (300ms 후 실행)
+            # 저장 시 수정된 행만 저장본에 반영되고 자재 집계도 해당 행만 갱신됨
             if hasattr(self, "save_timer"):
                 self.save_timer.start(300)
 
         except Exception as e:
             print(f"[ERROR] on_eulji_cell_changed: {e}")
 
+    def _evaluate_eulji_formula(self, formula, variables=None):
+        """산출수식 계산 ($H/$L 참조 시 갑지 변수 대입)"""
+        if find_variables(formula):
+            formula = substitute_variables(
+                formula,
+                variables if variables is not None else self._current_variables,
+            )
+        return parse_formula(formula)
+
+    def _format_eulji_total(self, result, formula):
+        """계 컬럼 표시 텍스트 (결과가 0이 아니거나 수식이 있으면 표시)"""
+        if result != 0 or formula.strip():
+            # 소수점 정리 (불필요한 .0 제거)
+            if result == int(result):
+                return str(int(result))
+            return str(result)
+        return ""
+
+    def _get_gongjong_variables(self, gongjong_name):
+        """갑지에서 공종의 층고($H)/천정($L) 값 조회 (비어 있으면 기본값)"""
+        variables = dict(DEFAULT_VARIABLES)
+        if not gongjong_name or self.gapji_table is None:
+            return variables
+
+        r = self._find_gapji_row(gongjong_name)
+        if r >= 0:
+            for var, col in (("$H", self.HEIGHT_COL), ("$L", self.CEILING_COL)):
+                value_item = self.gapji_table.item(r, col)
+                value = value_item.text().replace(",", "").strip() if value_item else ""
+                if value:
+                    variables[var] = value
+        return variables
+
+    def _stored_formulas(self, gongjong_name):
+        """eulji_data에 저장된 공종의 (행, 산출수식) 목록"""
+        columns = self.eulji_data.get(gongjong_name)
+        formulas = columns.column("formula") if columns is not None else []
+        return enumerate(formulas)
+
+    def _rebuild_variable_index(self, gongjong_name):
+        """eulji_data 기준으로 공종의 변수 인덱스 재구성"""
+        self.variable_index.rebuild(gongjong_name, self._stored_formulas(gongjong_name))
+
+    def _on_eulji_rows_inserted(self, parent, first, last):
+        """을지 행 삽입 시 변수 인덱스 행 번호 이동"""
+        self.variable_index.shift_rows(self.current_gongjong, first, last - first + 1)
+
+    def _on_eulji_rows_removed(self, parent, first, last):
+        """을지 행 삭제 시 변수 인덱스 행 번호 이동"""
+        self.variable_index.shift_rows(
+            self.current_gongjong, first, -(last - first + 1)
+        )
+
+    def _on_gapji_variable_changed(self, row, column):
+        """갑지 층고($H)/천정($L) 변경 시 해당 변수를 참조하는 을지 행만 재계산"""
+        item = self.gapji_table.item(row, self.GONGJONG_COL)
+        gongjong_name = item.text().strip() if item else ""
+        if not gongjong_name:
+            return
+
+        var = "$H" if column == self.HEIGHT_COL else "$L"
+        variables = self._get_gongjong_variables(gongjong_name)
+        if gongjong_name == self.current_gongjong:
+            self._current_variables = variables
+
+        # 프로젝트 열기/템플릿 로드 후 아직 표시하지 않은 공종은 여기서 인덱스 구성
+        self.variable_index.ensure(gongjong_name, lambda: self._stored_formulas(gongjong_name))
+        rows = self.variable_index.rows_for(gongjong_name, (var,))
+        if not rows:
+            return
+
+        formula_col = self.EULJI_COLS["FORMULA"]
+        total_col = self.EULJI_COLS["TOTAL"]
+
+        if gongjong_name == self.current_gongjong:
+            # 표시 중인 공종: 해당 행의 계 셀만 갱신
+            self.eulji_table.blockSignals(True)
+            try:
+                for r in rows:
+                    formula_item = self.eulji_table.item(r, formula_col)
+                    formula = formula_item.text().strip() if formula_item else ""
+                    result = self._evaluate_eulji_formula(formula, variables)
+                    total_item = ensure_item(self.eulji_table, r, total_col)
+                    total_item.setText(self._format_eulji_total(result, formula))
+            finally:
+                self.eulji_table.blockSignals(False)
+
+            if hasattr(self, "save_timer"):
+                self.save_timer.start(300)
+        else:
+            # 저장된 공종: 메모리 데이터의 계 값만 갱신
+            columns = self.eulji_data.get(gongjong_name)
+            if columns is None:
+                return
+            for r in rows:
+                if r >= len(columns):
+                    continue
+                formula = columns.get(r, "formula").strip()
+                result = self._evaluate_eulji_formula(formula, variables)
+                columns.set(r, "total", self._format_eulji_total(result, formula))
+
     def _clear_eulji_total(self, row):
         """계 컬럼 비우기"""
         self.eulji_table.blockSignals(True)
@@ -1400,6 +1509,8 @@ class OutputDetailTab:
             if self.current_gongjong and self.current_gongjong != new_gongjong_name:
                 self._save_eulji_data(self.current_gongjong)
                 self._update_gapji_marker(self.current_gongjong)
+                # 저장 시 빈 행이 제거되므로 리스트 인덱스 기준으로 재구성
+                self._rebuild_variable_index(self.current_gongjong)
 
             # 2. 새 공종 정보 업데이트
             self.current_gongjong = new_gongjong_name
@@ -1421,37 +1532,23 @@ class OutputDetailTab:
         if not gongjong_name:
             return
 
-        data = []
-        for r in range(self.eulji_table.rowCount()):
-            row_data = {}
-            has_content = False
-            # 모든 컬럼 순회하며 데이터 추출
-            for col_idx in range(self.eulji_table.columnCount()):
-                item = self.eulji_table.item(r, col_idx)
-                if item and item.text().strip():
-                    row_data[col_idx] = item.text()
-                    has_content = True
-            if has_content:
-                data.append(row_data)
-
-        self.eulji_data[gongjong_name] = data
+        # 마지막 저장 이후 수정된 행만 반영 (행 삭제 등으로 반영할 수 없으면 전체 사본)
+        self.eulji_data[gongjong_name] = self.eulji_table.flush_columns(
+            self.eulji_data.get(gongjong_name), self.eulji_data.pool
+        )
 
     def _load_eulji_data(self, gongjong_name):
         """메모리에서 특정 공종의 을지 데이터를 불러와 테이블에 표시"""
         self.eulji_table.blockSignals(True)
-        self.eulji_table.clearContents()
-
-        data = self.eulji_data.get(gongjong_name, [])
-        for r, row_data in enumerate(data):
-            # 필요시 행 추가
-            if r >= self.eulji_table.rowCount():
-                self.eulji_table.setRowCount(r + 10)
-
-            for col_idx, text in row_data.items():
-                self.eulji_table.setItem(r, col_idx, QTableWidgetItem(text))
+        # 모델 리셋 1회로 표시 (셀 객체 생성 없음)
+        self.eulji_table.load_columns(self.eulji_data.get(gongjong_name))
 
         self.eulji_table.blockSignals(False)
 
+        # [NEW] 공종의 갑지 변수 및 변수 참조 행 인덱스 준비
+        self._current_variables = self._get_gongjong_variables(gongjong_name)
+        self._rebuild_variable_index(gongjong_name)
+
     def _update_gapji_marker(self, gongjong_name):
         """갑지 테이블의 #. 컬럼에 데이터 유무(*) 표시 (사용자 요청)"""
         if not gongjong_name:
@@ -1461,17 +1558,40 @@ class OutputDetailTab:
         data = self.eulji_data.get(gongjong_name, [])
         has_data = len(data) > 0
 
-        # 갑지에서 해당 공종 행 찾기
-        for r in range(self.gapji_table.rowCount()):
+        r = self._find_gapji_row(gongjong_name)
+        if r < 0:
+            return
+
+        marker = "*" if has_data else ""
+        current = self.gapji_table.item(r, self.NUM_COL)
+        if current and current.text() == marker:
+            return
+
+        self.gapji_table.blockSignals(True)
+        marker_item = QTableWidgetItem(marker)
+        marker_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.gapji_table.setItem(r, self.NUM_COL, marker_item)
+        self.gapji_table.blockSignals(False)
+
+    def _find_gapji_row(self, gongjong_name):
+        """공종명 → 갑지 행 번호 (없으면 -1)
+
+        공종→행 인덱스를 사용하고, 인덱스가 가리키는 행의 공종명이 다르면
+        (행 삽입/삭제, 공종명 수정) 갑지를 한 번 스캔하여 인덱스를 다시 만든다.
+        """
+        r = self._gapji_row_index.get(gongjong_name, -1)
+        if 0 <= r < self.gapji_table.rowCount():
             item = self.gapji_table.item(r, self.GONGJONG_COL)
             if item and item.text().strip() == gongjong_name:
-                self.gapji_table.blockSignals(True)
-                marker = "*" if has_data else ""
-                marker_item = QTableWidgetItem(marker)
-                marker_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.gapji_table.setItem(r, self.NUM_COL, marker_item)
-                self.gapji_table.blockSignals(False)
-                break
+                return r
+
+        self._gapji_row_index = {}
+        for row in range(self.gapji_table.rowCount()):
+            item = self.gapji_table.item(row, self.GONGJONG_COL)
+            name = item.text().strip() if item else ""
+            if name and name not in self._gapji_row_index:
+                self._gapji_row_index[name] = row
+        return self._gapji_row_index.get(gongjong_name, -1)
 
     def _reorder_gongjong_numbers(self):
         """갑지 테이블의 공종 번호를 순차적/계층적으로 재정리 (사용자 요청)"""
@@ -1544,6 +1664,215 @@ class OutputDetailTab:
         """프로젝트명 업데이트"""
         self.lbl_project_name.setText(f"Project: {name}")
 
+    # ============================================
+    # [NEW] 프로젝트 파일 (열기/저장)
+    # ============================================
+
+    def _show_file_menu(self):
+        """파일 메뉴: 새 프로젝트/열기/저장/다른 이름으로 저장"""
+        from PyQt6.QtGui import QCursor
+        from PyQt6.QtWidgets import QMenu
+
+        menu = QMenu(self.main_window)
+        menu.addAction("새 프로젝트", self.new_project)
+        menu.addAction("열기...", self.open_project)
+        menu.addSeparator()
+        menu.addAction("저장", self.save_project)
+        menu.addAction("다른 이름으로 저장...", self.save_project_as)
+        menu.exec(QCursor.pos())
+
+    def _close_project_store(self):
+        if self.unit_price_chunks is not None:
+            self.unit_price_chunks.close()
+            self.unit_price_chunks = None
+        if self.project_store is not None:
+            self.project_store.close()
+            self.project_store = None
+
+    def _shared_chunk_store(self):
+        """조각 폴더의 공용 산출일위표 저장소 (프로젝트 파일이 없을 때)"""
+        return get_unit_price_store(os.path.join(self.project_root, "data", "unit_price_chunks"))
+
+    def _open_project_files(self, path: str, copy_chunks: bool):
+        """
+        프로젝트 파일과 그 안의 산출일위표 저장소 열기
+
+        copy_chunks: 지금 사용 중인 저장소의 일위표를 새 파일로 복사 (처음 저장/다른 이름으로 저장)
+            False면 일위표가 공용 저장소(프로젝트 이름별)에만 있던 파일에서 한 번 가져오기
+        """
+        store = ProjectStore(path)
+        chunks = None
+        try:
+            chunks = UnitPriceStore(path=path)
+            if copy_chunks:
+                chunks.copy_project(
+                    active_store(self, os.path.join(self.project_root, "data", "unit_price_chunks")),
+                    chunk_project_name(self),
+                )
+            elif store.get_meta("unit_price_chunks") is None and not chunks.names():
+                name = store.get_meta("project_name") or os.path.splitext(os.path.basename(path))[0]
+                chunks.copy_project(self._shared_chunk_store(), name)
+            if store.get_meta("unit_price_chunks") is None:
+                store.set_meta("unit_price_chunks", "project_file")
+        except Exception:
+            if chunks is not None:
+                chunks.close()
+            store.close()
+            raise
+        return store, chunks
+
+    def new_project(self):
+        """빈 프로젝트로 초기화"""
+        self._close_project_store()
+        self.reset_internal_data()
+        self.eulji_table.load_columns(None)
+        self._apply_gapji_rows({})
+        self._update_project_name("-")
+        self.current_gongjong_label.setText("산출공종: -")
+        self._switch_view(0)
+
+    def open_project(self, path: str = None):
+        """프로젝트 파일 열기 (파일 1개에서 갑지/을지 전체 로드)"""
+        if not path:
+            path, _ = QFileDialog.getOpenFileName(
+                self.main_window, "프로젝트 열기", "", PROJECT_FILTER
+            )
+            if not path:
+                return False
+
+        try:
+            store, chunks = self._open_project_files(path, copy_chunks=False)
+            name = store.get_meta("project_name") or os.path.splitext(os.path.basename(path))[0]
+        except Exception as e:
+            QMessageBox.critical(self.main_window, "열기 오류", f"프로젝트 열기 실패:\n{e}")
+            return False
+
+        self._close_project_store()
+        self.project_store = store
+        self.unit_price_chunks = chunks
+        self.reset_internal_data()
+        store.load_eulji(self.eulji_data)
+        self.eulji_table.load_columns(None)
+        self._apply_gapji_rows(store.load_gapji())
+
+        self._update_project_name(name)
+        self.current_gongjong_label.setText("산출공종: -")
+        self._switch_view(0)
+        self._log_system_event(f"Project opened: {path}")
+        return True
+
+    def _is_open_project(self, path: str) -> bool:
+        """path가 현재 열려 있는 프로젝트 파일인지"""
+        return self.project_store is not None and os.path.normcase(
+            os.path.abspath(path)
+        ) == os.path.normcase(os.path.abspath(self.project_store.path))
+
+    def save_project(self, path: str = None):
+        """프로젝트 저장 (처음 저장이면 파일 선택, 이후에는 변경 행만 기록)"""
+        if not path and self.project_store is None:
+            return self.save_project_as()
+
+        # 편집 중인 을지 내용 반영
+        if self.current_gongjong:
+            self._save_eulji_data(self.current_gongjong)
+
+        try:
+            if path and not self._is_open_project(path):
+                store, chunks = self._open_project_files(path, copy_chunks=True)
+                self._close_project_store()
+                self.project_store = store
+                self.unit_price_chunks = chunks
+            name = self.lbl_project_name.text().replace("Project: ", "").strip()
+            written = self.project_store.save(
+                self.eulji_data,
+                self._collect_gapji_rows(),
+                {"project_name": name, "saved_at": datetime.now().isoformat()},
+            )
+        except Exception as e:
+            QMessageBox.critical(self.main_window, "저장 오류", f"프로젝트 저장 실패:\n{e}")
+            return False
+
+        self._log_system_event(f"Project saved: {self.project_store.path} ({written} rows)")
+        return True
+
+    def save_project_as(self):
+        """다른 이름으로 저장 (새 파일에 전체 기록)"""
+        name = self.lbl_project_name.text().replace("Project: ", "").strip()
+        default_name = (name if name and name != "-" else "새 프로젝트") + PROJECT_EXT
+        path, _ = QFileDialog.getSaveFileName(
+            self.main_window, "프로젝트 저장", default_name, PROJECT_FILTER
+        )
+        if not path:
+            return False
+        if not path.endswith(PROJECT_EXT):
+            path += PROJECT_EXT
+        if self._is_open_project(path):
+            # 열려 있는 파일 자체를 고른 경우: 지우지 않고 변경 행만 저장
+            return self.save_project()
+
+        # 덮어쓰기 확인은 파일 대화상자에서 완료 (WAL 보조 파일까지 삭제)
+        try:
+            for file_path in (path, path + "-wal", path + "-shm"):
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+        except OSError as e:
+            QMessageBox.critical(self.main_window, "저장 오류", f"프로젝트 저장 실패:\n{e}")
+            return False
+        return self.save_project(path)
+
+    def _collect_gapji_rows(self):
+        """갑지 내용 {행: (셀 텍스트, 공종명 셀 UserRole 데이터)} (빈 행 제외)"""
+        rows = {}
+        col_count = self.gapji_table.columnCount()
+        for r in range(self.gapji_table.rowCount()):
+            cells = []
+            for c in range(col_count):
+                item = self.gapji_table.item(r, c)
+                cells.append(item.text() if item else "")
+            gongjong_item = self.gapji_table.item(r, self.GONGJONG_COL)
+            payload = gongjong_item.data(Qt.ItemDataRole.UserRole) if gongjong_item else None
+            if any(cells) or payload is not None:
+                while cells and not cells[-1]:
+                    cells.pop()
+                rows[r] = (tuple(cells), payload)
+        return rows
+
+    def _apply_gapji_rows(self, rows):
+        """저장된 갑지 내용 표시 (공종 버튼/배경은 on_gapji_cell_changed로 재구성)"""
+        table = self.gapji_table
+        table.blockSignals(True)
+        # 산출공종 버튼 제거 (1행 번호정리 버튼은 유지)
+        for r in range(2, table.rowCount()):
+            if table.cellWidget(r, self.GUBUN_COL):
+                table.removeCellWidget(r, self.GUBUN_COL)
+        table.clearContents()
+        if not table.cellWidget(1, self.GONGJONG_NUM_COL):
+            table.set_reorder_button(1, self.GONGJONG_NUM_COL, self._create_reorder_button())
+        if rows and max(rows) >= table.rowCount():
+            table.setRowCount(max(rows) + 10)
+
+        for r, (cells, payload) in rows.items():
+            for c, text in enumerate(cells):
+                if text:
+                    item = QTableWidgetItem(text)
+                    if c != self.GONGJONG_COL:
+                        item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                    table.setItem(r, c, item)
+            if payload is not None:
+                item = table.item(r, self.GONGJONG_COL)
+                if item is None:
+                    item = QTableWidgetItem("")
+                    table.setItem(r, self.GONGJONG_COL, item)
+                item.setData(Qt.ItemDataRole.UserRole, payload)
+        table.blockSignals(False)
+
+        for r, (cells, _) in rows.items():
+            if r != 1 and len(cells) > self.GONGJONG_COL and cells[self.GONGJONG_COL]:
+                self.on_gapji_cell_changed(r, self.GONGJONG_COL)
+        for r, (cells, _) in rows.items():
+            if len(cells) > self.GONGJONG_COL and cells[self.GONGJONG_COL]:
+                self._update_gapji_marker(cells[self.GONGJONG_COL].strip())
+
     def _show_about_dialog(self):
         """[NEW] 도움말 - 프로그램 정보 표시"""
         from PyQt6.QtGui import QPixmap, QIcon
@@ -1748,6 +2077,10 @@ class OutputDetailTab:
         func_name = module_info.get("function")
         title = module_info["title"]
 
+        # 편집 중인 을지 내용 반영 (변경 행만 저장본/자재 집계에 반영)
+        if self.current_gongjong:
+            self._save_eulji_data(self.current_gongjong)
+
         try:
             # 모듈 임포트
             if "." in module_name:
@@ -1800,12 +2133,7 @@ class OutputDetailTab:
 
     def _log_system_event(self, msg):
         """시스템 이벤트를 디버그 로그에 기록 (나중에 SYSTEM_LOG.md 업데이트 참고용)"""
-        try:
-            log_file = os.path.join(self.project_root, "debug_trigger.log")
-            with open(log_file, "a", encoding="utf-8") as f:
-                f.write(f"[{datetime.now()}] [SYSTEM_EVENT] {msg}\n")
-        except:
-            pass
+        _log.info("[SYSTEM_EVENT] %s", msg)
 
 
 # 테스트용 진입점
@@ -30,6 +30,9 @@ from PyQt6.QtWidgets import (
     QSpinBox,
 )
 
+from core.estimate_aggregate import material_totals
+from core.eulji_store import EuljiStore
+
 
 class BatchToolsPopup(QDialog):
     """일괄 변경 도구 팝업"""
@@ -173,34 +176,9 @@ class BatchToolsPopup(QDialog):
         """전체 목록 집계 실행"""
         self.agg_table.setRowCount(0)
 
-        # 집계: {(품명, 규격, 단위): {'count': int, 'qty': float, 'gongjongs': set}}
-        aggregated = {}
-
-        for gongjong, eulji_list in self.parent_tab.eulji_data.items():
-            for row_data in eulji_list:
-                item = row_data.get("item", "").strip()
-                if not item:
-                    continue
-
-                unit = row_data.get("unit", "").strip()
-                total = row_data.get("total", "").strip()
-
-                try:
-                    qty = float(total) if total else 0.0
-                except:
-                    qty = 0.0
-
-                if qty <= 0:
-                    continue
-
-                key = (item, "", unit)
-
-                if key not in aggregated:
-                    aggregated[key] = {"count": 0, "qty": 0.0, "gongjongs": set()}
-
-                aggregated[key]["count"] += 1
-                aggregated[key]["qty"] += qty
-                aggregated[key]["gongjongs"].add(gongjong)
+        # 자재별 합계 {(품명, 규격, 단위): {'count', 'qty', 'gongjongs'}}
+        # (계가 입력된 행만, 을지 저장소가 행 변경마다 유지하는 집계)
+        aggregated = material_totals(self.parent_tab.eulji_data, total_only=True)
 
         # 테이블에 표시
         for key, data in aggregated.items():
@@ -307,16 +285,18 @@ if __name__ == "__main__":
     # Mock parent_tab
     class MockParentTab:
         def __init__(self):
-            self.eulji_data = {
-                "1. 전등공사": [
-                    {"item": "전선 HI 2.5sq", "total": "100", "unit": "m"},
-                    {"item": "전선 HI 3.5sq", "total": "50", "unit": "m"},
-                ],
-                "2. 전열공사": [
-                    {"item": "전선 HI 2.5sq", "total": "200", "unit": "m"},
-                    {"item": "케이블 HI", "total": "30", "unit": "m"},
-                ],
-            }
+            self.eulji_data = EuljiStore(
+                {
+                    "1. 전등공사": [
+                        {"item": "전선 HI 2.5sq", "total": "100", "unit": "m"},
+                        {"item": "전선 HI 3.5sq", "total": "50", "unit": "m"},
+                    ],
+                    "2. 전열공사": [
+                        {"item": "전선 HI 2.5sq", "total": "200", "unit": "m"},
+                        {"item": "케이블 HI", "total": "30", "unit": "m"},
+                    ],
+                }
+            )
 
     popup = BatchToolsPopup(MockParentTab())
     popup.show()
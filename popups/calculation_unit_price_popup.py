@@ -27,8 +27,6 @@ from PyQt6.QtWidgets import (
 import re
 import sys
 import os
-import json
-from datetime import datetime
 from PyQt6.QtCore import Qt, pyqtSignal, QEvent, QTimer, QPoint
 from PyQt6.QtGui import QFont, QColor, QKeyEvent
 
@@ -42,6 +40,10 @@ from utils.column_settings import (
     setup_common_table,
     CleanStyleDelegate,
 )
+from core.unit_price_store import active_store, chunk_project_name
+from utils.debug_log import get_logger
+
+_log = get_logger("unit_price_popup")
 
 
 class UnitPriceTable(QTableWidget):
@@ -103,13 +105,16 @@ class CalculationUnitPricePopup(QDialog):
 
         self._init_ui()
 
+    @property
+    def chunk_store(self):
+        """산출일위표 조각 저장소 (프로젝트 파일이 열려 있으면 그 파일 안의 저장소)"""
+        return active_store(getattr(self, "parent_tab", None), self.base_chunk_dir)
+
     def _init_ui(self):
         """UI 초기화"""
         # [NEW] 자료사전 조각 파일 저장 경로 설정 (부모 탭 정보 활용 우선)
         root_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        self.debug_log = os.path.join(root_path, "debug_trigger.log")
         self.base_chunk_dir = os.path.join(root_path, "data", "unit_price_chunks")
-        os.makedirs(self.base_chunk_dir, exist_ok=True)
 
         # [NEW] 지연 저장용 타이머
         self.save_timer = QTimer()
@@ -1039,30 +1044,14 @@ class CalculationUnitPricePopup(QDialog):
                 f"[ERROR] _on_list_button_clicked failed: {e}\n{traceback.format_exc()}"
             )
             print(error_msg)
-            try:
-                with open(self.debug_log, "a", encoding="utf-8") as f:
-                    f.write(error_msg + "\n")
-            except:
-                pass
-
-    def _get_chunk_file_path(self, item_name):
-        """항목명을 기반으로 안전한 파일 경로 생성 (프로젝트별 격리 저장)"""
-        # 1. 프로젝트명 확인
-        project_name = "-"
-        if hasattr(self, "parent_tab") and hasattr(self.parent_tab, "lbl_project_name"):
-            project_label = self.parent_tab.lbl_project_name.text()
-            if project_label.startswith("Project: "):
-                project_name = project_label.replace("Project: ", "").strip()
+            _log.error(error_msg)
 
-        if not project_name or project_name == "-":
-            project_name = "_unsaved_session_"
-
-        # 2. 프로젝트 폴더 경로 생성
-        safe_p_name = re.sub(r'[\\/*?:"<>|]', "_", project_name).strip()
-        project_dir = os.path.join(self.base_chunk_dir, safe_p_name)
-        os.makedirs(project_dir, exist_ok=True)
+    def _get_chunk_key(self, item_name):
+        """항목명 → 조각 저장소 키 (프로젝트, 항목명) (프로젝트별 격리 저장)"""
+        # 1. 프로젝트명 확인
+        project_name = chunk_project_name(getattr(self, "parent_tab", None))
 
-        # 3. 항목 파일명 생성
+        # 2. 항목 키 생성
         if not item_name:
             if self.target_row >= 0:
                 # 항목명이 없는 경우 행 번호를 이용해 임시 저장
@@ -1070,94 +1059,44 @@ class CalculationUnitPricePopup(QDialog):
             else:
                 return None
 
-        safe_name = re.sub(r'[\\/*?:"<>|]', "_", item_name).strip()
-        if not safe_name:
-            return None
-        return os.path.join(project_dir, f"{safe_name}.json")
+        return self.chunk_store.key(project_name, item_name)
 
     def _load_data(self, item_name):
-        """저장된 조각 파일 로드 또는 기본 30행 초기화"""
+        """저장된 조각 데이터 로드 또는 기본 30행 초기화 (기존 행/셀 객체 재사용)"""
         try:
-            self.table.setRowCount(0)
             orig_blocked = self.table.blockSignals(True)
 
-            file_path = self._get_chunk_file_path(item_name)
-            loaded = False
+            chunk_key = self._get_chunk_key(item_name)
+            rows = None
 
-            log_msg = (
-                f"[{datetime.now()}] _load_data for '{item_name}' (Path: {file_path})\n"
-            )
+            log_msg = f"_load_data for '{item_name}' (Key: {chunk_key})\n"
 
-            if file_path and os.path.exists(file_path):
+            if chunk_key:
                 try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
+                    data = self.chunk_store.get(*chunk_key)
 
                     if isinstance(data, list):
-                        for row_data in data:
-                            row = self.table.rowCount()
-                            self.table.insertRow(row)
-                            self.table.setRowHeight(row, UNIT_PRICE_ROW_HEIGHT)
-
-                            # 데이터 채우기 (MARK, LIST, UNIT_FORMULA)
-                            mark_text = str(row_data.get("mark", ""))
-                            mark_item = QTableWidgetItem(mark_text)
-                            mark_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-
-                            # [NEW] 'i'인 경우 짙은 청색 및 볼드 처리
-                            if mark_text == "i":
-                                mark_item.setForeground(QColor("#000080"))
-                                f = mark_item.font()
-                                f.setBold(True)
-                                mark_item.setFont(f)
-
-                            self.table.setItem(
-                                row, self.UNIT_PRICE_COLS["MARK"], mark_item
+                        # 데이터 채우기 (MARK, LIST, UNIT_FORMULA)
+                        rows = [
+                            (
+                                str(row_data.get("mark", "")),
+                                str(row_data.get("list", "")),
+                                str(row_data.get("qty", "")),
                             )
-
-                            self.table.setItem(
-                                row,
-                                self.UNIT_PRICE_COLS["LIST"],
-                                QTableWidgetItem(str(row_data.get("list", ""))),
-                            )
-                            self.table.setItem(
-                                row,
-                                self.UNIT_PRICE_COLS["UNIT_FORMULA"],
-                                QTableWidgetItem(str(row_data.get("qty", ""))),
-                            )
-
-                            # 단위계 계산 (blockSignals 상태이므로 직접 호출)
-                            self._update_row_total(row)
-
-                        # [NEW] 데이터 로드 후에도 최소 30행 보장
-                        current_rows = self.table.rowCount()
-                        if current_rows < 30:
-                            for row in range(current_rows, 30):
-                                self.add_row()
-
-                        loaded = True
+                            for row_data in data
+                        ]
                         self.table.setShowGrid(True)
                         log_msg += f"  -> Success: {len(data)} rows loaded (Total 30 rows ensured).\n"
                 except Exception as e:
                     log_msg += f"  -> Error: {e}\n"
 
             # 로드 실패 시 또는 데이터가 없는 경우 기본 30행 구성
-            if not loaded:
-                for i in range(30):
-                    self.add_row()
-                    # [FIX] 첫 행에 부모의 산출목록 명칭 출력 (사용자 요청)
-                    if i == 0 and item_name:
-                        self.table.setItem(
-                            0, self.UNIT_PRICE_COLS["LIST"], QTableWidgetItem(item_name)
-                        )
-                        # [FIX] 단위수량 기본값 1 설정 (사용자 요청)
-                        self.table.setItem(
-                            0, self.UNIT_PRICE_COLS["UNIT_FORMULA"], QTableWidgetItem("1")
-                        )
-                        # 단위계 즉시 계산 유도
-                        self._update_row_total(0)
+            if rows is None:
+                # [FIX] 첫 행에 부모의 산출목록 명칭과 단위수량 기본값 1 출력 (사용자 요청)
+                rows = [("", item_name, "1")] if item_name else []
                 log_msg += f"  -> No data found, initialized 30 rows. First row filled with '{item_name}' and qty 1.\n"
 
+            self._apply_rows(rows)
             self.table.blockSignals(orig_blocked)
 
             # 첫 번째 셀 선택
@@ -1165,16 +1104,82 @@ class CalculationUnitPricePopup(QDialog):
                 self.table.setCurrentCell(0, self.UNIT_PRICE_COLS["LIST"])
 
             # [LOG]
-            try:
-                with open(self.debug_log, "a", encoding="utf-8") as f:
-                    f.write(log_msg)
-            except:
-                pass
+            _log.debug(log_msg.rstrip("\n"))
 
         except Exception as e:
             self.table.blockSignals(False)
             print(f"[ERROR] _load_data failed: {e}")
 
+    def _apply_rows(self, rows):
+        """
+        표 내용을 rows [(마크, 산출일위목록, 단위수식)]로 교체 (최소 30행)
+
+        행과 셀 객체는 그대로 두고 내용이 달라진 셀만 고친다 (신호 차단 상태에서 호출).
+        """
+        from utils.column_settings import format_number
+
+        cols = self.UNIT_PRICE_COLS
+        row_count = max(len(rows), 30)
+        old_count = self.table.rowCount()
+        if old_count != row_count:
+            self.table.setRowCount(row_count)
+        for r in range(row_count):
+            if self.table.rowHeight(r) != UNIT_PRICE_ROW_HEIGHT:
+                self.table.setRowHeight(r, UNIT_PRICE_ROW_HEIGHT)
+
+            if r < len(rows):
+                mark_text, list_text, formula = rows[r]
+                formula_clean = formula.strip()
+                result = self._evaluate_math(formula_clean)
+                total_text = format_number(result) if result != 0 or formula_clean else ""
+            else:
+                mark_text = list_text = formula = total_text = ""
+
+            self._sync_mark_cell(r, mark_text)
+            self._sync_cell(r, cols["CODE"], "")
+            self._sync_cell(r, cols["LIST"], list_text)
+            self._sync_cell(r, cols["UNIT_FORMULA"], formula)
+            total_item = self._sync_cell(r, cols["UNIT_TOTAL"], total_text)
+            if total_item is not None and total_text:
+                total_item.setTextAlignment(
+                    Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+                )
+
+    def _sync_cell(self, row, col, text):
+        """셀 텍스트가 다를 때만 변경 (빈 셀은 새 항목을 만들지 않음), 셀 항목 반환"""
+        item = self.table.item(row, col)
+        if item is None:
+            if not text:
+                return None
+            item = QTableWidgetItem(text)
+            self.table.setItem(row, col, item)
+        elif item.text() != text:
+            item.setText(text)
+        return item
+
+    def _sync_mark_cell(self, row, mark_text):
+        """마커 셀 갱신 ('i'는 짙은 청색 볼드, 그 외 기본 스타일)"""
+        item = self.table.item(row, self.UNIT_PRICE_COLS["MARK"])
+        is_ilwi = mark_text == "i"
+        if item is None:
+            if not mark_text:
+                return
+            item = QTableWidgetItem(mark_text)
+            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.table.setItem(row, self.UNIT_PRICE_COLS["MARK"], item)
+        elif item.text() != mark_text:
+            item.setText(mark_text)
+            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        if item.font().bold() != is_ilwi:
+            # [NEW] 'i'인 경우 짙은 청색 및 볼드 처리
+            f = item.font()
+            f.setBold(is_ilwi)
+            item.setFont(f)
+            if is_ilwi:
+                item.setForeground(QColor("#000080"))
+            else:
+                item.setData(Qt.ItemDataRole.ForegroundRole, None)
+
     def _save_data(self):
         """현재 테이블 내용을 조각 파일로 저장"""
         try:
@@ -1182,8 +1187,8 @@ class CalculationUnitPricePopup(QDialog):
             if item_name == "-":
                 item_name = ""
 
-            file_path = self._get_chunk_file_path(item_name)
-            if not file_path:
+            chunk_key = self._get_chunk_key(item_name)
+            if not chunk_key:
                 return
 
             data = []
@@ -1201,29 +1206,20 @@ class CalculationUnitPricePopup(QDialog):
                     data.append({"mark": mark_text, "list": list_text, "qty": qty_text})
                     has_valid_data = True
 
-            log_msg = f"[{datetime.now()}] _save_data for '{item_name}' (ValidData={has_valid_data}, Rows={len(data)})\n"
+            log_msg = f"_save_data for '{item_name}' (ValidData={has_valid_data}, Rows={len(data)})\n"
 
             if has_valid_data:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    json.dump(data, f, ensure_ascii=False, indent=4)
-                log_msg += f"  -> Successfully saved to {file_path}\n"
+                self.chunk_store.put(*chunk_key, data)
+                log_msg += f"  -> Successfully saved to {chunk_key}\n"
             else:
                 log_msg += "  -> No data to save.\n"
 
             # [LOG]
-            try:
-                with open(self.debug_log, "a", encoding="utf-8") as f:
-                    f.write(log_msg)
-            except:
-                pass
+            _log.debug(log_msg.rstrip("\n"))
 
         except Exception as e:
             print(f"[ERROR] _save_data failed: {e}")
-            try:
-                with open(self.debug_log, "a", encoding="utf-8") as f:
-                    f.write(f"[{datetime.now()}] _save_data EXCEPTION: {e}\n")
-            except:
-                pass
+            _log.error("_save_data EXCEPTION: %s", e)
 
     def add_row(self):
         """테이블에 새 행 추가 (빈 행은 제한 없이 추가, 유효 데이터 입력 시 15행 제한 적용)"""
@@ -1303,7 +1299,7 @@ class CalculationUnitPricePopup(QDialog):
             self.table.blockSignals(orig_blocked)
 
             # [DEBUG] 행별 합계 갱신 로그
-            print(f"[DEBUG] Row {row} Unit Total Updated: {result}")
+            _log.debug("Row %s Unit Total Updated: %s", row, result)
         except Exception as e:
             print(f"[ERROR] _update_row_total failed for row {row}: {e}")
 
@@ -1501,13 +1497,7 @@ class CalculationUnitPricePopup(QDialog):
             self._adjust_position()
 
             # [LOG]
-            try:
-                with open(self.debug_log, "a", encoding="utf-8") as f:
-                    f.write(
-                        f"[{datetime.now()}] prepare_show: row={row}, col={col}, item='{item_name}'\n"
-                    )
-            except:
-                pass
+            _log.debug("prepare_show: row=%s, col=%s, item='%s'", row, col, item_name)
 
         except Exception as e:
             import traceback
@@ -1521,9 +1511,7 @@ class CalculationUnitPricePopup(QDialog):
         사용자가 Enter 키 등으로 명시적으로 진입해야만 산출일위표에 포커스 이동
         """
         try:
-            with open("debug_trigger.log", "a", encoding="utf-8") as f:
-                f.write(f"[{datetime.now()}] show_popup called.\n")
-                f.flush()
+            _log.debug("show_popup called.")
 
             # [STABILIZED] 윈도우 플래그 설정
             # WindowStaysOnTopHint 제거 (자료사전을 가리는 문제 해결)
@@ -1537,22 +1525,12 @@ class CalculationUnitPricePopup(QDialog):
             # 산출목록 클릭 시 포커스가 산출내역서에 유지되어야 함
             # 사용자가 Enter 키로 명시적으로 진입할 때만 포커스 이동 (event_filter.py에서 처리)
 
-            try:
-                with open(self.debug_log, "a", encoding="utf-8") as f:
-                    f.write(
-                        f"[{datetime.now()}] show_popup finished. Visible: {self.isVisible()}\n"
-                    )
-            except:
-                pass
+            _log.debug("show_popup finished. Visible: %s", self.isVisible())
         except Exception as e:
             import traceback
 
             error_msg = f"[ERROR] show_popup failed: {e}\n{traceback.format_exc()}"
-            try:
-                with open(self.debug_log, "a", encoding="utf-8") as f:
-                    f.write(error_msg + "\n")
-            except:
-                pass
+            _log.error(error_msg)
             print(error_msg)
 
     def hide_popup(self):
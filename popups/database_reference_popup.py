@@ -5,7 +5,6 @@ Database Reference Popup Window
 Model-View 기반의 고성능 대용량 데이터 로딩 시스템
 """
 
-import sqlite3
 import re
 import os
 import json
@@ -16,41 +15,34 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, QEvent, QAbstractTableModel, QModelIndex, QVariant, QTimer
 from PyQt6.QtGui import QColor, QFont, QPalette
 from utils.column_settings import CleanStyleDelegate
+from core.reference_db import ReferenceRowSource
 
 class ReferenceTableModel(QAbstractTableModel):
-    """자료사전 대용량 데이터를 위한 고성능 가상 모델 (19,000+ 행 대응)"""
-    def __init__(self, data=None):
+    """자료사전 대용량 데이터를 위한 고성능 가상 모델 (19,000+ 행 대응)
+
+    행 내용은 ReferenceRowSource에서 화면에 필요한 페이지만 읽는다.
+    """
+    def __init__(self, source=None):
         super().__init__()
-        self._raw_data = data if data else []
+        self._source = source
         self._headers = ["번호", "명칭(Description)", "규격(Size)", "단위", "산출수량"]
         # 수량 입력을 저장할 딕셔너리 {row_idx: qty_text}
         self._qty_inputs = {}
-        # 검색용 통합 데이터 캐시
-        self._search_blobs = []
-        self._prepare_search_blobs()
-
-    def _prepare_search_blobs(self):
-        """검색 성능 극대화를 위한 검색 데이터 인덱싱"""
-        self._search_blobs = []
-        for row in self._raw_data:
-            # 대상 및 가공 규칙:
-            # 1. 목록2(6) ~ 목록6(10), 약칭(11), 산출목록(13), 검색목록(14)
-            # 2. '+' 기호를 공백으로 치환하여 단어 단위 검색 지원
-            target_indices = [6, 7, 8, 9, 10, 11, 13, 14]
-            search_parts = []
-            for idx in target_indices:
-                if idx < len(row):
-                    val = str(row[idx]) if row[idx] is not None else ""
-                    search_parts.append(val.replace('+', ' '))
-            
-            # 기본 검색 대상 (품명, 규격, CODE) 추가
-            search_parts.extend([str(row[1]), str(row[2]), str(row[4])])
-            
-            combined = " ".join(search_parts).lower()
-            self._search_blobs.append(combined)
+
+    def raw_row(self, row):
+        """DB 행 튜플 (0:ID, 1:품명, 2:규격, 3:단위, 4:CODE, 5:그룹, ..., 13:산출목록)"""
+        return self._source.row(row)
+
+    def search(self, text):
+        """검색어의 모든 일치 행 (순위순)"""
+        if self._source is None:
+            return []
+        return self._source.search(text)
 
     def rowCount(self, parent=QModelIndex()):
-        return len(self._raw_data)
+        if parent.isValid() or self._source is None:
+            return 0
+        return len(self._source)
 
     def columnCount(self, parent=QModelIndex()):
         return 5  # 번호, 명칭, 규격, 산출수량, 단위
@@ -84,13 +76,14 @@ class ReferenceTableModel(QAbstractTableModel):
             raw_idx = mapping.get(col, -1)
             if raw_idx == -1:
                 return ""
+            raw_row = self._source.row(row)
             
             # [NEW] 산출목록(13)이 비어있는 경우 품명(1)으로 대체 출력
             if col == 1:
-                val = self._raw_data[row][13] if (len(self._raw_data[row]) > 13 and self._raw_data[row][13]) else self._raw_data[row][1]
+                val = raw_row[13] if (len(raw_row) > 13 and raw_row[13]) else raw_row[1]
                 return str(val) if val is not None else ""
                 
-            return str(self._raw_data[row][raw_idx]) if self._raw_data[row][raw_idx] is not None else ""
+            return str(raw_row[raw_idx]) if raw_row[raw_idx] is not None else ""
 
         # 텍스트 색상
         if role == Qt.ItemDataRole.ForegroundRole:
@@ -170,8 +163,6 @@ class DatabaseReferencePopup(QDialog):
     자료사전 DB 팝업 (3차 창)
     고성능 Model-View 방식으로 재설계됨
     """
-    # 메모리 캐싱을 위한 외부 가용한 데이터 저장소
-    _CACHE_DATA = None
 
     def __init__(self, parent_popup):
         # [FIX] 부모가 QWidget이 아닌 경우를 위해 부모 위젯 추출
@@ -183,6 +174,9 @@ class DatabaseReferencePopup(QDialog):
         self.current_row = -1
         self.current_col = -1
         self.target_table = None # [NEW] 데이터를 보낼 대상 테이블 객체 직접 저장
+        # [NEW] 최근 검색 결과 (같은 검색어 반복 시 다음 순위로 이동)
+        self._last_search_query = None
+        self._last_search_hits = []
         
         # 경로 및 설정
         self.original_mapping_path = r"D:\오아시스\data\manual_mapping.json"
@@ -224,6 +218,7 @@ class DatabaseReferencePopup(QDialog):
         # [NEW] 호출 시마다 이전 입력 데이터 초기화 (사용자 요청: 탐색만 한 항목이 전달되는 것 방지)
         if self.model:
             self.model.clear_all_qty()
+        self._last_search_query = None
         if not self.is_main_sheet:
             self._populate_product_list(target_row=current_row)
         else:
@@ -496,20 +491,9 @@ class DatabaseReferencePopup(QDialog):
             return
         
         try:
-            if DatabaseReferencePopup._CACHE_DATA is None:
-                conn = sqlite3.connect(self.ref_db_path)
-                cursor = conn.cursor()
-                cursor.execute("PRAGMA journal_mode=WAL;")
-                cursor.execute("""
-                    SELECT ID, 품명, 규격, 단위, CODE,
-                           그룹, 목록2, 목록3, 목록4, 목록5, 목록6, 약칭, W, 산출목록, 검색목록
-                    FROM [자료사전] WHERE 품명 != '자료사전' ORDER BY ID
-                """)
-                rows = cursor.fetchall()
-                DatabaseReferencePopup._CACHE_DATA = rows
-                conn.close()
-            
-            self.model = ReferenceTableModel(DatabaseReferencePopup._CACHE_DATA)
+            # ID 목록만 읽고 행 내용은 화면에 보이는 페이지만 지연 로딩 (DB 경로별 공유)
+            source = ReferenceRowSource.get(self.ref_db_path)
+            self.model = ReferenceTableModel(source)
             self.reference_table.setModel(self.model)
             
             # 컬럼 너비 설정 (ID, 명칭, 규격, 단위, 산출수량)
@@ -517,7 +501,7 @@ class DatabaseReferencePopup(QDialog):
             for i, w in enumerate(widths):
                 self.reference_table.setColumnWidth(i, w)
             
-            self.status_label.setText(f"자료 로드 완료: {len(DatabaseReferencePopup._CACHE_DATA)}개 품목")
+            self.status_label.setText(f"자료 로드 완료: {len(source)}개 품목")
             
         except Exception as e:
             QMessageBox.critical(self, "오류", f"데이터 로드 중 오류 발생: {e}")
@@ -625,7 +609,7 @@ class DatabaseReferencePopup(QDialog):
                     if not qty_text or not self._is_numeric(qty_text): continue
                     
                     try:
-                        raw_row = self.model._raw_data[row]
+                        raw_row = self.model.raw_row(row)
                         # 화면 표시 로직과 동일하게 명칭 추출
                         output_name = str(raw_row[13]) if (len(raw_row) > 13 and raw_row[13]) else str(raw_row[1])
                         target_row = active_row
@@ -656,7 +640,7 @@ class DatabaseReferencePopup(QDialog):
                     if not qty_text or not self._is_numeric(qty_text): continue
                     
                     try:
-                        raw_row = self.model._raw_data[row]
+                        raw_row = self.model.raw_row(row)
                         # [FIX] 산출목록(13) 우선 사용 (이미 품명+규격 결합형)
                         has_output = (len(raw_row) > 13 and raw_row[13] and str(raw_row[13]).strip())
                         if has_output:
@@ -721,7 +705,7 @@ class DatabaseReferencePopup(QDialog):
                     if not qty_text or not self._is_numeric(qty_text): continue
 
                     try:
-                        raw_row = self.model._raw_data[row]
+                        raw_row = self.model.raw_row(row)
                         # [FIX] 산출목록(13) 우선 사용 - 이미 '품명+규격' 결합형이므로 규격 추가 불필요
                         # 산출목록이 없을 때만 품명(1)+규격(2) 결합
                         has_output_name = (len(raw_row) > 13 and raw_row[13] and str(raw_row[13]).strip())
@@ -829,23 +813,25 @@ class DatabaseReferencePopup(QDialog):
         """통합 검색 및 행 이동"""
         # (상향된 로직에서 이미 삭제 처리됨)
 
-        # 검색어에서도 '+'를 공백으로 치환하여 인덱싱 데이터와 매칭
-        query = text.lower().strip().replace('+', ' ')
-        row_count = self.model.rowCount()
+        # 색인 검색 (전체 일치 행, 순위순). 같은 검색어를 반복하면 다음 순위로 이동
+        query = text.lower().strip()
+        repeated = query == self._last_search_query
+        if not repeated:
+            self._last_search_query = query
+            self._last_search_hits = self.model.search(text)
+        hits = self._last_search_hits
+
         found = -1
-        
-        # 순환 검색
-        search_range = list(range(start_row, row_count)) + list(range(0, start_row))
-        for row in search_range:
-            if query in self.model._search_blobs[row]:
-                found = row
-                break
+        if hits:
+            pos = hits.index(start_row) + 1 if repeated and start_row in hits else 0
+            found = hits[pos % len(hits)]
         
         if found != -1:
             idx = self.model.index(found, 4)
             self.reference_table.setCurrentIndex(idx)
             self.reference_table.scrollTo(idx, QTableView.ScrollHint.PositionAtCenter)
-            self.status_label.setText(f"검색 결과: {found+1}행 이동")
+            rank = hits.index(found) + 1
+            self.status_label.setText(f"검색 결과: {found+1}행 이동 ({rank}/{len(hits)})")
             if hasattr(self.parent_popup, "_log_system_event"):
                 self.parent_popup._log_system_event(f"DataDict Search: '{text}' -> found at row {found+1}")
         else:
@@ -861,7 +847,7 @@ class DatabaseReferencePopup(QDialog):
             return
             
         try:
-            raw_row = self.model._raw_data[row]
+            raw_row = self.model.raw_row(row)
             selected_code = str(raw_row[4])
             
             detail_table = self.target_table
@@ -25,6 +25,9 @@ from PyQt6.QtWidgets import (
     QApplication,
 )
 
+from core.estimate_aggregate import material_totals
+from core.eulji_store import as_columns
+
 
 class MaterialSummaryPopup(QDialog):
     """소요자재 집계 팝업"""
@@ -92,54 +95,9 @@ class MaterialSummaryPopup(QDialog):
         """데이터 로드 및 집계"""
         self.table.setRowCount(0)
 
-        # 집계 데이터: {(품명, 규격, 단위): {'qty': float, 'gongjong': str, 'rows': []}}
-        aggregated = {}
-
         try:
-            # 전체 공종 순회
-            for gongjong, eulji_list in self.parent_tab.eulji_data.items():
-                if not eulji_list:
-                    continue
-
-                for row_idx, row_data in enumerate(eulji_list):
-                    item_name = row_data.get("item", "").strip()
-                    if not item_name:
-                        continue
-
-                    # 수량 계산
-                    formula = row_data.get("formula", "")
-                    total = row_data.get("total", "")
-
-                    try:
-                        from utils.formula_parser import parse_formula
-
-                        if total:
-                            qty = float(total)
-                        elif formula:
-                            qty = parse_formula(formula)
-                        else:
-                            qty = 0.0
-                    except:
-                        qty = 0.0
-
-                    if qty <= 0:
-                        continue
-
-                    # 키 생성 (품명, 규격, 단위)
-                    unit = row_data.get("unit", "").strip()
-                    key = (item_name, "", unit)  # 규격은 현재 미사용
-
-                    if key not in aggregated:
-                        aggregated[key] = {
-                            "qty": 0.0,
-                            "gongjong": gongjong,
-                            "rows": [],
-                        }
-
-                    aggregated[key]["qty"] += qty
-                    aggregated[key]["rows"].append(
-                        {"gongjong": gongjong, "row": row_idx + 1, "qty": qty}
-                    )
+            # 자재별 합계 (을지 저장소가 행 변경마다 유지하는 집계)
+            aggregated = material_totals(self.parent_tab.eulji_data)
 
             # 테이블에 표시
             for idx, (key, data) in enumerate(aggregated.items()):
@@ -167,7 +125,7 @@ class MaterialSummaryPopup(QDialog):
                 self.table.setItem(row, 4, QTableWidgetItem(qty_str))
 
                 # 사용공종 (첫 번째 공종만 표시)
-                self.table.setItem(row, 5, QTableWidgetItem(data["gongjong"]))
+                self.table.setItem(row, 5, QTableWidgetItem(data["gongjongs"][0]))
 
             # 정렬: 품명 순
             self.table.sortItems(1)
@@ -192,10 +150,11 @@ class MaterialSummaryPopup(QDialog):
         details += "사용 위치:\n"
 
         for key, data in self.parent_tab.eulji_data.items():
-            for row_idx, row_data in enumerate(data):
-                if row_data.get("item", "").strip() == item_name:
-                    total = row_data.get("total", "")
-                    details += f"  - {key} 행 {row_idx + 1}: {total}\n"
+            columns = as_columns(data)
+            totals = columns.column("total")
+            for row_idx, name in enumerate(columns.column("item")):
+                if name.strip() == item_name:
+                    details += f"  - {key} 행 {row_idx + 1}: {totals[row_idx]}\n"
 
         QMessageBox.information(self, "근거추적", details)
 
@@ -1,38 +1,699 @@
 # -*- coding: utf-8 -*-
-from PyQt6.QtWidgets import QTableWidget
+from PyQt6.QtCore import (
+    QAbstractTableModel,
+    QItemSelection,
+    QItemSelectionModel,
+    QModelIndex,
+    QPoint,
+    Qt,
+    pyqtSignal,
+)
+from PyQt6.QtGui import QBrush, QFont
+from PyQt6.QtWidgets import QAbstractItemView, QTableView, QTableWidgetItem, QTableWidgetSelectionRange
+
+from core.eulji_store import EULJI_FIELDS, GongjongColumns, RowJournal, StringPool
+from utils.debug_log import TAB_LOG, get_logger
+
+_logger = get_logger("eulji_table", TAB_LOG)
+
+# QTableWidgetItem → 모델로 복사할 역할 (텍스트 제외)
+_COPY_ROLES = (
+    Qt.ItemDataRole.DecorationRole,
+    Qt.ItemDataRole.ToolTipRole,
+    Qt.ItemDataRole.StatusTipRole,
+    Qt.ItemDataRole.WhatsThisRole,
+    Qt.ItemDataRole.FontRole,
+    Qt.ItemDataRole.TextAlignmentRole,
+    Qt.ItemDataRole.BackgroundRole,
+    Qt.ItemDataRole.ForegroundRole,
+    Qt.ItemDataRole.CheckStateRole,
+    Qt.ItemDataRole.SizeHintRole,
+) + tuple(Qt.ItemDataRole(Qt.ItemDataRole.UserRole.value + i) for i in range(8))
+_FLAGS_KEY = "flags"
+_DEFAULT_FLAGS = (
+    Qt.ItemFlag.ItemIsSelectable
+    | Qt.ItemFlag.ItemIsEditable
+    | Qt.ItemFlag.ItemIsEnabled
+    | Qt.ItemFlag.ItemIsDragEnabled
+    | Qt.ItemFlag.ItemIsDropEnabled
+    | Qt.ItemFlag.ItemIsUserCheckable
+)
+
+
+def _role_key(role):
+    """역할 값을 dict 키로 정규화 (EditRole은 DisplayRole과 동일하게 취급)"""
+    role = Qt.ItemDataRole(role)
+    return Qt.ItemDataRole.DisplayRole if role == Qt.ItemDataRole.EditRole else role
+
+
+def _to_text(value) -> str:
+    """셀 텍스트 변환 (QVariant 문자열 변환과 동일하게 정수 실수는 .0 생략)"""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e16:
+        return str(int(value))
+    return str(value)
+
+
+class EuljiTableModel(QAbstractTableModel):
+    """을지 가상 모델 (공종 컬럼 저장소 기반, 셀 객체를 만들지 않음)
+
+    - 텍스트: GongjongColumns 사본 (빈 행 포함, 행 수보다 짧으면 나머지는 빈 행)
+    - 서식/사용자 데이터: 지정된 셀만 {(행, 열): {역할: 값}} 로 보관
+    - 변경 기록: 마지막 저장 이후 수정된 행 (RowJournal)
+    """
+
+    cellEdited = pyqtSignal(int, int)  # 셀 값 변경 (편집 완료/항목 수정) → cellChanged
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._columns = GongjongColumns()
+        self._row_count = 0
+        self._column_count = 0
+        self._headers = {}
+        self._cell_roles = {}
+        self._journal = RowJournal()
+
+    # ---------- 저장소 연결 ----------
+
+    def load_columns(self, columns: GongjongColumns = None):
+        """공종 데이터로 교체 (모델 리셋 1회)"""
+        self.beginResetModel()
+        if columns is not None:
+            self._columns = columns.copy()
+        else:
+            self._columns = GongjongColumns(self._columns.pool)
+        self._cell_roles = {}
+        self._journal.attach(self._columns, columns)
+        if len(self._columns) > self._row_count:
+            self._row_count = len(self._columns) + 9
+        self.endResetModel()
+
+    def snapshot(self, pool: StringPool = None) -> GongjongColumns:
+        """빈 행을 제거한 저장용 사본"""
+        return self._columns.compacted(pool)
+
+    def flush(self, target: GongjongColumns = None, pool: StringPool = None) -> GongjongColumns:
+        """마지막 저장 이후 수정된 행만 저장본에 반영 (반영할 수 없으면 새 사본)"""
+        return self._journal.flush(self._columns, target, pool)
+
+    def clear_contents(self):
+        """행 수는 유지하고 모든 셀 비우기"""
+        self._columns = GongjongColumns(self._columns.pool)
+        self._cell_roles = {}
+        self._journal.invalidate()
+        if self._row_count and self._column_count:
+            self.dataChanged.emit(
+                self.index(0, 0), self.index(self._row_count - 1, self._column_count - 1)
+            )
+
+    # ---------- 셀 접근 ----------
+
+    def text(self, row: int, col: int) -> str:
+        if col < len(EULJI_FIELDS):
+            if row < len(self._columns):
+                return self._columns.get(row, EULJI_FIELDS[col])
+            return ""
+        return _to_text(self._cell_roles.get((row, col), {}).get(Qt.ItemDataRole.DisplayRole))
+
+    def cell_data(self, row: int, col: int, role):
+        role = _role_key(role)
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.text(row, col) or None
+        roles = self._cell_roles.get((row, col))
+        return roles.get(role) if roles else None
+
+    def cell_flags(self, row: int, col: int):
+        roles = self._cell_roles.get((row, col))
+        if roles and _FLAGS_KEY in roles:
+            return roles[_FLAGS_KEY]
+        return _DEFAULT_FLAGS
+
+    def has_cell(self, row: int, col: int) -> bool:
+        """텍스트나 데이터 역할이 있는 셀인지 (QTableWidget의 item 유무와 대응)"""
+        return bool(self.text(row, col)) or bool(self._cell_roles.get((row, col)))
+
+    def set_cell_data(self, row: int, col: int, role, value, notify: bool = True) -> bool:
+        """셀 값 1개 설정 (값이 같으면 무시)"""
+        if role == _FLAGS_KEY:
+            if self.cell_flags(row, col) == value:
+                return False
+            self._cell_roles.setdefault((row, col), {})[_FLAGS_KEY] = value
+        else:
+            role = _role_key(role)
+            if role == Qt.ItemDataRole.DisplayRole and col < len(EULJI_FIELDS):
+                text = _to_text(value)
+                if self.text(row, col) == text:
+                    return False
+                self._columns.ensure_rows(row + 1)
+                self._columns.set(row, EULJI_FIELDS[col], text)
+                self._journal.mark(row)
+            else:
+                roles = self._cell_roles.setdefault((row, col), {})
+                if roles.get(role) == value:
+                    return False
+                if value is None:
+                    roles.pop(role, None)
+                else:
+                    roles[role] = value
+
+        index = self.index(row, col)
+        self.dataChanged.emit(index, index)
+        if notify:
+            self.cellEdited.emit(row, col)
+        return True
+
+    def replace_cell(self, row: int, col: int, values: dict):
+        """셀 전체 교체 (QTableWidget.setItem과 동일하게 값이 같아도 변경 알림)"""
+        text = values.pop(Qt.ItemDataRole.DisplayRole, "")
+        if col < len(EULJI_FIELDS):
+            if text or row < len(self._columns):
+                self._columns.ensure_rows(row + 1)
+                self._columns.set(row, EULJI_FIELDS[col], _to_text(text))
+                self._journal.mark(row)
+        elif text:
+            values[Qt.ItemDataRole.DisplayRole] = text
+        if values:
+            self._cell_roles[(row, col)] = values
+        else:
+            self._cell_roles.pop((row, col), None)
+        index = self.index(row, col)
+        self.dataChanged.emit(index, index)
+        self.cellEdited.emit(row, col)
+
+    def take_cell(self, row: int, col: int) -> dict:
+        """셀 값을 꺼내고 비우기"""
+        values = dict(self._cell_roles.get((row, col), {}))
+        text = self.text(row, col)
+        if text:
+            values[Qt.ItemDataRole.DisplayRole] = text
+        self.replace_cell(row, col, {})
+        return values
+
+    # ---------- QAbstractTableModel ----------
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._column_count
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        return self.cell_data(index.row(), index.column(), role)
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid():
+            return False
+        self.set_cell_data(index.row(), index.column(), role, value)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.ItemIsDropEnabled
+        return self.cell_flags(index.row(), index.column())
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (
+            orientation == Qt.Orientation.Horizontal
+            and role == Qt.ItemDataRole.DisplayRole
+            and section in self._headers
+        ):
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
+
+    def set_header_labels(self, labels):
+        self._headers = dict(enumerate(labels))
+        if self._column_count:
+            self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, self._column_count - 1)
+
+    def insertRows(self, row, count, parent=QModelIndex()):
+        if count <= 0 or row < 0 or row > self._row_count:
+            return False
+        self.beginInsertRows(QModelIndex(), row, row + count - 1)
+        if row < len(self._columns):
+            self._columns.insert_rows(row, count)
+        self._journal.rows_inserted(row, count)
+        self._shift_cell_roles(row, count)
+        self._row_count += count
+        self.endInsertRows()
+        return True
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if count <= 0 or row < 0 or row + count > self._row_count:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row + count - 1)
+        if row < len(self._columns):
+            self._columns.remove_rows(row, count)
+        self._journal.rows_removed(row, count)
+        self._cell_roles = {
+            key: roles for key, roles in self._cell_roles.items() if not row <= key[0] < row + count
+        }
+        self._shift_cell_roles(row + count, -count)
+        self._row_count -= count
+        self.endRemoveRows()
+        return True
+
+    def set_row_count(self, rows: int):
+        rows = max(0, rows)
+        if rows > self._row_count:
+            self.insertRows(self._row_count, rows - self._row_count)
+        elif rows < self._row_count:
+            self.removeRows(rows, self._row_count - rows)
+
+    def set_column_count(self, columns: int):
+        columns = max(0, columns)
+        if columns > self._column_count:
+            self.beginInsertColumns(QModelIndex(), self._column_count, columns - 1)
+            self._column_count = columns
+            self.endInsertColumns()
+        elif columns < self._column_count:
+            self.beginRemoveColumns(QModelIndex(), columns, self._column_count - 1)
+            self._column_count = columns
+            self._cell_roles = {k: v for k, v in self._cell_roles.items() if k[1] < columns}
+            self.endRemoveColumns()
+
+    def _shift_cell_roles(self, first: int, delta: int):
+        if self._cell_roles:
+            self._cell_roles = {
+                ((r + delta, c) if r >= first else (r, c)): roles
+                for (r, c), roles in self._cell_roles.items()
+            }
+
+
+class EuljiTableItem:
+    """을지 셀 보기 (QTableWidgetItem 호환 API, 값은 모델에 보관)
+
+    셀마다 객체를 보관하지 않고 item()/ensure_item() 호출 시 만들어 반환한다.
+    """
+
+    __slots__ = ("_table", "_row", "_col")
+
+    def __init__(self, table: "EuljiTableWidget", row: int, col: int):
+        self._table = table
+        self._row = row
+        self._col = col
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, EuljiTableItem)
+            and other._table is self._table
+            and other._row == self._row
+            and other._col == self._col
+        )
+
+    def __hash__(self):
+        return hash((id(self._table), self._row, self._col))
+
+    def __repr__(self):
+        return f"EuljiTableItem({self._row}, {self._col}, {self.text()!r})"
+
+    @property
+    def _model(self) -> EuljiTableModel:
+        return self._table.model()
+
+    def row(self) -> int:
+        return self._row
+
+    def column(self) -> int:
+        return self._col
+
+    def tableWidget(self):
+        return self._table
+
+    def text(self) -> str:
+        return self._model.text(self._row, self._col)
+
+    def setText(self, text: str):
+        self.setData(Qt.ItemDataRole.EditRole, text)
+
+    def data(self, role):
+        return self._model.cell_data(self._row, self._col, role)
+
+    def setData(self, role, value):
+        self._model.set_cell_data(self._row, self._col, role, value)
+
+    def textAlignment(self) -> int:
+        value = self.data(Qt.ItemDataRole.TextAlignmentRole)
+        if value is None:
+            return 0
+        return value.value if hasattr(value, "value") else int(value)
+
+    def setTextAlignment(self, alignment):
+        self.setData(Qt.ItemDataRole.TextAlignmentRole, alignment)
+
+    def background(self) -> QBrush:
+        value = self.data(Qt.ItemDataRole.BackgroundRole)
+        return QBrush(value) if value is not None else QBrush()
+
+    def setBackground(self, brush):
+        self.setData(Qt.ItemDataRole.BackgroundRole, QBrush(brush))
+
+    def foreground(self) -> QBrush:
+        value = self.data(Qt.ItemDataRole.ForegroundRole)
+        return QBrush(value) if value is not None else QBrush()
+
+    def setForeground(self, brush):
+        self.setData(Qt.ItemDataRole.ForegroundRole, QBrush(brush))
+
+    def font(self) -> QFont:
+        value = self.data(Qt.ItemDataRole.FontRole)
+        return QFont(value) if value is not None else QFont()
+
+    def setFont(self, font):
+        self.setData(Qt.ItemDataRole.FontRole, QFont(font))
+
+    def toolTip(self) -> str:
+        return self.data(Qt.ItemDataRole.ToolTipRole) or ""
+
+    def setToolTip(self, text: str):
+        self.setData(Qt.ItemDataRole.ToolTipRole, text)
+
+    def statusTip(self) -> str:
+        return self.data(Qt.ItemDataRole.StatusTipRole) or ""
+
+    def setStatusTip(self, text: str):
+        self.setData(Qt.ItemDataRole.StatusTipRole, text)
+
+    def checkState(self):
+        value = self.data(Qt.ItemDataRole.CheckStateRole)
+        return Qt.CheckState(value) if value is not None else Qt.CheckState.Unchecked
+
+    def setCheckState(self, state):
+        self.setData(Qt.ItemDataRole.CheckStateRole, state)
+
+    def flags(self):
+        return self._model.cell_flags(self._row, self._col)
+
+    def setFlags(self, flags):
+        self._model.set_cell_data(self._row, self._col, _FLAGS_KEY, flags)
+
+    def isSelected(self) -> bool:
+        return self._table.selectionModel().isSelected(self._model.index(self._row, self._col))
+
+    def setSelected(self, select: bool):
+        index = self._model.index(self._row, self._col)
+        command = (
+            QItemSelectionModel.SelectionFlag.Select
+            if select
+            else QItemSelectionModel.SelectionFlag.Deselect
+        )
+        self._table.selectionModel().select(index, command)
+
+    def clone(self) -> QTableWidgetItem:
+        """현재 값을 가진 독립 QTableWidgetItem"""
+        return _make_table_widget_item(self._table._cell_values(self._row, self._col))
+
+
+def _item_values(item) -> dict:
+    """QTableWidgetItem(또는 EuljiTableItem)의 값 → {역할: 값}"""
+    if isinstance(item, EuljiTableItem):
+        return item._table._cell_values(item._row, item._col)
+
+    values = {}
+    text = item.text()
+    if text:
+        values[Qt.ItemDataRole.DisplayRole] = text
+    for role in _COPY_ROLES:
+        value = item.data(role)
+        if value is not None:
+            values[role] = value
+    if item.flags() != _DEFAULT_FLAGS:
+        values[_FLAGS_KEY] = item.flags()
+    return values
+
+
+def _make_table_widget_item(values: dict) -> QTableWidgetItem:
+    item = QTableWidgetItem(values.get(Qt.ItemDataRole.DisplayRole, ""))
+    for role, value in values.items():
+        if role == _FLAGS_KEY:
+            item.setFlags(value)
+        elif role != Qt.ItemDataRole.DisplayRole:
+            item.setData(role, value)
+    return item
+
+
+def ensure_item(table, row: int, col: int):
+    """
+    셀 item 반환, 없으면 만들어 설정 (QTableWidget / EuljiTableWidget 공용)
+
+    반환된 item에 setText 등을 하면 테이블에 반영됨
+    """
+    if isinstance(table, EuljiTableWidget):
+        return table.ensure_item(row, col)
+    item = table.item(row, col)
+    if item is None:
+        item = QTableWidgetItem()
+        table.setItem(row, col, item)
+    return item
+
+
+class EuljiTableWidget(QTableView):
+    """을지 테이블 위젯 - Tab 키로 자료사전 팝업 호출 등 테이블 전용 로직 관리
+
+    가상 모델(EuljiTableModel) 기반 QTableView.
+    기존 코드와의 호환을 위해 QTableWidget의 셀 API(item/setItem/cellChanged 등)를 제공한다.
+    """
+
+    cellChanged = pyqtSignal(int, int)
+    cellClicked = pyqtSignal(int, int)
+    cellDoubleClicked = pyqtSignal(int, int)
+    cellPressed = pyqtSignal(int, int)
+    cellEntered = pyqtSignal(int, int)
+    cellActivated = pyqtSignal(int, int)
+    currentCellChanged = pyqtSignal(int, int, int, int)
+    itemChanged = pyqtSignal(object)
+    itemSelectionChanged = pyqtSignal()
 
-class EuljiTableWidget(QTableWidget):
-    """을지 테이블 위젯 - Tab 키로 자료사전 팝업 호출 등 테이블 전용 로직 관리"""
-    
     def __init__(self, parent_tab=None):
         super().__init__()
         self.parent_tab = parent_tab
-        self._log_file = "tab_debug.log"
+
+        self.setModel(EuljiTableModel(self))
+        self.model().cellEdited.connect(self._on_cell_edited)
+        self.clicked.connect(lambda index: self.cellClicked.emit(index.row(), index.column()))
+        self.doubleClicked.connect(
+            lambda index: self.cellDoubleClicked.emit(index.row(), index.column())
+        )
+        self.pressed.connect(lambda index: self.cellPressed.emit(index.row(), index.column()))
+        self.entered.connect(lambda index: self.cellEntered.emit(index.row(), index.column()))
+        self.activated.connect(lambda index: self.cellActivated.emit(index.row(), index.column()))
+        self.selectionModel().currentChanged.connect(self._on_current_changed)
+        self.selectionModel().selectionChanged.connect(
+            lambda *args: self.itemSelectionChanged.emit()
+        )
+
         self._log("EuljiTableWidget initialized")
-    
+
     def set_parent_tab(self, parent_tab):
         """부모 탭 설정 (테이블 생성 후 설정)"""
         self.parent_tab = parent_tab
         self._log(f"parent_tab set: {parent_tab}")
-    
+
     def _log(self, msg):
-        """파일에 디버그 로그 기록"""
-        try:
-            import datetime
-            with open(self._log_file, "a", encoding="utf-8") as f:
-                ts = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
-                f.write(f"[{ts}] EuljiTable: {msg}\n")
-        except:
-            pass
-    
+        """디버그 로그 기록 (tab_debug.log, 백그라운드 기록)"""
+        _logger.debug("EuljiTable: %s", msg)
+
     def focusNextPrevChild(self, next):
         """TAB 키 가로채기: TableEventFilter에서 중앙 집중 처리하므로 기본 동작 수행"""
         # [REFACTORED] 로직을 TableEventFilter로 통합하여 중복 방지
         return super().focusNextPrevChild(next)
-    
+
     def _show_reference_db_popup(self, row, col):
         """자료사전 DB 팝업 호출 (TableEventFilter._show_popup_safe와 통합 권장)"""
         if self.parent_tab:
             # 부모 탭의 통합 호출 메서드 사용
             if hasattr(self.parent_tab, "_show_reference_popup"):
                 self.parent_tab._show_reference_popup(row, col)
+
+    # ---------- 공종 데이터 ----------
+
+    def load_columns(self, columns: GongjongColumns = None):
+        """공종 데이터 표시 (셀 객체 생성 없이 모델 리셋)"""
+        self.model().load_columns(columns)
+
+    def snapshot_columns(self, pool: StringPool = None) -> GongjongColumns:
+        """표시 중인 데이터의 저장용 사본 (빈 행 제외)"""
+        return self.model().snapshot(pool)
+
+    def flush_columns(self, target: GongjongColumns = None, pool: StringPool = None) -> GongjongColumns:
+        """
+        수정된 행만 저장본에 반영
+
+        Args:
+            target: 현재 저장본 (불러온 저장본이 아니면 전체 사본 생성)
+            pool: 전체 사본에 사용할 문자열 풀
+
+        Returns:
+            최신 저장본
+        """
+        return self.model().flush(target, pool)
+
+    # ---------- QTableWidget 호환 API ----------
+
+    def _on_cell_edited(self, row, col):
+        self.cellChanged.emit(row, col)
+        self.itemChanged.emit(EuljiTableItem(self, row, col))
+
+    def _on_current_changed(self, current, previous):
+        self.currentCellChanged.emit(
+            current.row(), current.column(), previous.row(), previous.column()
+        )
+
+    def _in_range(self, row, col) -> bool:
+        return 0 <= row < self.rowCount() and 0 <= col < self.columnCount()
+
+    def _cell_values(self, row, col) -> dict:
+        model = self.model()
+        values = dict(model._cell_roles.get((row, col), {}))
+        text = model.text(row, col)
+        if text:
+            values[Qt.ItemDataRole.DisplayRole] = text
+        return values
+
+    def _index_of(self, item):
+        if item is None:
+            return QModelIndex()
+        return self.model().index(item.row(), item.column())
+
+    def rowCount(self) -> int:
+        return self.model().rowCount()
+
+    def columnCount(self) -> int:
+        return self.model().columnCount()
+
+    def setRowCount(self, rows: int):
+        self.model().set_row_count(rows)
+
+    def setColumnCount(self, columns: int):
+        self.model().set_column_count(columns)
+
+    def insertRow(self, row: int):
+        self.model().insertRows(row, 1)
+
+    def removeRow(self, row: int):
+        self.model().removeRows(row, 1)
+
+    def clearContents(self):
+        self.model().clear_contents()
+
+    def setHorizontalHeaderLabels(self, labels):
+        self.model().set_header_labels(labels)
+
+    def item(self, row: int, col: int):
+        """셀 보기 반환 (범위 밖이거나 텍스트/데이터가 없는 셀이면 None)"""
+        if not self._in_range(row, col) or not self.model().has_cell(row, col):
+            return None
+        return EuljiTableItem(self, row, col)
+
+    def ensure_item(self, row: int, col: int):
+        """
+        빈 셀도 값을 쓸 수 있는 셀 보기 반환 (범위 밖이면 None)
+
+        QTableWidget의 "item()이 없으면 QTableWidgetItem을 만들어 setItem" 대신 사용
+        (setItem은 값만 복사하므로 넘긴 객체를 나중에 수정해도 반영되지 않음)
+        """
+        if not self._in_range(row, col):
+            return None
+        return EuljiTableItem(self, row, col)
+
+    def setItem(self, row: int, col: int, item):
+        """셀 값을 item의 값으로 교체 (item 객체는 보관하지 않음)"""
+        if item is None or not self._in_range(row, col):
+            return
+        self.model().replace_cell(row, col, _item_values(item))
+
+    def takeItem(self, row: int, col: int):
+        if not self._in_range(row, col) or not self.model().has_cell(row, col):
+            return None
+        return _make_table_widget_item(self.model().take_cell(row, col))
+
+    def itemAt(self, *args):
+        point = args[0] if len(args) == 1 else QPoint(*args)
+        return self.itemFromIndex(self.indexAt(point))
+
+    def itemFromIndex(self, index):
+        if not index.isValid():
+            return None
+        return self.item(index.row(), index.column())
+
+    def indexFromItem(self, item):
+        return self._index_of(item)
+
+    def row(self, item) -> int:
+        return item.row() if item is not None else -1
+
+    def column(self, item) -> int:
+        return item.column() if item is not None else -1
+
+    def currentRow(self) -> int:
+        return self.currentIndex().row()
+
+    def currentColumn(self) -> int:
+        return self.currentIndex().column()
+
+    def currentItem(self):
+        return self.itemFromIndex(self.currentIndex())
+
+    def setCurrentCell(self, row: int, col: int, command=None):
+        index = self.model().index(row, col)
+        if command is None:
+            self.setCurrentIndex(index)
+        else:
+            self.selectionModel().setCurrentIndex(index, command)
+
+    def setCurrentItem(self, item):
+        self.setCurrentIndex(self._index_of(item))
+
+    def editItem(self, item):
+        if item is not None:
+            self.edit(self._index_of(item))
+
+    def openPersistentEditor(self, item):
+        super().openPersistentEditor(self._index_of(item))
+
+    def closePersistentEditor(self, item):
+        super().closePersistentEditor(self._index_of(item))
+
+    def isPersistentEditorOpen(self, item) -> bool:
+        return super().isPersistentEditorOpen(self._index_of(item))
+
+    def scrollToItem(self, item, hint=QAbstractItemView.ScrollHint.EnsureVisible):
+        if item is not None:
+            self.scrollTo(self._index_of(item), hint)
+
+    def visualItemRect(self, item):
+        return self.visualRect(self._index_of(item))
+
+    def cellWidget(self, row: int, col: int):
+        return self.indexWidget(self.model().index(row, col))
+
+    def setCellWidget(self, row: int, col: int, widget):
+        self.setIndexWidget(self.model().index(row, col), widget)
+
+    def removeCellWidget(self, row: int, col: int):
+        self.setIndexWidget(self.model().index(row, col), None)
+
+    def selectedItems(self) -> list:
+        items = (self.itemFromIndex(index) for index in self.selectedIndexes())
+        return [item for item in items if item is not None]
+
+    def selectedRanges(self) -> list:
+        return [
+            QTableWidgetSelectionRange(r.top(), r.left(), r.bottom(), r.right())
+            for r in self.selectionModel().selection()
+        ]
+
+    def setRangeSelected(self, selection_range, select: bool):
+        model = self.model()
+        selection = QItemSelection(
+            model.index(selection_range.topRow(), selection_range.leftColumn()),
+            model.index(selection_range.bottomRow(), selection_range.rightColumn()),
+        )
+        command = (
+            QItemSelectionModel.SelectionFlag.Select
+            if select
+            else QItemSelectionModel.SelectionFlag.Deselect
+        )
+        self.selectionModel().select(selection, command)
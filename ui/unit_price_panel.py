@@ -1,7 +1,5 @@
 # -*- coding: utf-8 -*-
 import os
-import re
-import json
 from datetime import datetime
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
@@ -16,6 +14,7 @@ from utils.column_settings import (
     UNIT_PRICE_COLS, DEFAULT_ROW_HEIGHT,
     setup_common_table, CleanStyleDelegate, CenterAlignmentDelegate
 )
+from core.unit_price_store import active_store, chunk_project_name
 
 class UnitPricePanel(QWidget):
     """
@@ -34,9 +33,7 @@ class UnitPricePanel(QWidget):
         
         # 경로 설정
         root_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        self.debug_log = os.path.join(root_path, "debug_trigger.log")
         self.base_chunk_dir = os.path.join(root_path, "data", "unit_price_chunks")
-        os.makedirs(self.base_chunk_dir, exist_ok=True)
         
         self._init_ui()
         
@@ -82,43 +79,34 @@ class UnitPricePanel(QWidget):
         self._load_data(item_name)
         self.current_item_name = item_name
 
-    def _get_chunk_file_path(self, item_name):
-        """프로젝트별/세션별 저장 경로 생성"""
-        project_name = ""
-        if self.parent_tab:
-            project_label = getattr(self.parent_tab, "lbl_project_name", None)
-            if project_label:
-                project_name = project_label.text().replace("Project: ", "").strip()
-        
-        if not project_name or project_name == "-":
-            project_name = "_unsaved_session_"
-            
-        safe_p_name = re.sub(r'[\\/*?:"<>|]', "_", project_name).strip()
-        project_dir = os.path.join(self.base_chunk_dir, safe_p_name)
-        os.makedirs(project_dir, exist_ok=True)
-        
+    @property
+    def chunk_store(self):
+        """산출일위표 조각 저장소 (프로젝트 파일이 열려 있으면 그 파일 안의 저장소)"""
+        return active_store(getattr(self, "parent_tab", None), self.base_chunk_dir)
+
+    def _get_chunk_key(self, item_name):
+        """프로젝트별/세션별 조각 저장소 키 (프로젝트, 항목명)"""
+        project_name = chunk_project_name(self.parent_tab)
+
         if not item_name:
             if self.target_row >= 0:
                 item_name = f"unnamed_row_{self.target_row}"
             else:
                 return None
                 
-        safe_name = re.sub(r'[\\/*?:"<>|]', "_", item_name).strip()
-        if not safe_name: return None
-        return os.path.join(project_dir, f"{safe_name}.json")
+        return self.chunk_store.key(project_name, item_name)
 
     def _load_data(self, item_name):
         try:
             self.table.setRowCount(0)
             orig_blocked = self.table.blockSignals(True)
             
-            file_path = self._get_chunk_file_path(item_name)
+            chunk_key = self._get_chunk_key(item_name)
             loaded = False
             
-            if file_path and os.path.exists(file_path):
+            if chunk_key:
                 try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
+                    data = self.chunk_store.get(*chunk_key)
                     
                     if isinstance(data, list):
                         for row_data in data:
@@ -159,8 +147,8 @@ class UnitPricePanel(QWidget):
     def _save_data(self):
         try:
             item_name = self.current_item_name if hasattr(self, 'current_item_name') else ""
-            file_path = self._get_chunk_file_path(item_name)
-            if not file_path: return
+            chunk_key = self._get_chunk_key(item_name)
+            if not chunk_key: return
             
             data = []
             has_valid_data = False
@@ -186,11 +174,7 @@ class UnitPricePanel(QWidget):
                     "qty": qty_text
                 })
             
-            if has_valid_data:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
-            elif os.path.exists(file_path):
-                os.remove(file_path)
+            self.chunk_store.put(*chunk_key, data if has_valid_data else None)
                 
         except Exception as e:
             print(f"[ERROR] _save_data failed: {e}")
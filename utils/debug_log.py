@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+디버그 로그 (Debug Log)
+=====================
+셀 클릭/키 입력 같은 화면 이벤트 경로에서 로그 파일을 직접 열지 않고
+큐에 넣은 뒤 백그라운드 스레드 하나가 파일에 기록
+
+기능:
+- 모듈별 로거: get_logger("trigger"), get_logger("eulji_table", TAB_LOG) ...
+- 기존 파일 형식 유지 (debug_trigger.log: [날짜 시각] / tab_debug.log: [HH:MM:SS.mmm])
+- QueueHandler → QueueListener 기록 스레드 (파일은 열어 둔 채 재사용)
+- 모듈별 레벨: 환경 변수 OASIS_LOG="DEBUG,trigger=INFO,eulji_table=OFF" 또는 set_level()
+- 끄기: OASIS_LOG=OFF → 로거 레벨에서 바로 반환 (기록된 로그가 없으면 스레드/파일도 생성 안 함)
+- 프로그램 종료 시 남은 로그 기록 (atexit)
+
+사용:
+    _log = get_logger("trigger")
+    _log.debug("Trigger: row=%s, col=%s", row, col)   # 문자열 조립은 레벨 통과 시에만
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+TRIGGER_LOG = "debug_trigger.log"
+TAB_LOG = "tab_debug.log"
+
+# 로그 파일 위치 (프로젝트 루트)
+LOG_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOGGER_PREFIX = "oasis."
+ENV_VAR = "OASIS_LOG"
+
+# 끈 로거 레벨 (어떤 호출도 통과하지 못함)
+OFF = logging.CRITICAL + 10
+
+# 파일별 시각 형식
+_TIME_FORMATS = {
+    TRIGGER_LOG: lambda stamp: str(stamp),
+    TAB_LOG: lambda stamp: stamp.strftime("%H:%M:%S.%f")[:-3],
+}
+
+
+def _parse_level(text: str) -> int:
+    text = text.strip().upper()
+    if text in ("OFF", "0", "NONE", "FALSE"):
+        return OFF
+    if text.isdigit():
+        return int(text)
+    level = logging.getLevelName(text)
+    return level if isinstance(level, int) else logging.DEBUG
+
+
+def parse_levels(spec: str):
+    """
+    "DEBUG,trigger=INFO,eulji_table=OFF" → (기본 레벨, {모듈: 레벨})
+
+    이름 없는 항목은 기본 레벨, 빈 문자열이면 DEBUG
+    """
+    default = logging.DEBUG
+    levels: Dict[str, int] = {}
+    for part in (spec or "").split(","):
+        if not part.strip():
+            continue
+        if "=" in part:
+            name, level = part.split("=", 1)
+            levels[name.strip()] = _parse_level(level)
+        else:
+            default = _parse_level(part)
+    return default, levels
+
+
+class _FileWriter(logging.Handler):
+    """기록 스레드 전용 핸들러 — 로거 이름으로 파일을 골라 열린 파일에 기록"""
+
+    def __init__(self):
+        super().__init__()
+        self._streams = {}
+
+    def emit(self, record):
+        filename = _routes.get(record.name, TRIGGER_LOG)
+        try:
+            stream = self._streams.get(filename)
+            if stream is None:
+                stream = self._streams[filename] = open(
+                    os.path.join(LOG_DIR, filename), "a", encoding="utf-8"
+                )
+            stamp = _TIME_FORMATS.get(filename, str)(datetime.fromtimestamp(record.created))
+            stream.write(f"[{stamp}] {record.getMessage()}\n")
+            stream.flush()
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        for stream in self._streams.values():
+            try:
+                stream.close()
+            except OSError:
+                pass
+        self._streams.clear()
+        super().close()
+
+
+class _QueueHandler(QueueHandler):
+    """큐에 넣기만 하는 핸들러 — 기록 스레드는 처음 통과한 로그가 있을 때 시작"""
+
+    def enqueue(self, record):
+        if _listener is None:
+            _ensure_listener()
+        self.queue.put_nowait(record)
+
+
+_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+_queue_handler = _QueueHandler(_queue)
+_routes: Dict[str, str] = {}
+_listener: Optional[QueueListener] = None
+_lock = threading.Lock()
+_default_level, _levels = parse_levels(os.environ.get(ENV_VAR, ""))
+
+
+def _ensure_listener():
+    """기록 스레드 시작 (shutdown 전까지 1회)"""
+    global _listener
+    with _lock:
+        if _listener is None:
+            _listener = QueueListener(_queue, _FileWriter())
+            _listener.start()
+
+
+def _level_for(name: str) -> int:
+    """모듈 레벨 ("a.b"에 설정이 없으면 "a" 설정, 그것도 없으면 기본 레벨)"""
+    while name:
+        if name in _levels:
+            return _levels[name]
+        name = name.rpartition(".")[0]
+    return _default_level
+
+
+def get_logger(name: str, filename: str = TRIGGER_LOG) -> logging.Logger:
+    """
+    모듈 로거 (같은 이름은 같은 로거)
+
+    filename: 기록할 파일 (TRIGGER_LOG / TAB_LOG)
+    """
+    logger = logging.getLogger(LOGGER_PREFIX + name)
+    _routes[logger.name] = filename
+    if not logger.handlers:
+        logger.addHandler(_queue_handler)
+        logger.propagate = False
+        logger.setLevel(_level_for(name))
+    return logger
+
+
+def set_level(name: str, level) -> None:
+    """모듈 로그 레벨 변경 (level: 숫자 또는 "DEBUG"/"INFO"/"OFF" ...)"""
+    level = _parse_level(level) if isinstance(level, str) else int(level)
+    _levels[name] = level
+    logging.getLogger(LOGGER_PREFIX + name).setLevel(level)
+
+
+def shutdown():
+    """큐에 남은 로그를 모두 기록하고 파일 닫기 (다음 로그 때 다시 시작)"""
+    global _listener
+    with _lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+atexit.register(shutdown)
+
+
+# ============== 테스트 ==============
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    LOG_DIR = tempfile.mkdtemp()
+
+    trigger = get_logger("test_trigger")
+    tab = get_logger("test_tab", TAB_LOG)
+    quiet = get_logger("test_quiet")
+    set_level("test_quiet", "OFF")
+    _levels["test_parent"] = logging.WARNING
+    child = get_logger("test_parent.child")
+
+    trigger.debug("Trigger: row=%s, col=%s", 3, 2)
+    tab.debug("EuljiTable: %s", "initialized")
+    quiet.debug("보이면 안 됨")
+    quiet.error("보이면 안 됨")
+
+    # 끈 로거 호출 비용 (레벨 확인만)
+    started = time.perf_counter()
+    for i in range(100000):
+        quiet.debug("row=%s", i)
+    disabled_us = (time.perf_counter() - started) * 10
+
+    # 호출 스레드는 파일을 건드리지 않음 (큐에 넣고 바로 반환)
+    started = time.perf_counter()
+    for i in range(2000):
+        trigger.debug("burst %d", i)
+    enqueue_us = (time.perf_counter() - started) * 500
+
+    shutdown()
+    with open(os.path.join(LOG_DIR, TRIGGER_LOG), encoding="utf-8") as f:
+        trigger_lines = f.read().splitlines()
+    with open(os.path.join(LOG_DIR, TAB_LOG), encoding="utf-8") as f:
+        tab_lines = f.read().splitlines()
+
+    trigger.info("재시작")
+    shutdown()
+    with open(os.path.join(LOG_DIR, TRIGGER_LOG), encoding="utf-8") as f:
+        restarted = f.read().splitlines()[-1]
+
+    cases = [
+        (parse_levels("INFO,trigger=OFF,eulji_table=warning"),
+         (logging.INFO, {"trigger": OFF, "eulji_table": logging.WARNING}), "레벨 설정 해석"),
+        (parse_levels(""), (logging.DEBUG, {}), "기본 레벨"),
+        (child.level, logging.WARNING, "하위 모듈은 상위 레벨 사용"),
+        (trigger_lines[0].endswith("] Trigger: row=3, col=2"), True, "debug_trigger.log 기록"),
+        (len(trigger_lines[0].split("]")[0]), len(f"[{datetime.now()}"), "날짜 시각 형식 유지"),
+        (tab_lines, [f"[{tab_lines[0][1:13]}] EuljiTable: initialized"], "tab_debug.log 형식 유지"),
+        (any("보이면" in line for line in trigger_lines), False, "끈 로거는 기록 안 함"),
+        (len(trigger_lines), 2001, "종료 시 큐 전부 기록"),
+        (restarted.endswith("재시작"), True, "shutdown 후 재시작"),
+        (disabled_us < 5, True, f"끈 로거 호출 {disabled_us:.2f}µs"),
+        (enqueue_us < 100, True, f"큐 기록 호출 {enqueue_us:.2f}µs"),
+    ]
+
+    print("=" * 60)
+    print("디버그 로그 테스트")
+    print("=" * 60)
+    for i, (result, expected, desc) in enumerate(cases, 1):
+        status = "✅" if result == expected else "❌"
+        print(f"{i:2d}. {status} {desc}: {result} (기대: {expected})")
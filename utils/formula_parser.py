@@ -9,18 +9,37 @@
 - 문자 포함 수식: "2.3+↗2.3+ 귀로(2.9-1.8)" → 5.7
 - 꺽쇠 괄호: "<2.1+6.3+1.2>" → 1구간 (통째로 계산)
 - 괄호 포함: "(4.2+8.7+2.4)*2" → 30.6
+
+계산 방식:
+- 토크나이저 + 계산 트리 컴파일 (eval 미사용)
+- 수식 원문 기준 LRU 캐시: evaluate_formula() → (값, 구간 수, 꺽쇠 구간)
+- 구간 수/꺽쇠 구간은 계산 전 1회 순회(_scan_formula)에서 함께 산출
+- 일괄 계산: evaluate_many() → 중복 제거 + 단순 합계식 벡터 계산 (NumPy 배열)
 """
 
 import re
-import ast
-import sys
+import operator
+from functools import lru_cache
+from typing import NamedTuple
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+# 2byte 문자: 일본어(\u3040-\u30ff), 한자(\u4e00-\u9fff), 한글(가-힣)
+_WIDE_CHAR_RE = re.compile("[\u3040-\u30ff\u4e00-\u9fff\uac00-\ud7a3]+")
 
 
 def calc_byte_length(text: str) -> int:
     """
     문자열의 바이트 길이 계산
-    - 한글/한자/특수문자: 2byte
-    - 영문/숫자/연산자: 1byte
+    - 한글/한자/일본어: 2byte
+    - 영문/숫자/연산자 등 그 외 문자: 1byte
 
     Args:
         text: 입력 문자열
@@ -30,25 +49,449 @@ def calc_byte_length(text: str) -> int:
     """
     if not text:
         return 0
+    if text.isascii():
+        return len(text)
+
+    # 글자 수 + 2byte 문자 수 (연속 구간 단위로 한 번에 셈)
+    return len(text) + sum(map(len, _WIDE_CHAR_RE.findall(text)))
 
-    byte_count = 0
-    for char in text:
-        # 한글 (가-힣): 2byte
-        if "가" <= char <= "힣":
-            byte_count += 2
-        # 한자: 2byte
-        elif "\u4e00" <= char <= "\u9fff":
-            byte_count += 2
-        # 일본어: 2byte
-        elif "\u3040" <= char <= "\u30ff":
-            byte_count += 2
-        # 기타 CJK 확장: 2byte
-        elif "\uac00" <= char <= "\ud7a3":
-            byte_count += 2
-        # 기본 ASCII (영문, 숫자, 특수문자): 1byte
+
+class FormulaLineBuffer:
+    """
+    산출수식 연속입력 버퍼 (바이트 수 누적)
+
+    Enter 연속입력 시 수식 끝에 "+항"이 덧붙는 경우가 대부분이므로,
+    이전 텍스트에 이어진 부분만 바이트 수를 계산한다.
+    """
+
+    def __init__(self, text: str = "", max_bytes: int = 40):
+        self.max_bytes = max_bytes
+        self.reset(text)
+
+    def reset(self, text: str = ""):
+        """텍스트 전체 다시 계산"""
+        self._text = text
+        self._byte_length = calc_byte_length(text)
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @property
+    def byte_length(self) -> int:
+        return self._byte_length
+
+    def append(self, term: str):
+        """텍스트 끝에 추가 (추가분만 계산)"""
+        self._text += term
+        self._byte_length += calc_byte_length(term)
+
+    def sync(self, text: str):
+        """
+        셀의 현재 텍스트와 동기화
+
+        이전 텍스트로 시작하면 뒷부분만 계산하고, 그 외(수정/삭제)는 전체 다시 계산
+        """
+        if text == self._text:
+            return
+        if self._text and text.startswith(self._text):
+            self.append(text[len(self._text) :])
         else:
-            byte_count += 1
-    return byte_count
+            self.reset(text)
+
+    def fits(self, suffix: str = "") -> bool:
+        """suffix를 덧붙여도 max_bytes 이내인지 여부"""
+        return self._byte_length + calc_byte_length(suffix) <= self.max_bytes
+
+
+# ============== 수식 엔진 (토크나이저 + 컴파일 트리 + 캐시) ==============
+# 같은 수식 문자열은 결과가 항상 같으므로, 원문 기준 LRU 캐시에서 값과 구간 수를 함께 반환한다.
+# 2만 행 프로젝트 재계산 시 변경되지 않은 수식은 딕셔너리 조회 1회로 끝난다.
+
+FORMULA_CACHE_SIZE = 32768  # 캐시 최대 항목 수 (수식 문자열 기준)
+
+# 갑지 변수: $H(층고), $L(천정내 높이) - 값이 비어 있으면 기본값 사용
+VARIABLE_NAMES = ("$H", "$L")
+DEFAULT_VARIABLES = {"$H": "3", "$L": "1.5"}
+
+
+class FormulaResult(NamedTuple):
+    """수식 계산 결과 (값 + 구간 수 + 꺽쇠 구간 내용)"""
+
+    value: float
+    sections: int
+    groups: tuple = ()
+
+
+EMPTY_RESULT = FormulaResult(0.0, 0)
+
+# 정규화 단계에서 사용하는 패턴 (모듈 로드 시 1회 컴파일)
+_ANGLE_BRACKET_RE = re.compile(r"<([^>]+)>")
+_NON_FORMULA_CHAR_RE = re.compile(r"[^\d\+\-\*\/\.\(\)\s]")
+_OPERATOR_FIXES = [
+    (re.compile(r"\+\+"), "+"),
+    (re.compile(r"\+\-"), "-"),
+    (re.compile(r"-\+"), "-"),
+    (re.compile(r"--"), "+"),
+    (re.compile(r"\*\-"), "*"),
+    (re.compile(r"\-\*"), "*"),
+]
+_EMPTY_PAREN_RE = re.compile(r"\(\s*\)")
+_LEADING_OP_RE = re.compile(r"^[\+\-\*\/]+")
+_TRAILING_OP_RE = re.compile(r"[\+\-\*\/]+$")
+_PAREN_NUMBER_RE = re.compile(r"\((\d+\.?\d*)\)")
+_NUMBER_ONLY_RE = re.compile(r"^[\d\.]+$")
+_ALLOWED_EXPR_RE = re.compile(r"^[\d\+\-\*\/\.\(\)\s]+$")
+
+# 구간 수 계산용 패턴: 꺽쇠 구간 또는 '+' 구분자를 한 번에 순회
+_SECTION_SPLIT_RE = re.compile(r"<([^>]+)>|\+")
+_STAR_SECTION_RE = re.compile(r"(\d+\.?\d*)\*(\d+)")
+_DIGIT_RE = re.compile(r"\d")
+_NUMBER_RE = re.compile(r"\d+\.?\d*")
+
+# 토큰 패턴: 숫자 / 연산자(** // 우선) / 괄호 / 공백
+_TOKEN_RE = re.compile(
+    r"(?P<num>[0-9]+\.?[0-9]*|\.[0-9]+)"
+    r"|(?P<op>\*\*|//|[\+\-\*/])"
+    r"|(?P<lparen>\()"
+    r"|(?P<rparen>\))"
+    r"|(?P<space>[ \t\f]+)"
+    r"|(?P<newline>[\r\n]+)"
+)
+
+_BINARY_OPS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "//": operator.floordiv,
+    "**": operator.pow,
+}
+
+
+class FormulaSyntaxError(ValueError):
+    """정규화된 수식을 해석할 수 없음 (계산 결과 0.0으로 처리)"""
+
+
+def _scan_formula(text: str):
+    """
+    산출수식 1회 순회: 꺽쇠 구간 치환 + 구간 수 계산
+
+    '+'로 나뉜 토큰 단위로 구간을 센다.
+    - 꺽쇠 구간이 포함된 토큰: 1구간
+    - "2.3*3" 형태가 있는 토큰: *뒤 숫자만큼
+    - 숫자가 있는 토큰: 1구간
+
+    Returns:
+        tuple: (구간 수, 꺽쇠 구간 내용 튜플, 꺽쇠를 "(합계)"로 치환한 수식)
+    """
+    sections = 0
+    groups = []
+    parts = []
+    pos = 0
+    token_start = 0
+    token_has_angle = False
+
+    for match in _SECTION_SPLIT_RE.finditer(text):
+        start = match.start()
+        parts.append(text[pos:start])
+        content = match.group(1)
+        if content is not None:
+            # 꺽쇠 안의 내용은 1개 구간으로 취급: "<2.1+6.3+1.2>" → "(9.6)"
+            groups.append(content)
+            parts.append(f"({calculate_numbers_only(content)})")
+            token_has_angle = True
+        else:
+            parts.append("+")
+            sections += _token_sections(text, token_start, start, token_has_angle)
+            token_start = match.end()
+            token_has_angle = False
+        pos = match.end()
+
+    parts.append(text[pos:])
+    sections += _token_sections(text, token_start, len(text), token_has_angle)
+    return sections, tuple(groups), "".join(parts)
+
+
+def _token_sections(text: str, start: int, end: int, has_angle: bool) -> int:
+    """'+' 사이 토큰 하나의 구간 수"""
+    if has_angle:
+        return 1
+    star_match = _STAR_SECTION_RE.search(text, start, end)
+    if star_match:
+        return int(star_match.group(2))
+    return 1 if _DIGIT_RE.search(text, start, end) else 0
+
+
+def _normalize_formula(text: str) -> str:
+    """
+    산출수식을 계산 가능한 수식 문자열로 정리
+    (꺽쇠 치환, 문자 제거, 연속 연산자/빈 괄호/앞뒤 연산자 정리)
+
+    Args:
+        text: 산출수식 ('@' 처리 및 변수 치환이 끝난 상태)
+
+    Returns:
+        str: 정리된 수식 (예: "2.3+↗2.3+ 귀로(2.9-1.8)" → "2.3+2.3+ (2.9-1.8)")
+    """
+    # 꺽쇠 안의 내용은 1개 구간으로 취급: "<2.1+6.3+1.2>" → "(9.6)"
+    text = _ANGLE_BRACKET_RE.sub(
+        lambda m: f"({calculate_numbers_only(m.group(1))})", text
+    )
+    return _clean_expression(text)
+
+
+def _clean_expression(text: str) -> str:
+    """꺽쇠 치환이 끝난 수식에서 문자 제거 및 연산자 정리"""
+    # 숫자, 연산자, 소수점, 괄호, 공백만 보존
+    cleaned = _NON_FORMULA_CHAR_RE.sub("", text)
+
+    # 연속된 연산자 정리: "++" → "+", "+-" → "-", "--" → "+" ...
+    for pattern, repl in _OPERATOR_FIXES:
+        cleaned = pattern.sub(repl, cleaned)
+
+    cleaned = cleaned.strip()
+    cleaned = _EMPTY_PAREN_RE.sub("", cleaned)
+    cleaned = _LEADING_OP_RE.sub("", cleaned)
+    cleaned = _TRAILING_OP_RE.sub("", cleaned)
+
+    # 숫자 하나만 감싼 괄호 제거: "(3.5)" → "3.5"
+    while True:
+        new_cleaned = _PAREN_NUMBER_RE.sub(r"\1", cleaned)
+        if new_cleaned == cleaned:
+            break
+        cleaned = new_cleaned
+
+    return cleaned
+
+
+def _tokenize(expression: str) -> list:
+    """
+    정리된 수식을 토큰 목록으로 분해
+
+    Returns:
+        list: [(종류, 값), ...] 종류는 "num", "op", "(", ")"
+
+    Raises:
+        FormulaSyntaxError: 해석할 수 없는 문자/숫자 형식
+    """
+    tokens = []
+    depth = 0
+    pos = 0
+    length = len(expression)
+    line_break = False  # 괄호 밖 줄바꿈 이후 여부
+    while pos < length:
+        match = _TOKEN_RE.match(expression, pos)
+        if not match:
+            raise FormulaSyntaxError(f"잘못된 문자: {expression[pos]!r}")
+        kind = match.lastgroup
+        value = match.group()
+        pos = match.end()
+
+        if kind == "newline":
+            if depth <= 0:
+                line_break = True
+            continue
+        if line_break:
+            # 괄호 밖의 줄바꿈은 수식 앞뒤의 빈 줄로만 허용 (예: "\n3.5", "3.5\n")
+            if kind == "space" and pos < length and expression[pos] in "\r\n":
+                continue
+            if tokens or kind == "space":
+                raise FormulaSyntaxError("괄호 밖의 줄바꿈")
+            line_break = False
+
+        if kind == "num":
+            if "." in value:
+                tokens.append(("num", float(value)))
+            else:
+                # 0으로 시작하는 정수(예: 012)는 허용하지 않음
+                if value[0] == "0" and value.strip("0"):
+                    raise FormulaSyntaxError(f"잘못된 숫자: {value}")
+                tokens.append(("num", int(value)))
+        elif kind == "op":
+            tokens.append(("op", value))
+        elif kind == "lparen":
+            depth += 1
+            tokens.append(("(", value))
+        elif kind == "rparen":
+            depth -= 1
+            tokens.append((")", value))
+    return tokens
+
+
+class _ExpressionCompiler:
+    """토큰 목록 → 계산 트리 (재귀 하강 파서)
+
+    트리 노드:
+        ("num", 값)
+        ("neg", 노드) / ("pos", 노드)
+        (연산자 함수, 왼쪽 노드, 오른쪽 노드)
+
+    연산자 우선순위와 결합 방향은 파이썬 산술식과 동일하다.
+    """
+
+    def __init__(self, tokens: list):
+        self.tokens = tokens
+        self.pos = 0
+
+    def compile(self):
+        if not self.tokens:
+            raise FormulaSyntaxError("빈 수식")
+        node = self._expr()
+        if self.pos != len(self.tokens):
+            raise FormulaSyntaxError("수식 끝에 해석되지 않은 토큰")
+        return node
+
+    def _peek_op(self, *ops):
+        if self.pos < len(self.tokens):
+            kind, value = self.tokens[self.pos]
+            if kind == "op" and value in ops:
+                return value
+        return None
+
+    def _expr(self):
+        node = self._term()
+        while True:
+            op = self._peek_op("+", "-")
+            if op is None:
+                return node
+            self.pos += 1
+            node = (_BINARY_OPS[op], node, self._term())
+
+    def _term(self):
+        node = self._factor()
+        while True:
+            op = self._peek_op("*", "/", "//")
+            if op is None:
+                return node
+            self.pos += 1
+            node = (_BINARY_OPS[op], node, self._factor())
+
+    def _factor(self):
+        op = self._peek_op("+", "-")
+        if op is not None:
+            self.pos += 1
+            return ("neg" if op == "-" else "pos", self._factor())
+        return self._power()
+
+    def _power(self):
+        node = self._primary()
+        if self._peek_op("**"):
+            self.pos += 1
+            # 거듭제곱은 오른쪽 결합, 지수에는 단항 부호 허용
+            node = (operator.pow, node, self._factor())
+        return node
+
+    def _primary(self):
+        if self.pos >= len(self.tokens):
+            raise FormulaSyntaxError("피연산자 누락")
+        kind, value = self.tokens[self.pos]
+        self.pos += 1
+        if kind == "num":
+            return ("num", value)
+        if kind == "(":
+            node = self._expr()
+            if self.pos >= len(self.tokens) or self.tokens[self.pos][0] != ")":
+                raise FormulaSyntaxError("닫는 괄호 누락")
+            self.pos += 1
+            return node
+        raise FormulaSyntaxError(f"예상치 못한 토큰: {value}")
+
+
+def compile_expression(expression: str):
+    """
+    정리된 수식 문자열을 계산 트리로 컴파일
+
+    Args:
+        expression: 숫자/연산자/괄호로만 구성된 수식 (예: "3.5+2.1*4")
+
+    Returns:
+        tuple: 계산 트리 (evaluate_tree로 계산)
+
+    Raises:
+        FormulaSyntaxError: 문법 오류
+    """
+    return _ExpressionCompiler(_tokenize(expression)).compile()
+
+
+def evaluate_tree(node):
+    """컴파일된 계산 트리를 계산 (int/float 연산은 파이썬 규칙 그대로)"""
+    head = node[0]
+    if head == "num":
+        return node[1]
+    if head == "neg":
+        return -evaluate_tree(node[1])
+    if head == "pos":
+        return +evaluate_tree(node[1])
+    return head(evaluate_tree(node[1]), evaluate_tree(node[2]))
+
+
+def _evaluate_normalized(cleaned: str) -> float:
+    """정리된 수식 계산 (실패 시 0.0)"""
+    if not cleaned or cleaned.strip() == "":
+        return 0.0
+
+    try:
+        # 숫자만 있는 경우 (예: "42" 또는 "3.14")
+        if _NUMBER_ONLY_RE.match(cleaned):
+            return float(cleaned)
+        return safe_eval(cleaned)
+    except Exception:
+        return 0.0
+
+
+@lru_cache(maxsize=FORMULA_CACHE_SIZE)
+def _evaluate_cached(text: str, strip_at: bool) -> FormulaResult:
+    """
+    원문 수식 기준 캐시 계산
+
+    Args:
+        text: 산출수식 원문 (변수 치환 후)
+        strip_at: True면 '@'를 제거 후 계산, False면 '@' 포함 시 0.0
+    """
+    if not text or text.strip() == "":
+        return EMPTY_RESULT
+
+    sections, groups, expression = _scan_formula(text)
+
+    try:
+        if "@" in text:
+            if not strip_at:
+                # @는 수량 없음을 의미하므로 0 반환
+                return FormulaResult(0.0, sections, groups)
+            # '@' 제거 후 꺽쇠 구간이 달라질 수 있으므로 다시 정리
+            expression = _normalize_formula(text.replace("@", ""))
+        else:
+            expression = _clean_expression(expression)
+        value = _evaluate_normalized(expression)
+    except Exception:
+        value = 0.0
+    return FormulaResult(value, sections, groups)
+
+
+def evaluate_formula(text: str, variables: dict = None) -> FormulaResult:
+    """
+    산출수식의 계산 결과와 구간 수를 함께 반환 (캐시 사용)
+
+    Args:
+        text: 산출수식 문자열
+        variables: 변수 딕셔너리 (지정 시 parse_formula_with_variables와 동일 규칙)
+        예: {"$H": "3.5", "$L": "1.5"}
+
+    Returns:
+        FormulaResult: (value, sections, groups)
+    """
+    if not text or text.strip() == "":
+        return EMPTY_RESULT
+
+    if variables is None:
+        return _evaluate_cached(text, False)
+    return _evaluate_cached(substitute_variables(text, variables), True)
+
+
+def clear_formula_cache():
+    """수식 캐시 비우기"""
+    _evaluate_cached.cache_clear()
 
 
 def parse_formula(text: str) -> float:
@@ -68,70 +511,7 @@ def parse_formula(text: str) -> float:
     if not text or text.strip() == "":
         return 0.0
 
-    try:
-        # 1. @ 기호 처리 (수량 없음 표시)
-        if "@" in text:
-            # @는 수량 없음을 의미하므로 0 반환
-            return 0.0
-
-        # 2. 꺽쇠 괄호(< >)를 일반 괄호(( ))로 치환
-        # 꺽쇠 안의 내용은 1개 구간으로 취급
-        # "<2.1+6.3+1.2>" → "(2.1+6.3+1.2)"
-        def replace_angle_brackets(match):
-            content = match.group(1)
-            # 꺽쇠 안에서 먼저 계산할 수 있으면 계산
-            inner_result = calculate_numbers_only(content)
-            return f"({inner_result})"
-
-        text = re.sub(r"<([^>]+)>", replace_angle_brackets, text)
-
-        # 3. 문자 제거 (숫자, 연산자, 소수점, 괄호만 보존)
-        # 한글, 영문, 특수문자(↗, ￢, ～
-        cleaned = re.sub(r"[^\d\+\-\*\/\.\(\)\s]", "", text)
-
-        # 4. 연속된 연산자 정리
-        # "++" → "+", "+-" → "-", "--" → "+"
-        cleaned = re.sub(r"\+\+", "+", cleaned)
-        cleaned = re.sub(r"\+\-", "-", cleaned)
-        cleaned = re.sub(r"-\+", "-", cleaned)
-        cleaned = re.sub(r"--", "+", cleaned)
-        cleaned = re.sub(r"\*\-", "*", cleaned)
-        cleaned = re.sub(r"\-\*", "*", cleaned)
-
-        # 5. 불필요한 공백 제거
-        cleaned = cleaned.strip()
-
-        # 6. 빈 괄호 제거: "()" → ""
-        cleaned = re.sub(r"\(\s*\)", "", cleaned)
-
-        # 7. 앞뒤의 불필요한 연산자 정리
-        # "+3.5" → "3.5", "3.5+" → "3.5"
-        cleaned = re.sub(r"^[\+\-\*\/]+", "", cleaned)
-        cleaned = re.sub(r"[\+\-\*\/]+$", "", cleaned)
-
-        # 8. 연속 괄호 정리
-        # "(3.5)" → "3.5"
-        while True:
-            new_cleaned = re.sub(r"\((\d+\.?\d*)\)", r"\1", cleaned)
-            if new_cleaned == cleaned:
-                break
-            cleaned = new_cleaned
-
-        # 9. 최종 검증
-        if not cleaned or cleaned.strip() == "":
-            return 0.0
-
-        # 숫자만 있는지 확인 (예: "42" 또는 "3.14")
-        if re.match(r"^[\d\.]+$", cleaned):
-            return float(cleaned)
-
-        # 10. 안전한 eval (ast.literal_eval은 복잡한 수식 지원 안 함)
-        # eval을 사용하되 보안 위험 최소화
-        return safe_eval(cleaned)
-
-    except Exception as e:
-        # 모든 에러는 0.0으로 처리 (사용자에게 알리지 않음)
-        return 0.0
+    return _evaluate_cached(text, False).value
 
 
 def parse_formula_with_variables(text: str, variables: dict = None) -> float:
@@ -150,59 +530,85 @@ def parse_formula_with_variables(text: str, variables: dict = None) -> float:
     if not text or text.strip() == "":
         return 0.0
 
-    if variables is None:
-        variables = {}
-
-    try:
-        # 1. 변수 치환
-        text = substitute_variables(text, variables)
-
-        # 2. 나머지는 parse_formula와 동일
-        # @ 기호 처리 (수량 없음 표시)
-        if "@" in text:
-            text = text.replace("@", "")
+    return evaluate_formula(text, variables if variables is not None else {}).value
 
-        # 꺽쇠 괄호 처리
-        def replace_angle_brackets(match):
-            content = match.group(1)
-            inner_result = calculate_numbers_only(content)
-            return f"({inner_result})"
 
-        text = re.sub(r"<([^>]+)>", replace_angle_brackets, text)
+# 벡터 계산 대상: 단순 숫자 또는 "a+b+c" 형태 (정수부 0 시작 금지, 12자리 이하)
+_SIMPLE_TERM = r"(?:0|[1-9][0-9]{0,11})(?:\.[0-9]{1,15})?"
+_SIMPLE_SUM_RE = re.compile(
+    rf"^[ \t]*{_SIMPLE_TERM}(?:[ \t]*\+[ \t]*{_SIMPLE_TERM})*[ \t]*$"
+)
+_SIMPLE_SPLIT_RE = re.compile(r"[ \t]*\+[ \t]*")
 
-        # 문자 제거
-        cleaned = re.sub(r"[^\d\+\-\*\/\.\(\)\s]", "", text)
 
-        # 연속 연산자 정리
-        cleaned = re.sub(r"\+\+", "+", cleaned)
-        cleaned = re.sub(r"\+\-", "-", cleaned)
-        cleaned = re.sub(r"-\+", "-", cleaned)
-        cleaned = re.sub(r"--", "+", cleaned)
-        cleaned = re.sub(r"\*\-", "*", cleaned)
-        cleaned = re.sub(r"\-\*", "*", cleaned)
-
-        cleaned = cleaned.strip()
-        cleaned = re.sub(r"\(\s*\)", "", cleaned)
-        cleaned = re.sub(r"^[\+\-\*\/]+", "", cleaned)
-        cleaned = re.sub(r"[\+\-\*\/]+$", "", cleaned)
-
-        # 연속 괄호 정리
-        while True:
-            new_cleaned = re.sub(r"\((\d+\.?\d*)\)", r"\1", cleaned)
-            if new_cleaned == cleaned:
-                break
-            cleaned = new_cleaned
+def evaluate_many(formulas, variables: dict = None):
+    """
+    산출수식 여러 개를 한 번에 계산 (공종 1개 또는 전체 을지의 산출수식 컬럼)
 
-        if not cleaned or cleaned.strip() == "":
-            return 0.0
+    - 동일 수식은 1회만 계산
+    - 숫자/단순 합계식("a+b+c")은 NumPy로 일괄 계산 (왼쪽부터 더하므로 결과 동일)
+    - 그 외 수식은 evaluate_formula() 캐시 경로로 계산
 
-        if re.match(r"^[\d\.]+$", cleaned):
-            return float(cleaned)
-
-        return safe_eval(cleaned)
+    Args:
+        formulas: 산출수식 문자열 목록 (None/빈 문자열은 0.0)
+        variables: 변수 딕셔너리 (지정 시 parse_formula_with_variables와 동일 규칙)
 
-    except Exception:
-        return 0.0
+    Returns:
+        numpy.ndarray: float64 배열 (입력 순서 유지)
+        NumPy 미설치 시 float 리스트
+    """
+    # 1. 중복 제거: 행별 → 고유 수식 인덱스
+    unique_index = {}
+    row_index = []
+    for formula in formulas:
+        key = formula if formula else ""
+        idx = unique_index.get(key)
+        if idx is None:
+            idx = len(unique_index)
+            unique_index[key] = idx
+        row_index.append(idx)
+
+    uniques = list(unique_index)
+    values = [0.0] * len(uniques)
+
+    # 2. 단순 합계식 분리 (변수 치환 후 기준)
+    simple_terms = []
+    simple_slots = []
+    for idx, formula in enumerate(uniques):
+        if not formula or formula.strip() == "":
+            continue
+        text = formula
+        if variables is not None:
+            text = substitute_variables(text, variables)
+        if NUMPY_AVAILABLE and _SIMPLE_SUM_RE.match(text):
+            simple_terms.append(_SIMPLE_SPLIT_RE.split(text.strip(" \t")))
+            simple_slots.append(idx)
+        else:
+            values[idx] = evaluate_formula(formula, variables).value
+
+    # 3. 단순 합계식 벡터 계산
+    if simple_slots:
+        width = max(len(terms) for terms in simple_terms)
+        matrix = np.zeros((len(simple_terms), width), dtype=np.float64)
+        rows = np.repeat(
+            np.arange(len(simple_terms)), [len(terms) for terms in simple_terms]
+        )
+        cols = np.concatenate([np.arange(len(terms)) for terms in simple_terms])
+        matrix[rows, cols] = np.array(
+            [term for terms in simple_terms for term in terms], dtype=np.float64
+        )
+        # 열 단위로 왼쪽부터 누적 (스칼라 계산과 같은 덧셈 순서)
+        sums = matrix[:, 0].copy()
+        for col in range(1, width):
+            sums += matrix[:, col]
+        for slot, value in zip(simple_slots, sums.tolist()):
+            values[slot] = value
+
+    if not NUMPY_AVAILABLE:
+        return [values[idx] for idx in row_index]
+    return np.asarray(values, dtype=np.float64)[
+        np.asarray(row_index, dtype=np.intp)
+    ]
 
 
 def calculate_numbers_only(text: str) -> float:
@@ -218,41 +624,13 @@ def calculate_numbers_only(text: str) -> float:
     """
     try:
         # 숫자 추출
-        numbers = re.findall(r"\d+\.?\d*", text)
+        numbers = _NUMBER_RE.findall(text)
         total = sum(float(n) for n in numbers)
         return total
     except:
         return 0.0
 
 
-def substitute_variables(formula: str, variables: dict) -> str:
-    """
-    수식에서 변수($H, $L 등)를 실제 값으로 치환
-
-    Args:
-        formula: 산출수식
-        예: "$Hm-1.8m" 또는 "$L*2+$H"
-        variables: 변수 딕셔너리
-        예: {"$H": "3.5", "$L": "1.5"}
-
-    Returns:
-        str: 치환된 수식
-        예: "3.5m-1.8m" 또는 "1.5*2+3.5"
-    """
-    if not formula:
-        return formula
-
-    result = formula
-
-    for var, value in variables.items():
-        if var in ["$H", "$L"]:
-            # $H 또는 $L 패턴 찾기 (뒤에 단위가 붙을 수 있음)
-            # "$Hm", "$H m", "$L*2" 등
-            result = result.replace(var, str(value))
-
-    return result
-
-
 def safe_eval(expression: str) -> float:
     """
     안전한 수식 계산 (eval 대안)
@@ -265,25 +643,19 @@ def safe_eval(expression: str) -> float:
         float: 계산 결과
     """
     try:
-        # ast 모듈을 사용한 안전한 파싱
-        # ast.literal_eval은 복잡한 수식 지원 안 함
-        # 따라서 제한된 eval 사용
-
         # 허용된 문자만 있는지 확인
-        allowed_pattern = r"^[\d\+\-\*\/\.\(\)\s]+$"
-        if not re.match(allowed_pattern, expression):
+        if not _ALLOWED_EXPR_RE.match(expression):
             return 0.0
 
-        # eval 사용 (제한된 환경)
-        # __builtins__를 제한하여 보안 강화
-        result = eval(expression, {"__builtins__": {}})
+        # 토크나이저 + 계산 트리로 계산 (eval 미사용)
+        result = evaluate_tree(compile_expression(expression))
 
-        # 결과가 숫자인지 확인
+        # 결과가 숫자인지 확인 (복소수 등 제외)
         if isinstance(result, (int, float)):
             return float(result)
         return 0.0
 
-    except (SyntaxError, TypeError, ValueError, ZeroDivisionError):
+    except (FormulaSyntaxError, TypeError, ValueError, ZeroDivisionError):
         return 0.0
     except Exception:
         return 0.0
@@ -300,46 +672,12 @@ def count_sections(formula: str) -> int:
         예: "2.3+<1.5+2.3>+3" → 3 (<> 안은 1구간)
 
     Returns:
-        int: 구간 수
+        int: 구간 수 (수식 계산과 같은 캐시 사용)
     """
     if not formula or formula.strip() == "":
         return 0
 
-    try:
-        sections = 0
-
-        # 1. <> 괄호 안은 1구간으로 처리
-        temp_formula = formula
-        angle_brackets = re.findall(r"<([^>]+)>", temp_formula)
-        temp_formula = re.sub(r"<[^>]+>", "<ANGLE_BRACKET>", temp_formula)
-
-        # 2. +로 분리하여 각 토큰 처리
-        tokens = temp_formula.split("+")
-
-        for token in tokens:
-            token = token.strip()
-            if not token:
-                continue
-
-            # <> 괄호는 1구간
-            if "<ANGLE_BRACKET>" in token:
-                sections += 1
-                continue
-
-            # *N 패턴: N개 구간
-            # "2.3*3" → 3구간
-            star_match = re.search(r"(\d+\.?\d*)\*(\d+)", token)
-            if star_match:
-                sections += int(star_match.group(2))
-            else:
-                # 일반 숫자: 1구간
-                if re.search(r"\d+\.?\d*", token):
-                    sections += 1
-
-        return sections
-
-    except Exception:
-        return 0
+    return _evaluate_cached(formula, False).sections
 
 
 def substitute_variables(formula: str, variables: dict) -> str:
@@ -364,7 +702,7 @@ def substitute_variables(formula: str, variables: dict) -> str:
     for var, value in variables.items():
         # $H → 3.5
         # $Hm → 3.5m (뒤의 단위 문자 보존)
-        if var in ["$H", "$L"]:
+        if var in VARIABLE_NAMES:
             # $H 또는 $L 패턴 찾기 (뒤에 단위가 붙을 수 있음)
             # "$Hm", "$H m", "$L*2" 등
             if var in result:
@@ -373,6 +711,22 @@ def substitute_variables(formula: str, variables: dict) -> str:
     return result
 
 
+def find_variables(formula: str) -> tuple:
+    """
+    수식이 참조하는 변수 목록
+
+    Args:
+        formula: 산출수식
+        예: "$Hm-1.8m" → ("$H",), "$L*2+$H" → ("$H", "$L")
+
+    Returns:
+        tuple: 참조 변수 (VARIABLE_NAMES 순서)
+    """
+    if not formula or "$" not in formula:
+        return ()
+    return tuple(var for var in VARIABLE_NAMES if var in formula)
+
+
 def parse_manual_item(text: str) -> dict:
     """
     수작업 자재 입력 파싱 (명칭;규격;단위)
@@ -444,6 +798,15 @@ if __name__ == "__main__":
             print()
             all_passed = False
 
+    # 캐시: 동일 수식은 값과 구간 수를 함께 반환
+    cached = evaluate_formula("2.3*3+1.2+2+4")
+    passed = abs(cached.value - 14.1) < 0.01 and cached.sections == 6
+    print(f"{'✅' if passed else '❌'} evaluate_formula 캐시: {cached}")
+    print(f"    {_evaluate_cached.cache_info()}")
+    print()
+    if not passed:
+        all_passed = False
+
     # 테스트 케이스 2: 구간 계산
     print("=" * 60)
     print("구간 계산 테스트")
@@ -467,6 +830,16 @@ if __name__ == "__main__":
         print(f"    결과: {result} (기대: {expected})")
         print()
 
+    # 1회 순회 결과: 값 + 구간 수 + 꺽쇠 구간
+    fused = evaluate_formula("2.3+<1.5+2.3>+3")
+    passed = (
+        abs(fused.value - 9.1) < 0.01
+        and fused.sections == 3
+        and fused.groups == ("1.5+2.3",)
+    )
+    print(f"{'✅' if passed else '❌'} 값/구간/꺽쇠 동시 산출: {fused}")
+    print()
+
     # 테스트 케이스 3: 바이트 길이
     print("=" * 60)
     print("바이트 길이 계산 테스트")
@@ -491,6 +864,14 @@ if __name__ == "__main__":
         print(f"    결과: {result} (기대: {expected})")
         print()
 
+    # 연속입력 버퍼: 추가분만 누적 계산
+    line = FormulaLineBuffer("2.3+귀로", max_bytes=12)
+    line.sync("2.3+귀로2.9")
+    line.append("+")
+    passed = line.byte_length == calc_byte_length("2.3+귀로2.9+") and not line.fits("1")
+    print(f"{'✅' if passed else '❌'} 연속입력 버퍼: {line.text!r} → {line.byte_length}byte")
+    print()
+
     # 테스트 케이스 4: 수작업 자재
     print("=" * 60)
     print("수작업 자재 파싱 테스트")
@@ -16,6 +16,8 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, QObject, QEvent, QRect, QPoint
 from PyQt6.QtGui import QKeyEvent, QPainter, QColor, QPen, QCursor, QBrush
 
+from ui.eulji_table import ensure_item
+
 
 class GridClipboardHandler(QObject):
     """테이블 복사/붙이기/끌기 복사/편집/블록 모드 핸들러"""
@@ -193,9 +195,7 @@ class GridClipboardHandler(QObject):
                 row = self.table.currentRow()
                 col = self.table.currentColumn()
                 if row >= 0 and col >= 0:
-                    new_item = QTableWidgetItem("")
-                    self.table.setItem(row, col, new_item)
-                    self.table.editItem(new_item)
+                    self.table.editItem(ensure_item(self.table, row, col))
             return True
 
         # Ctrl+C → 복사
@@ -330,10 +330,7 @@ class GridClipboardHandler(QObject):
                     src_item = self.table.item(src_row, col)
                     src_text = src_item.text() if src_item else ""
 
-                    dst_item = self.table.item(dst_row, col)
-                    if not dst_item:
-                        dst_item = QTableWidgetItem()
-                        self.table.setItem(dst_row, col, dst_item)
+                    dst_item = ensure_item(self.table, dst_row, col)
                     dst_item.setText(src_text)
             else:
                 # 현재 열만 복사
@@ -347,10 +344,7 @@ class GridClipboardHandler(QObject):
                     src_item = self.table.item(src_row, src_col)
                     src_text = src_item.text() if src_item else ""
 
-                    dst_item = self.table.item(dst_row, dst_col)
-                    if not dst_item:
-                        dst_item = QTableWidgetItem()
-                        self.table.setItem(dst_row, dst_col, dst_item)
+                    dst_item = ensure_item(self.table, dst_row, dst_col)
                     dst_item.setText(src_text)
 
         self.table.blockSignals(False)
@@ -446,10 +440,7 @@ class GridClipboardHandler(QObject):
                     if dst_col >= self.table.columnCount():
                         continue
 
-                    item = self.table.item(dst_row, dst_col)
-                    if not item:
-                        item = QTableWidgetItem()
-                        self.table.setItem(dst_row, dst_col, item)
+                    item = ensure_item(self.table, dst_row, dst_col)
                     item.setText(value)
 
         self.table.blockSignals(False)
@@ -549,10 +540,7 @@ class GridClipboardHandler(QObject):
                 if target_col >= self.table.columnCount():
                     continue
 
-                item = self.table.item(target_row, target_col)
-                if not item:
-                    item = QTableWidgetItem()
-                    self.table.setItem(target_row, target_col, item)
+                item = ensure_item(self.table, target_row, target_col)
                 item.setText(cell_value)
 
         self.table.blockSignals(False)
@@ -693,10 +681,7 @@ class GridClipboardHandler(QObject):
         self.table.blockSignals(True)
 
         for row in range(start_row, end_row):
-            item = self.table.item(row, col)
-            if not item:
-                item = QTableWidgetItem()
-                self.table.setItem(row, col, item)
+            item = ensure_item(self.table, row, col)
             item.setText(self.fill_start_value)
 
         self.table.blockSignals(False)
@@ -706,10 +691,7 @@ class GridClipboardHandler(QObject):
         self.table.blockSignals(True)
 
         for col in range(start_col, end_col):
-            item = self.table.item(row, col)
-            if not item:
-                item = QTableWidgetItem()
-                self.table.setItem(row, col, item)
+            item = ensure_item(self.table, row, col)
             item.setText(self.fill_start_value)
 
         self.table.blockSignals(False)
@@ -743,10 +725,7 @@ class GridClipboardHandler(QObject):
             if row >= self.table.rowCount():
                 self.table.setRowCount(row + 100)
 
-            item = self.table.item(row, col)
-            if not item:
-                item = QTableWidgetItem()
-                self.table.setItem(row, col, item)
+            item = ensure_item(self.table, row, col)
             item.setText(self.fill_start_value)
 
         self.table.blockSignals(False)
@@ -759,10 +738,7 @@ class GridClipboardHandler(QObject):
             if col >= self.table.columnCount():
                 continue
 
-            item = self.table.item(row, col)
-            if not item:
-                item = QTableWidgetItem()
-                self.table.setItem(row, col, item)
+            item = ensure_item(self.table, row, col)
             item.setText(self.fill_start_value)
 
         self.table.blockSignals(False)